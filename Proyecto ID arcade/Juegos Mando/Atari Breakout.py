@@ -1,14 +1,7 @@
 import cv2
 import numpy as np
-import pygame
 import random
 
-# Inicializar pygame y el joystick
-pygame.init()
-pygame.joystick.init()
-joystick = pygame.joystick.Joystick(0)
-joystick.init()
-
 # Configuración del juego
 width, height = 800, 600
 paddle_width, paddle_height = 100, 10
@@ -70,67 +63,80 @@ def apply_powerup(powerup_type):
 # Contador de frames para ralentizar el juego
 frame_count = 0
 
-# Bucle principal del juego
-while True:
-    frame_count += 1
-    if frame_count % 6 != 0:  # Procesar cada seis frames para ralentizar mucho más
-        continue
+def main():
+    global paddle_speed, frame_count
+    # pygame solo hace falta al jugar: importar el módulo no abre el joystick
+    import pygame
+    pygame.init()
+    pygame.joystick.init()
+    joystick = pygame.joystick.Joystick(0)
+    joystick.init()
+
+
+    # Bucle principal del juego
+    while True:
+        frame_count += 1
+        if frame_count % 6 != 0:  # Procesar cada seis frames para ralentizar mucho más
+            continue
 
-    frame = np.zeros((height, width, 3), dtype=np.uint8)
+        frame = np.zeros((height, width, 3), dtype=np.uint8)
     
-    # Manejar eventos del joystick
-    for event in pygame.event.get():
-        if event.type == pygame.JOYAXISMOTION:
-            if event.axis == 0:  # Eje X
-                paddle_speed = event.value * 5  # Ajusta la sensibilidad aquí
-
-    # Mover la paleta continuamente
-    paddle[0] += paddle_speed
-    paddle[0] = max(0, min(width - paddle[2], paddle[0]))
-
-    # Mover la pelota (ahora con movimiento fraccionario)
-    ball[0] += ball[2] / 2  # Mover la mitad de la velocidad actual
-    ball[1] += ball[3] / 2
+        # Manejar eventos del joystick
+        for event in pygame.event.get():
+            if event.type == pygame.JOYAXISMOTION:
+                if event.axis == 0:  # Eje X
+                    paddle_speed = event.value * 5  # Ajusta la sensibilidad aquí
+
+        # Mover la paleta continuamente
+        paddle[0] += paddle_speed
+        paddle[0] = max(0, min(width - paddle[2], paddle[0]))
+
+        # Mover la pelota (ahora con movimiento fraccionario)
+        ball[0] += ball[2] / 2  # Mover la mitad de la velocidad actual
+        ball[1] += ball[3] / 2
     
-    # Colisiones con los bordes
-    if int(ball[0]) <= ball_radius or int(ball[0]) >= width - ball_radius:
-        ball[2] = -ball[2]
-    if int(ball[1]) <= ball_radius:
-        ball[3] = -ball[3]
-    if int(ball[1]) >= height - ball_radius:
-        break  # Fin del juego
-
-    # Colisión con la paleta
-    if int(ball[1]) + ball_radius >= paddle[1] and int(paddle[0]) <= int(ball[0]) <= int(paddle[0]) + paddle[2]:
-        ball[3] = -abs(ball[3])
-
-    # Colisión con los ladrillos y power-ups
-    for brick in bricks[:]:
-        if (brick[0] <= int(ball[0]) <= brick[0] + brick_width and
-            brick[1] <= int(ball[1]) <= brick[1] + brick_height):
+        # Colisiones con los bordes
+        if int(ball[0]) <= ball_radius or int(ball[0]) >= width - ball_radius:
+            ball[2] = -ball[2]
+        if int(ball[1]) <= ball_radius:
             ball[3] = -ball[3]
-            bricks.remove(brick)
-            create_powerup(brick[0] + brick_width // 2, brick[1] + brick_height)
+        if int(ball[1]) >= height - ball_radius:
+            break  # Fin del juego
+
+        # Colisión con la paleta
+        if int(ball[1]) + ball_radius >= paddle[1] and int(paddle[0]) <= int(ball[0]) <= int(paddle[0]) + paddle[2]:
+            ball[3] = -abs(ball[3])
+
+        # Colisión con los ladrillos y power-ups
+        for brick in bricks[:]:
+            if (brick[0] <= int(ball[0]) <= brick[0] + brick_width and
+                brick[1] <= int(ball[1]) <= brick[1] + brick_height):
+                ball[3] = -ball[3]
+                bricks.remove(brick)
+                create_powerup(brick[0] + brick_width // 2, brick[1] + brick_height)
+                break
+
+        # Mover y aplicar power-ups
+        for powerup in powerups[:]:
+            powerup[1] += 1  # Mover power-up hacia abajo más lentamente
+            if int(powerup[1]) >= height:
+                powerups.remove(powerup)
+            elif (int(paddle[0]) <= int(powerup[0]) <= int(paddle[0]) + paddle[2] and
+                  paddle[1] <= int(powerup[1]) <= paddle[1] + paddle_height):
+                apply_powerup(powerup[2])
+                powerups.remove(powerup)
+
+        # Dibujar objetos
+        draw_objects(frame)
+
+        # Mostrar el frame
+        cv2.imshow('Atari Breakout', frame)
+    
+        if cv2.waitKey(1) & 0xFF == ord('q'):
             break
 
-    # Mover y aplicar power-ups
-    for powerup in powerups[:]:
-        powerup[1] += 1  # Mover power-up hacia abajo más lentamente
-        if int(powerup[1]) >= height:
-            powerups.remove(powerup)
-        elif (int(paddle[0]) <= int(powerup[0]) <= int(paddle[0]) + paddle[2] and
-              paddle[1] <= int(powerup[1]) <= paddle[1] + paddle_height):
-            apply_powerup(powerup[2])
-            powerups.remove(powerup)
-
-    # Dibujar objetos
-    draw_objects(frame)
-
-    # Mostrar el frame
-    cv2.imshow('Atari Breakout', frame)
-    
-    if cv2.waitKey(1) & 0xFF == ord('q'):
-        break
+    cv2.destroyAllWindows()
+    pygame.quit()
 
-cv2.destroyAllWindows()
-pygame.quit()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
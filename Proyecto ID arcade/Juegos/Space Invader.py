@@ -1,7 +1,20 @@
 import cv2
 import numpy as np
 import random
-from time import time
+import os
+import sys
+
+# Los módulos comunes viven en la carpeta de la consola, también al ejecutar el juego suelto
+_CONSOLE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _CONSOLE_DIR not in sys.path:
+    sys.path.insert(0, _CONSOLE_DIR)
+
+from game_clock import GameClock
+
+# Escalado en la consola: vecino más cercano para mantener los píxeles nítidos
+VIEWPORT_MODE = 'pixel'
+
+FRAME_SIZE = (260, 140)
 
 class SpaceInvaders:
     def __init__(self):
@@ -42,14 +55,15 @@ class SpaceInvaders:
         self.bullet_speed = 4
         self.bullet_width = 2
         self.bullet_height = 5
-        self.last_shot_time = 0
+        self.last_shot_time = float('-inf')  # Se puede disparar desde el principio
         self.shot_cooldown = 0.5
         
         # Estado del juego
         self.score = 0
         self.game_over = False
-        self.last_update = time()
+        self.last_update = _clock.now()
         self.update_interval = 0.016  # ~60 FPS
+        self.time_accumulator = 0.0  # Tiempo pendiente cuando la consola marca el ritmo
     
     def initialize_invaders(self):
         self.invaders = []
@@ -72,7 +86,7 @@ class SpaceInvaders:
             self.player_x = new_x
     
     def shoot(self):
-        current_time = time()
+        current_time = _clock.now()
         if current_time - self.last_shot_time >= self.shot_cooldown:
             self.bullets.append({
                 'x': self.player_x + self.player_width // 2 - self.bullet_width // 2,
@@ -130,20 +144,32 @@ class SpaceInvaders:
                      invader['y'] + self.invader_height > self.player_y)):
                     self.game_over = True
     
-    def update(self):
+    def update(self, dt=None):
         if self.game_over:
             return
-            
-        current_time = time()
-        if current_time - self.last_update >= self.update_interval:
-            self.update_bullets()
-            self.update_invaders()
-            self.last_update = current_time
-            
-            # Verificar victoria
-            if not any(invader['alive'] for invader in self.invaders):
-                self.initialize_invaders()
-                self.invader_speed += 0.5
+
+        # Sin dt (prueba independiente) se usa el reloj real
+        if dt is None:
+            current_time = _clock.now()
+            if current_time - self.last_update >= self.update_interval:
+                self.step()
+                self.last_update = current_time
+            return
+
+        # Con dt de la consola: avanzar tantos pasos fijos como hayan transcurrido
+        self.time_accumulator += dt
+        while self.time_accumulator >= self.update_interval and not self.game_over:
+            self.time_accumulator -= self.update_interval
+            self.step()
+
+    def step(self):
+        self.update_bullets()
+        self.update_invaders()
+        
+        # Verificar victoria
+        if not any(invader['alive'] for invader in self.invaders):
+            self.initialize_invaders()
+            self.invader_speed += 0.5
     
     def draw(self, frame):
         # Limpiar frame
@@ -192,6 +218,7 @@ class SpaceInvaders:
 
 # Variables globales para el estado del juego
 _game = None
+_clock = GameClock()  # Virtual con el dt de la consola: partidas reproducibles
 
 def handle_key(key):
     global _game
@@ -208,14 +235,25 @@ def handle_key(key):
     elif key == ord(' '):  # Espacio para disparar
         _game.shoot()
 
-def get_frame():
+def reset():
+    global _game
+    _game = None
+    _clock.reset()
+
+def prepare():
+    global _game
+    if _game is None:
+        _game = SpaceInvaders()
+
+def get_frame(dt=None):
     global _game
     
+    _clock.tick(dt)
     if _game is None:
         _game = SpaceInvaders()
     
     frame = np.zeros((_game.height, _game.width, 3), dtype=np.uint8)
-    _game.update()
+    _game.update(dt)
     return _game.draw(frame)
 
 # Para pruebas independientes
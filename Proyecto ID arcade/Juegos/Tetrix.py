@@ -2,6 +2,20 @@ import cv2
 import numpy as np
 import random
 import time
+import os
+import sys
+
+# Los módulos comunes viven en la carpeta de la consola, también al ejecutar el juego suelto
+_CONSOLE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _CONSOLE_DIR not in sys.path:
+    sys.path.insert(0, _CONSOLE_DIR)
+
+from input_layer import UP, DOWN, LEFT, RIGHT, B, START, raw_key_handler
+
+# Escalado en la consola: vecino más cercano para mantener los píxeles nítidos
+VIEWPORT_MODE = 'pixel'
+
+FRAME_SIZE = (260, 140)
 
 class Tetris:
     def __init__(self):
@@ -45,6 +59,7 @@ class Tetris:
         self.lines_cleared_total = 0
         self.last_move_time = time.time()
         self.move_interval = 0.5
+        self.time_accumulator = 0.0  # Tiempo pendiente cuando la consola marca el ritmo
     
     def new_piece(self):
         if self.next_piece is None:
@@ -61,6 +76,7 @@ class Tetris:
         else:
             self.current_pos = pos
             self.last_move_time = time.time()
+            self.time_accumulator = 0.0
 
     def generate_next_piece(self):
         self.next_piece_type = random.choice(list(self.tetrominos.keys()))
@@ -112,22 +128,38 @@ class Tetris:
         
         return lines_cleared
     
-    def update(self):
+    def update(self, dt=None):
         if self.game_over:
             return
             
         if self.current_piece is None:
             self.new_piece()
             return
-            
-        current_time = time.time()
-        if current_time - self.last_move_time > self.move_interval:
-            if not self.move(1, 0):
-                self.merge_piece()
-                self.clear_lines()
-                self.current_piece = None
-            self.last_move_time = current_time
-            self.move_interval = max(0.1, 0.5 - 0.05 * (self.level - 1))
+
+        # Sin dt (prueba independiente) se usa el reloj real
+        if dt is None:
+            current_time = time.time()
+            if current_time - self.last_move_time > self.move_interval:
+                self.fall_step()
+                self.last_move_time = current_time
+            return
+
+        # Con dt de la consola: una caída por cada intervalo transcurrido.
+        # Mantener abajo acelera la caída (caída suave)
+        interval = self.move_interval
+        if _input is not None and _input.held(DOWN):
+            interval = min(interval, SOFT_DROP_INTERVAL)
+        self.time_accumulator += dt
+        while self.current_piece is not None and self.time_accumulator > interval:
+            self.time_accumulator -= interval
+            self.fall_step()
+
+    def fall_step(self):
+        if not self.move(1, 0):
+            self.merge_piece()
+            self.clear_lines()
+            self.current_piece = None
+        self.move_interval = max(0.1, 0.5 - 0.05 * (self.level - 1))
     
     def draw(self):
         # Crear el frame con las dimensiones correctas (260x140)
@@ -203,37 +235,63 @@ class Tetris:
 
 # Variables globales para el estado del juego
 _tetris_game = None
+_input = None  # Estado de entrada de la consola (teclas mantenidas), si lo hay
+
+SOFT_DROP_INTERVAL = 0.05  # Segundos por fila mientras se mantiene abajo
+
+def set_input(state):
+    """La consola entrega su InputState para consultar teclas mantenidas."""
+    global _input
+    _input = state
 
-def handle_key(key):
+def handle_action(action):
     global _tetris_game
+    if _tetris_game is None:
+        return
     
     if _tetris_game.game_over:
-        if key == ord('r'):
+        if action == START:
             _tetris_game = Tetris()
         return
     
-    if key == ord('a') or key == 81:  # A o flecha izquierda
+    # Entre que una pieza se fija y aparece la siguiente no hay nada que mover
+    if _tetris_game.current_piece is None:
+        return
+    
+    if action == LEFT:
         _tetris_game.move(0, -1)
-    elif key == ord('d') or key == 83:  # D o flecha derecha
+    elif action == RIGHT:
         _tetris_game.move(0, 1)
-    elif key == ord('w') or key == 82:  # W o flecha arriba
+    elif action == UP:  # Girar
         _tetris_game.rotate()
-    elif key == ord('s') or key == 84:  # S o flecha abajo
+    elif action == DOWN:
         _tetris_game.move(1, 0)
-    elif key == 32:  # Espacio (caída rápida)
+    elif action == B:  # Caída rápida
         while _tetris_game.move(1, 0):
             pass
         _tetris_game.merge_piece()
         _tetris_game.clear_lines()
         _tetris_game.current_piece = None
 
-def get_frame():
+# Teclas crudas (prueba independiente): se traducen con la tabla de la consola
+handle_key = raw_key_handler(handle_action)
+
+def reset():
+    global _tetris_game
+    _tetris_game = None
+
+def prepare():
+    global _tetris_game
+    if _tetris_game is None:
+        _tetris_game = Tetris()
+
+def get_frame(dt=None):
     global _tetris_game
     
     if _tetris_game is None:
         _tetris_game = Tetris()
     
-    _tetris_game.update()
+    _tetris_game.update(dt)
     return _tetris_game.draw()
 
 # Para pruebas independientes
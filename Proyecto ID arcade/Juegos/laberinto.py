@@ -1,6 +1,11 @@
 import cv2
 import numpy as np
 
+# Escalado en la consola: vecino más cercano para mantener los píxeles nítidos
+VIEWPORT_MODE = 'pixel'
+
+FRAME_SIZE = (300, 150)
+
 class MazeGame:
     def __init__(self):
         # Dimensiones del lienzo (pantalla)
@@ -109,6 +114,15 @@ def handle_key(key):
     elif key == ord('s') or key == 84:  # S o flecha abajo
         _game.move_player(0, 1 * _game.player_speed)
 
+def reset():
+    global _game
+    _game = None
+
+def prepare():
+    global _game
+    if _game is None:
+        _game = MazeGame()
+
 def get_frame():
     global _game
     
@@ -2,7 +2,20 @@ import cv2
 import numpy as np
 import random
 import os
-from time import time
+import sys
+
+# Los módulos comunes viven en la carpeta de la consola, también al ejecutar el juego suelto
+_CONSOLE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _CONSOLE_DIR not in sys.path:
+    sys.path.insert(0, _CONSOLE_DIR)
+
+from game_clock import GameClock
+from input_layer import UP, DOWN, LEFT, RIGHT, A, START, raw_key_handler
+
+# Escalado en la consola: interpolación suave para imágenes
+VIEWPORT_MODE = 'photo'
+
+FRAME_SIZE = (525, 270)
 
 class MemoryGame:
     def __init__(self):
@@ -88,14 +101,14 @@ class MemoryGame:
         return board, np.zeros((self.ROWS, self.COLS), dtype=bool), selected_images
 
     def start_animation(self, animation_type, cards):
-        self.animation_start = time()
+        self.animation_start = _clock.now()
         self.is_animating = True
         self.animation_type = animation_type
         self.animation_cards = cards
         self.selectable = False
 
     def update_animation(self):
-        current_time = time()
+        current_time = _clock.now()
         
         # Si estamos esperando para ocultar las cartas
         if self.waiting_to_hide and current_time - self.hide_start_time >= self.hide_delay:
@@ -144,7 +157,7 @@ class MemoryGame:
                 else:
                     # Iniciar el temporizador de espera
                     self.waiting_to_hide = True
-                    self.hide_start_time = time()
+                    self.hide_start_time = _clock.now()
                     self.selectable = False
 
     def draw_card(self, frame, card_pos, card_image, show_back=True):
@@ -154,7 +167,7 @@ class MemoryGame:
         y = margin_y + row * (self.CARD_HEIGHT + self.CARD_SPACING)
 
         if self.is_animating and (row, col) in self.animation_cards:
-            progress = (time() - self.animation_start) / self.animation_duration
+            progress = (_clock.now() - self.animation_start) / self.animation_duration
             if self.animation_type == 'flip':
                 if progress < 0.5:
                     # Primera mitad de la animación: mostrar carta volteándose
@@ -218,30 +231,45 @@ class MemoryGame:
 
 # Variables globales para el estado del juego
 _memory_game = None
+_clock = GameClock()  # Virtual con el dt de la consola: partidas reproducibles
 
-def handle_key(key):
+def handle_action(action):
     global _memory_game
     if _memory_game and not _memory_game.is_animating and not _memory_game.waiting_to_hide:
-        if key in [ord('a'), 81, 2]:  # A o flecha izquierda
+        if action == LEFT:
             if _memory_game.cursor_col > 0:
                 _memory_game.cursor_col -= 1
-        elif key in [ord('d'), 83, 3]:  # D o flecha derecha
+        elif action == RIGHT:
             if _memory_game.cursor_col < _memory_game.COLS - 1:
                 _memory_game.cursor_col += 1
-        elif key in [ord('w'), 82, 0]:  # W o flecha arriba
+        elif action == UP:
             if _memory_game.cursor_row > 0:
                 _memory_game.cursor_row -= 1
-        elif key in [ord('s'), 84, 1]:  # S o flecha abajo
+        elif action == DOWN:
             if _memory_game.cursor_row < _memory_game.ROWS - 1:
                 _memory_game.cursor_row += 1
-        elif key == 13:  # Enter
+        elif action == A:  # Enter: destapar carta
             _memory_game.select_card()
-        elif key == ord('r') and _memory_game.game_over:  # R para reiniciar
+        elif action == START and _memory_game.game_over:  # R para reiniciar
             _memory_game = MemoryGame()
 
-def get_frame():
+# Teclas crudas (prueba independiente): se traducen con la tabla de la consola
+handle_key = raw_key_handler(handle_action)
+
+def reset():
+    global _memory_game
+    _memory_game = None
+    _clock.reset()
+
+def prepare():
+    global _memory_game
+    if _memory_game is None:
+        _memory_game = MemoryGame()
+
+def get_frame(dt=None):
     global _memory_game
     
+    _clock.tick(dt)
     if _memory_game is None:
         _memory_game = MemoryGame()
     
@@ -2,6 +2,11 @@ import cv2
 import numpy as np
 from time import time
 
+# Escalado en la consola: vecino más cercano para mantener los píxeles nítidos
+VIEWPORT_MODE = 'pixel'
+
+FRAME_SIZE = (260, 140)
+
 class JuegoPelota:
     def __init__(self):
         self.width = 260
@@ -12,8 +17,22 @@ class JuegoPelota:
         self.dy = 4
         self.radio = 10
         self.color = (0, 255, 255)  # Color amarillo
+        self.paso = 1 / 30  # La velocidad está pensada para 30 pasos por segundo
+        self.acumulador = 0.0
         
-    def actualizar(self):
+    def actualizar(self, dt=None):
+        # Sin dt (prueba independiente) se mueve un paso por frame
+        if dt is None:
+            self.mover()
+            return
+
+        # Con dt de la consola: la velocidad ya no depende de los FPS
+        self.acumulador += dt
+        while self.acumulador >= self.paso:
+            self.acumulador -= self.paso
+            self.mover()
+
+    def mover(self):
         # Actualizar posición
         self.x += self.dx
         self.y += self.dy
@@ -33,14 +52,20 @@ class JuegoPelota:
         
         return frame
 
-def get_frame():
+def prepare():
     if not hasattr(get_frame, "juego"):
         get_frame.juego = JuegoPelota()
         get_frame.frame = np.zeros((140, 260, 3), dtype=np.uint8)
-    
-    get_frame.juego.actualizar()
+
+def get_frame(dt=None):
+    prepare()
+    get_frame.juego.actualizar(dt)
     return get_frame.juego.dibujar(get_frame.frame)
 
+def reset():
+    if hasattr(get_frame, "juego"):
+        del get_frame.juego
+
 if __name__ == "__main__":
     # Código para prueba independiente
     while True:
@@ -3,9 +3,24 @@ import numpy as np
 from enum import Enum
 import random
 import math
-import time
-from PIL import Image, ImageDraw, ImageFont
+import os
+import sys
 
+# Los módulos comunes viven en la carpeta de la consola, también al ejecutar el juego suelto
+_CONSOLE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _CONSOLE_DIR not in sys.path:
+    sys.path.insert(0, _CONSOLE_DIR)
+
+from blending import AlphaMask, blit
+from game_clock import GameClock
+from particles import (Emitter, ParticleEffect, Particles, SplatBuffer, draw_circles, draw_segments,
+                       draw_sparks, inside, orbit_points, scatter)
+
+# Escalado en la consola: interpolación suave para imágenes
+VIEWPORT_MODE = 'photo'
+
+FRAME_SIZE = (800, 400)
+LOWER_FRAME_SIZE = (500, 200)
 
 player_pos = (150, 150)
 enemy_pos = (650, 150)
@@ -36,6 +51,131 @@ def remove_green_background(image):
     # Return the image with transparency
     return image, alpha
 
+
+SPRITE_SIZE = (200, 200)
+SPRITE_CACHE_DIR = '.sprites'  # Dentro de la carpeta de las imágenes; BGRA ya recortados
+_sprites = {}  # (ruta, tamaño) -> (mtime, (sprite, sprite volteado)) ya preparados en memoria
+
+
+class Sprite:
+    """Sprite de un Pokémon listo para dibujar.
+
+    Todo lo que no cambia durante la batalla se calcula una sola vez: la
+    imagen BGR, el alfa del recorte del fondo verde (que sirve de máscara) y
+    el color premultiplicado. Dibujarlo es copiar los píxeles visibles.
+    """
+
+    def __init__(self, image, alpha):
+        self.image = image  # BGR uint8
+        self.alpha = alpha  # uint8 (alto, ancho): 0 fondo, 255 Pokémon
+        self.mask = AlphaMask(alpha)
+        # El recorte por color da un alfa de todo o nada y basta copiar; un BGRA
+        # editado a mano puede tener bordes suaves y entonces se mezcla
+        self.premultiplied = self.mask.premultiply(image)
+
+    @classmethod
+    def from_bgra(cls, bgra):
+        return cls(np.ascontiguousarray(bgra[:, :, :3]), np.ascontiguousarray(bgra[:, :, 3]))
+
+    def to_bgra(self):
+        return np.dstack([self.image, self.alpha])
+
+    def flipped(self):
+        """Variante en espejo (el Pokémon rival mira hacia la izquierda)."""
+        return Sprite(cv2.flip(self.image, 1), cv2.flip(self.alpha, 1))
+
+    def draw(self, frame, x, y, image=None):
+        """Dibuja el sprite en (x, y). `image` sustituye el color (p. ej. con el flash de daño)."""
+        if image is None:
+            blit(frame, x, y, self.image, self.mask, self.premultiplied)
+        else:
+            blit(frame, x, y, image, self.mask)
+
+
+def _sprite_cache_path(image_path, size):
+    folder, filename = os.path.split(image_path)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(folder, SPRITE_CACHE_DIR, f"{stem}-{size[0]}x{size[1]}.png")
+
+
+def _prepare_sprite(image_path, size):
+    """Lee la imagen y recorta el fondo, usando el BGRA de la caché de disco si está al día."""
+    cache_path = _sprite_cache_path(image_path, size)
+    try:
+        if os.stat(cache_path).st_mtime_ns >= os.stat(image_path).st_mtime_ns:
+            bgra = cv2.imread(cache_path, cv2.IMREAD_UNCHANGED)
+            if bgra is not None and bgra.ndim == 3 and bgra.shape[2] == 4:
+                return Sprite.from_bgra(bgra)
+    except OSError:
+        pass
+
+    image = cv2.imread(image_path)
+    if image is None:
+        return None
+    sprite = Sprite(*remove_green_background(cv2.resize(image, size)))
+    try:
+        # Temporal y renombrado: otra instancia nunca lee un PNG a medias
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.png"
+        if cv2.imwrite(temp_path, sprite.to_bgra()):
+            os.replace(temp_path, cache_path)
+    except (OSError, cv2.error):
+        pass  # Sin caché en disco (carpeta de solo lectura): se recorta en cada arranque
+    return sprite
+
+
+def load_sprites(image_path, size=SPRITE_SIZE):
+    """Devuelve (sprite, sprite volteado) de una imagen, preparados una vez por proceso."""
+    try:
+        mtime = os.stat(image_path).st_mtime_ns
+    except OSError:
+        mtime = None
+    key = (image_path, size)
+    cached = _sprites.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    sprite = _prepare_sprite(image_path, size) if mtime is not None else None
+    if sprite is None:
+        # Sin imagen: recuadro blanco opaco, como antes
+        sprite = Sprite(np.full((size[1], size[0], 3), 255, dtype=np.uint8),
+                        np.full((size[1], size[0]), 255, dtype=np.uint8))
+    sprites = (sprite, sprite.flipped())
+    _sprites[key] = (mtime, sprites)
+    return sprites
+
+
+BOLT_LIBRARY_SIZE = 32  # Rayos distintos entre los que se elige en cada destello
+_bolts = {}  # alto de la pantalla -> biblioteca de rayos
+
+
+def bolt_library(height, count=BOLT_LIBRARY_SIZE):
+    """Rayos pregenerados (tronco y ramas) que nacen en (0, 0); se trasladan al dibujarlos.
+
+    Se generan una vez por proceso con una semilla fija y un generador propio,
+    así que no consumen del `np.random` de la partida.
+    """
+    bolts = _bolts.get(height)
+    if bolts is not None:
+        return bolts
+    rng = np.random.default_rng(2500)
+    bolts = []
+    for _ in range(count):
+        points = [(0, 0)]
+        for _ in range(6):
+            prev_x, prev_y = points[-1]
+            points.append((prev_x + int(rng.integers(-120, 120)), prev_y + height // 6))
+        branches = []
+        for i in range(len(points) - 1):
+            if rng.random() < 0.5:
+                branch_points = [points[i]]
+                for _ in range(3):
+                    prev_x, prev_y = branch_points[-1]
+                    branch_points.append((prev_x + int(rng.integers(-60, 60)), prev_y + height // 8))
+                branches.append(np.array(branch_points, np.int32))
+        bolts.append((np.array(points, np.int32), branches))
+    _bolts[height] = bolts
+    return bolts
+
 class BattleState(Enum):
     SELECTING_ACTION = 1
     EXECUTING_ACTION = 2
@@ -60,6 +200,272 @@ class AnimationType(Enum):
     GROUND = 14
 
 
+# Partículas de los ataques por tamaño de pantalla: p. ej. 10 en las cabinas grandes
+PARTICLE_DENSITY = 1.0
+
+FIRE_COLORS = [
+    (0, 0, 255),    # Rojo
+    (0, 128, 255),  # Naranja
+    (0, 215, 255),  # Amarillo
+    (255, 255, 255)  # Blanco (centro)
+]
+FIRE_GLOW = (40, 110, 255)  # Naranja rojizo: al sumarse pasa a amarillo y blanco
+ELECTRIC_COLORS = [
+    (255, 255, 0),   # Amarillo brillante
+    (200, 255, 255),  # Cyan claro
+    (255, 255, 255)   # Blanco
+]
+WATER_COLORS = [
+    (255, 178, 102),  # Azul claro
+    (255, 215, 102),  # Azul mas claro
+    (255, 255, 255)   # Blanco (para brillos)
+]
+LEAF_COLORS = [
+    (0, 255, 0),     # Verde brillante
+    (50, 255, 50),   # Verde claro
+    (150, 255, 150)  # Verde muy claro
+]
+PSYCHIC_COLORS = [
+    (255, 0, 255),    # Magenta
+    (200, 0, 200),    # Magenta oscuro
+    (255, 100, 255),  # Rosa claro
+    (255, 255, 255)   # Blanco
+]
+ICE_COLORS = [
+    (255, 255, 255),  # Blanco
+    (250, 250, 255),  # Blanco azulado
+    (200, 220, 255),  # Azul muy claro
+    (150, 200, 255)   # Azul hielo
+]
+DARK_COLORS = [
+    (139, 0, 139),    # Morado oscuro
+    (75, 0, 130),     # indigo
+    (20, 0, 40),      # Casi negro
+    (160, 32, 240)    # Purpura
+]
+
+# Hoja en unidades de su tamaño: punta, izquierda, base y derecha
+LEAF_SHAPE = np.array([[0, -1.5], [-1, -1], [-1.2, 0], [-1, 1],
+                       [0, 1.2], [1, 1], [1.2, 0], [1, -1]])
+
+
+def leaf_polygons(points, angles, sizes):
+    """Vértices (N x 8 x 2) de hojas de `sizes` en `points`, giradas `angles` radianes."""
+    centers = points[:, None, :]
+    offsets = (centers + sizes[:, None, None] * LEAF_SHAPE).astype(np.int32) - centers
+    cos, sin = np.cos(angles)[:, None], np.sin(angles)[:, None]
+    x = offsets[..., 0] * cos - offsets[..., 1] * sin + centers[..., 0]
+    y = offsets[..., 0] * sin + offsets[..., 1] * cos + centers[..., 1]
+    return np.stack([x, y], axis=2).astype(np.int32)
+
+
+def _current_center(animation, progress):
+    start = np.array(animation.start_pos, dtype=np.float64)
+    return start + (np.array(animation.end_pos) - start) * progress
+
+
+# Comportamiento de las partículas de cada tipo: mueven y dibujan todas a la vez
+
+def _fire_particles(frame, particles, progress, animation):
+    particles.pos += particles.vel
+
+    # Tamaño dinamico y efecto de parpadeo
+    flicker = np.random.uniform(0.8, 1.2, len(particles))
+    size = particles.size * (1 - progress * 0.5) * flicker
+    points = particles.pos.copy()
+
+    # Van en linea recta: las que salen de la pantalla ya no vuelven
+    alive = (size >= 1) & inside(frame, points, particles.size)
+    particles.keep(alive)
+    size, points = size[alive], points[alive]
+
+    # Llamas que suman luz: rojas en los bordes y amarillas y blancas donde se juntan, con chispas dispersas
+    splats = animation.splats
+    splats.add(points, size * 1.5, FIRE_GLOW, 0.6)
+    splats.add(scatter(points, 0.2, size), 3, (255, 215, 0), 0.8)
+    splats.composite(frame, additive=True)
+
+
+def _electric_particles(frame, particles, progress, animation):
+    count = len(particles)
+    if not count:
+        return
+    direction = np.array(animation.end_pos) - np.array(animation.start_pos)
+    direction = direction / np.linalg.norm(direction)
+    speed = 10 * (1 - progress)  # Velocidad reducida
+    spread = 10  # Dispersion mas controlada
+
+    particles.vel = direction * speed + np.random.uniform(-spread, spread, (count, 2))
+    particles.pos += particles.vel
+    starts = particles.pos.astype(int)
+
+    # Rayo compacto de 4 tramos en zigzag desde cada particula
+    steps = np.random.uniform(-10, 10, (count, 4, 2)).astype(int)
+    bolts = np.concatenate([starts[:, None], starts[:, None] + np.cumsum(steps, axis=1)], axis=1)
+    bolts = bolts.astype(np.int32)
+    for thickness, color in zip((3, 2, 1), ELECTRIC_COLORS):
+        cv2.polylines(frame, bolts, False, color, thickness)
+
+    # Chispas alrededor de las particulas
+    draw_sparks(frame, starts, 0.3, 5, 2, (255, 255, 255))
+
+
+def _water_particles(frame, particles, progress, animation):
+    # Movimiento ondulatorio: cada gota se dibuja desplazada de su trayectoria
+    wave = progress * particles.frequency + particles.phase
+    points = particles.pos + np.stack([np.sin(wave) * 15, np.cos(wave) * 8], axis=1)
+
+    # Actualizar posicion con efecto de arrastre
+    particles.pos += particles.vel * 0.6
+
+    size = particles.size * (1.2 - progress * 0.5)
+
+    # Gotas translucidas: se ve el fondo a traves y se mezclan al juntarse
+    splats = animation.splats
+    splats.add(points, size * 1.4, WATER_COLORS[0], 0.8)
+    splats.composite(frame)
+
+    # Brillo y rastro de agua
+    points, size = points.astype(int), size.astype(int)
+    draw_circles(frame, points - 1, np.maximum(1, size // 3), (255, 255, 255))
+    draw_sparks(frame, points, 0.3, size, 1, WATER_COLORS[0])
+
+
+def _grass_particles(frame, particles, progress, animation):
+    # Movimiento mas organico
+    particles.pos += particles.vel * 0.6
+
+    # Rotacion con oscilacion
+    angle = particles.angle + progress * 8 + np.sin(progress * 10 + particles.phase) * 0.5
+    points = particles.pos.astype(int)
+    size = (particles.size * (1.2 - progress * 0.4)).astype(int)
+    visible = size > 0
+    points, size, angle = points[visible], size[visible], angle[visible]
+
+    # Hojas con gradiente; fillPoly vacía lo que se solapa entre poligonos, asi que van de una en una
+    layers = [(leaf_polygons(points, angle, size - i * 2), size - i * 2 > 0, color)
+              for i, color in enumerate(LEAF_COLORS)]
+    for k in range(len(points)):
+        for polygons, drawn, color in layers:
+            if drawn[k]:
+                cv2.fillPoly(frame, [polygons[k]], color)
+
+    # Efectos de brillo y rastro de energia
+    draw_sparks(frame, points, 0.2, size, 1, (200, 255, 200))
+    if len(points):
+        cv2.polylines(frame, leaf_polygons(points, angle - 0.5, size // 2), True, (100, 255, 100), 1)
+
+
+def _psychic_particles(frame, particles, progress, animation):
+    center = _current_center(animation, progress)
+    base_angle = particles.angle + progress * 15
+    radius = 30 + 20 * math.sin(progress * 4 * math.pi)
+
+    # Estela de energia psiquica detras de cada particula orbitante, que se apaga hacia atras y al final
+    splats = animation.splats
+    trail_length = 8
+    for i in range(trail_length):
+        points = orbit_points(center, radius, base_angle - i * 0.2)
+        color = PSYCHIC_COLORS[min(i // 2, len(PSYCHIC_COLORS) - 1)]
+        splats.add(points, max(1, 3 - i // 2) * 1.5, color, (1 - i / trail_length) * (1 - progress))
+
+    # Particula principal
+    splats.add(orbit_points(center, radius, base_angle), 4.5, (255, 255, 255))
+    splats.composite(frame, additive=True)
+
+
+def _ice_particles(frame, particles, progress, animation):
+    # Movimiento con efecto de cristalizacion
+    particles.pos += particles.vel * 0.8 * (1 - progress * 0.7)
+
+    centers = particles.pos.astype(int)
+    size = (particles.size * (1.2 - progress * 0.3)).astype(int)
+    base_angle = particles.angle + progress * 3
+    visible = size > 0
+    centers, size, base_angle = centers[visible], size[visible], base_angle[visible]
+
+    # Seis ramas por copo
+    arms = base_angle[:, None] + np.arange(6) * math.pi / 3
+    cos, sin = np.cos(arms), np.sin(arms)
+    cx, cy = centers[:, :1], centers[:, 1:]
+    length = size[:, None]
+    starts = np.stack(np.broadcast_arrays(cx, cy, arms)[:2], axis=2).reshape(-1, 2)
+    ends = np.stack([cx + length * 3 * cos, cy + length * 3 * sin], axis=2).astype(int).reshape(-1, 2)
+
+    # Ramificaciones secundarias: tres por rama, a cada lado
+    branch_count = 3
+    branch_starts, branch_ends = [], []
+    for j in range(branch_count):
+        bx = (cx + (j + 1) * length * cos).astype(int)
+        by = (cy + (j + 1) * length * sin).astype(int)
+        branch_length = length * (1 - j / branch_count)
+        for direction in (-1, 1):
+            branch_angle = arms + direction * math.pi / 3
+            ex = (bx + branch_length * np.cos(branch_angle)).astype(int)
+            ey = (by + branch_length * np.sin(branch_angle)).astype(int)
+            branch_starts.append(np.stack([bx, by], axis=2).reshape(-1, 2))
+            branch_ends.append(np.stack([ex, ey], axis=2).reshape(-1, 2))
+    branch_starts = np.concatenate(branch_starts)
+    branch_ends = np.concatenate(branch_ends)
+
+    # Ramas con gradiente: cada color mas fino que el anterior
+    for j, color in enumerate(ICE_COLORS[:3]):
+        draw_segments(frame, starts, ends, color, 3 - j)
+    for k, color in enumerate(ICE_COLORS[:2]):
+        draw_segments(frame, branch_starts, branch_ends, color, 2 - k)
+
+    # Efecto de cristalizacion
+    draw_sparks(frame, centers, 0.3, size * 2, (1, 3), ICE_COLORS[0])
+
+
+def _dark_particles(frame, particles, progress, animation):
+    center = _current_center(animation, progress)
+
+    # Movimiento en espiral mas dramatico con distorsion
+    spiral_progress = progress * 5
+    radius = 50 * (1 - progress ** 1.5)  # Contraccion no lineal
+    angle = particles.angle + spiral_progress * (1 + progress * 2)
+    distortion = np.sin(progress * 10 + particles.phase) * 5
+    points = orbit_points(center, radius + distortion, angle)
+
+    # Tamaño variable con el progreso
+    size = particles.size * (1.2 - progress)
+    visible = size > 0
+    points, size, angle = points[visible], size[visible], angle[visible]
+
+    # Particula principal: purpura por fuera y casi negra en el centro
+    splats = animation.splats
+    splats.add(points, size * 1.4, DARK_COLORS[0], 0.9)
+    splats.add(points, size * 0.7, DARK_COLORS[2], 0.8)
+
+    # Estela oscura que se desvanece hacia atras y al final
+    trail_length = 5
+    for i in range(trail_length):
+        trail = orbit_points(center, radius * (1 + i / trail_length), angle - i * 0.2)
+        splats.add(trail, np.maximum(1, size - i) * 1.3, DARK_COLORS[-1],
+                   (1 - i / trail_length) * (1 - progress))
+    splats.composite(frame)
+
+
+# Emisores y comportamiento de las partículas de cada tipo de ataque. Los
+# tipos que no están dibujan su efecto sin partículas.
+PARTICLE_EFFECTS = {
+    AnimationType.FIRE: ParticleEffect([
+        Emitter(burst=40, size=(4, 12)),
+        # Nuevas particulas en cada cuadro, en un cono hacia el objetivo
+        Emitter(rate=10, size=(5, 10), speed=(8.0, 8.0), spread=2.0, cone=0.3, slowdown=True),
+    ], _fire_particles),
+    AnimationType.ELECTRIC: ParticleEffect([Emitter(burst=35, size=(3, 8))], _electric_particles),
+    AnimationType.WATER: ParticleEffect([Emitter(burst=30, size=(4, 10), frequency=(8.0, 12.0))],
+                                        _water_particles),
+    AnimationType.GRASS: ParticleEffect([Emitter(burst=25, size=(5, 12))], _grass_particles),
+    AnimationType.PSYCHIC: ParticleEffect([Emitter(burst=45, size=(3, 8))], _psychic_particles),
+    AnimationType.ICE: ParticleEffect([Emitter(burst=20, size=(6, 14))], _ice_particles),
+    AnimationType.DARK: ParticleEffect([Emitter(burst=50, size=(4, 10))], _dark_particles),
+}
+NO_PARTICLES = ParticleEffect()
+
+
 
 
 class Animation:
@@ -68,65 +474,27 @@ class Animation:
         self.start_pos = start_pos
         self.end_pos = end_pos
         self.duration = duration
-        self.start_time = time.time()
-        self.particles = []
+        self.start_time = _clock.now()
+        self.particles = Particles()
+        self.splats = SplatBuffer()  # Brillos, gotas y polvo translucidos
         self.trails = []  # Para efectos de estela
         self.secondary_particles = []  # Para efectos secundarios
+        self.effect = PARTICLE_EFFECTS.get(anim_type, NO_PARTICLES)
         self.initialize_particles()
 
     def initialize_particles(self):
-        particle_configs = {
-            AnimationType.FIRE: {'count': 40, 'size_range': (4, 12)},
-            AnimationType.ELECTRIC: {'count': 35, 'size_range': (3, 8)},
-            AnimationType.WATER: {'count': 30, 'size_range': (4, 10)},
-            AnimationType.GRASS: {'count': 25, 'size_range': (5, 12)},
-            AnimationType.PSYCHIC: {'count': 45, 'size_range': (3, 8)},
-            AnimationType.ICE: {'count': 20, 'size_range': (6, 14)},
-            AnimationType.DARK: {'count': 50, 'size_range': (4, 10)}
-        }
-
-        config = particle_configs.get(self.type, {'count': 30, 'size_range': (3, 8)})
-        
-        for _ in range(config['count']):
-            particle = {
-                'pos': list(self.start_pos),
-                'velocity': self._calculate_velocity_towards_target(),
-                'size': random.randint(*config['size_range']),
-                'lifetime': random.uniform(0.7, 1.2),
-                'angle': random.uniform(0, 2 * math.pi),
-                'alpha': 255,
-                'color_offset': random.uniform(0, 1),
-                'oscillation_offset': random.uniform(0, 2 * math.pi),
-                'trail': []  # Para efectos de estela
-            }
-            
-            if self.type == AnimationType.WATER:
-                particle['wave_offset'] = random.uniform(0, 2 * math.pi)
-                particle['wave_frequency'] = random.uniform(8, 12)
-            
-            self.particles.append(particle)
+        self.effect.start(self.particles, self.start_pos, self.end_pos, PARTICLE_DENSITY)
 
-    def _calculate_velocity_towards_target(self):
-        direction = [
-            self.end_pos[0] - self.start_pos[0],
-            self.end_pos[1] - self.start_pos[1]
-        ]
-        
-        length = math.sqrt(direction[0]**2 + direction[1]**2)
-        if length > 0:
-            base_speed = random.uniform(12.0, 15.0)  # Velocidad mas variable
-            spread = 3.0  # Mayor dispersion
-            return [
-                (direction[0] / length) * base_speed + random.uniform(-spread, spread),
-                (direction[1] / length) * base_speed + random.uniform(-spread, spread)
-            ]
-        return [random.uniform(-6, 6), random.uniform(-6, 6)]            
+    def update_particles(self, frame, progress):
+        """Emite, mueve y dibuja todas las particulas del efecto en un solo paso."""
+        self.effect.step(frame, self.particles, progress, self.start_pos, self.end_pos,
+                         self, PARTICLE_DENSITY)
 
     def is_finished(self):
-        return time.time() - self.start_time > self.duration
+        return _clock.now() - self.start_time > self.duration
 
     def update_and_draw(self, frame):
-        progress = (time.time() - self.start_time) / self.duration
+        progress = (_clock.now() - self.start_time) / self.duration
         if progress > 1:
             return
 
@@ -160,78 +528,12 @@ class Animation:
             self._draw_ground_animation(frame, progress)
 
     def _draw_fire_animation(self, frame, progress):
-        fire_colors = [
-            (0, 0, 255),    # Rojo
-            (0, 128, 255),  # Naranja
-            (0, 215, 255),  # Amarillo
-            (255, 255, 255)  # Blanco (centro)
-        ]
-
         # Direccion calculada desde self.start_pos hacia self.end_pos
         direction = np.array(self.end_pos) - np.array(self.start_pos)
         direction = direction / np.linalg.norm(direction)  # Normalizar direccion
 
-        # Parametros de velocidad y dispersion
-        speed = 8 * (1 - progress)  # Mantener velocidad
-        cone_angle = 0.3  # angulo del cono en radianes (ajustable segun el efecto deseado)
-
-        # Generar nuevas particulas en cada cuadro
-        num_new_particles = 10
-        for _ in range(num_new_particles):
-            # Generar una variacion aleatoria en el angulo dentro del cono
-            angle_variation = random.uniform(-cone_angle, cone_angle)
-            cos_angle = math.cos(angle_variation)
-            sin_angle = math.sin(angle_variation)
-
-            # Rotar la direccion base por el angulo de variacion
-            rotated_direction = np.array([
-                direction[0] * cos_angle - direction[1] * sin_angle,
-                direction[0] * sin_angle + direction[1] * cos_angle
-            ])
-
-            # Crear la nueva particula con direccion en el cono
-            new_particle = {
-                'pos': list(self.start_pos),
-                'velocity': [
-                    rotated_direction[0] * speed + random.uniform(-2, 2),  # Ajuste minimo de dispersion
-                    rotated_direction[1] * speed + random.uniform(-2, 2)
-                ],
-                'size': random.randint(5, 10)
-            }
-            self.particles.append(new_particle)
-
-        # Mover y renderizar particulas
-        active_particles = []
-        for particle in self.particles:
-            particle['pos'][0] += particle['velocity'][0]
-            particle['pos'][1] += particle['velocity'][1]
-
-            # Tamaño dinamico y efecto de parpadeo
-            flicker = random.uniform(0.8, 1.2)
-            size = int(particle['size'] * (1 - progress * 0.5) * flicker)
-
-            if size > 0:
-                pos = (int(particle['pos'][0]), int(particle['pos'][1]))
-
-                # Crear efecto de gradiente de fuego
-                for i, color in enumerate(fire_colors):
-                    current_size = size - i * 2
-                    if current_size > 0:
-                        cv2.circle(frame, pos, current_size, color, -1)
-
-                # Añadir chispas dispersas
-                if random.random() < 0.2:
-                    spark_pos = (
-                        pos[0] + int(random.uniform(-size, size)),
-                        pos[1] + int(random.uniform(-size, size))
-                    )
-                    cv2.circle(frame, spark_pos, 2, (255, 215, 0), -1)
-
-                # Mantener particulas activas
-                active_particles.append(particle)
-
-        # Actualizar las particulas activas
-        self.particles = active_particles
+        # Particulas nuevas, movimiento y gradiente de fuego (_fire_particles)
+        self.update_particles(frame, progress)
 
         # Añadir lineas de calor para el efecto de "llamas largas"
         for i in range(5):
@@ -250,48 +552,7 @@ class Animation:
 
 
     def _draw_electric_animation(self, frame, progress):
-        electric_colors = [
-            (255, 255, 0),   # Amarillo brillante
-            (200, 255, 255),  # Cyan claro
-            (255, 255, 255)   # Blanco
-        ]
-
-        # Direccion calculada segun self.start_pos y self.end_pos
-        direction = np.array(self.end_pos) - np.array(self.start_pos)
-        direction = direction / np.linalg.norm(direction)
-        speed = 10 * (1 - progress)  # Velocidad reducida
-        spread = 10  # Dispersion mas controlada
-
-        for particle in self.particles:
-            particle['velocity'][0] = direction[0] * speed + random.uniform(-spread, spread)
-            particle['velocity'][1] = direction[1] * speed + random.uniform(-spread, spread)
-            particle['pos'][0] += particle['velocity'][0]
-            particle['pos'][1] += particle['velocity'][1]
-
-            start_pos = (int(particle['pos'][0]), int(particle['pos'][1]))
-            points = [start_pos]
-            num_segments = 4  # Menor numero de segmentos para mantener el rayo compacto
-
-            for _ in range(num_segments):
-                last_point = points[-1]
-                next_point = (
-                    last_point[0] + int(random.uniform(-10, 10)),  # Menor variacion para control
-                    last_point[1] + int(random.uniform(-10, 10))
-                )
-                points.append(next_point)
-
-            for i in range(len(points) - 1):
-                for color in electric_colors:
-                    thickness = 3 - electric_colors.index(color)
-                    cv2.line(frame, points[i], points[i + 1], color, thickness)
-
-            # Añadir chispas alrededor de las particulas
-            if random.random() < 0.3:
-                spark_pos = (
-                    start_pos[0] + int(random.uniform(-5, 5)),
-                    start_pos[1] + int(random.uniform(-5, 5))
-                )
-                cv2.circle(frame, spark_pos, 2, (255, 255, 255), -1)
+        self.update_particles(frame, progress)
 
 
 
@@ -437,30 +698,24 @@ class Animation:
                     color,
                     3)
         
-        # Ondas de energía metálica
+        # Ondas de energía metálica que se desvanecen: cv2 no mezcla con alfa,
+        # así que se dibujan en una copia de su recuadro y se mezclan con su opacidad
         wave_radius = int(50 * progress)
-        for r in range(3):
-            radius = wave_radius + r * 15
-            opacity = int(255 * (1 - progress))
-            cv2.circle(frame,
-                    tuple(map(int, current)),
-                    radius,
-                    (169, 169, 169, opacity),
-                    2)
-        
-        # Destellos metálicos aleatorios
-        if random.random() < 0.7:
-            for _ in range(5):
-                spark_pos = (
-                    int(current[0] + random.uniform(-30, 30)),
-                    int(current[1] + random.uniform(-30, 30))
-                )
-                size = random.randint(2, 5)
-                cv2.circle(frame,
-                        spark_pos,
-                        size,
-                        (255, 255, 255),
-                        -1)
+        opacity = 1 - progress
+        cx, cy = map(int, current)
+        reach = wave_radius + 2 * 15 + 2
+        x0, y0 = max(cx - reach, 0), max(cy - reach, 0)
+        roi = frame[y0:cy + reach + 1, x0:cx + reach + 1]
+        if roi.size:
+            waves = roi.copy()
+            for r in range(3):
+                radius = wave_radius + r * 15
+                cv2.circle(waves,
+                        (cx - x0, cy - y0),
+                        radius,
+                        (169, 169, 169),
+                        2)
+            cv2.addWeighted(waves, opacity, roi, 1 - opacity, 0, dst=roi)
         
         # Efecto de impacto metálico al final
         # Efecto de impacto metálico al final
@@ -483,21 +738,20 @@ class Animation:
                         2)
 
         
-        # Añadir partículas metálicas
+        # Añadir partículas metálicas translúcidas
         particle_count = 20
-        for _ in range(particle_count):
-            angle = random.uniform(0, 2 * np.pi)
-            distance = random.uniform(0, 40 * (1 - progress))
-            particle_pos = (
-                int(current[0] + distance * np.cos(angle)),
-                int(current[1] + distance * np.sin(angle))
-            )
-            size = random.randint(2, 4)
-            cv2.circle(frame,
-                    particle_pos,
-                    size,
-                    random.choice(metallic_colors),
-                    -1)
+        angle = np.random.uniform(0, 2 * np.pi, particle_count)
+        distance = np.random.uniform(0, 40 * (1 - progress), particle_count)
+        colors = np.array(metallic_colors)[np.random.randint(len(metallic_colors), size=particle_count)]
+        self.splats.add(orbit_points(current, distance, angle),
+                        np.random.randint(2, 5, particle_count) * 1.5, colors, 0.8)
+        self.splats.composite(frame)
+
+        # Destellos metálicos aleatorios
+        if random.random() < 0.7:
+            sparks = current + np.random.uniform(-30, 30, (5, 2))
+            self.splats.add(sparks, np.random.randint(2, 6, 5) * 1.5, (255, 255, 255))
+            self.splats.composite(frame, additive=True)
 
     def _draw_fairy_animation(self, frame, progress):
         # Colores suaves y mágicos en BGR
@@ -508,7 +762,7 @@ class Animation:
             (238, 130, 238)   # Violeta claro
         ]
         
-        t = time.time() * 1.5  # Tiempo para animaciones
+        t = _clock.now() * 1.5  # Tiempo para animaciones
         
         # Centro del efecto
         center = np.array(self.start_pos)
@@ -516,49 +770,29 @@ class Animation:
         direction = target - center
         current_center = center + direction * progress
         
-        # Dibujar círculos concéntricos con efecto de rotación
-        for i in range(6):
-            radius = 40 * (1 + np.sin(t + i * 0.5) * 0.3)
-            rotation = t * 0.5 + i * np.pi / 3
-            for j in range(6):
-                angle = rotation + j * np.pi / 3
-                pos = current_center + np.array([
-                    np.cos(angle) * radius,
-                    np.sin(angle) * radius
-                ])
-                
-                # Dibujar pétalos de flor
-                for color_idx, color in enumerate(fairy_colors):
-                    petal_size = int(15 * (1 - color_idx * 0.2))
-                    cv2.circle(frame, 
-                            tuple(map(int, pos)), 
-                            petal_size, 
-                            color, 
-                            -1)
-        
-        # Dibujar espirales de polvo de hadas
+        # Pétalos de flor en círculos concéntricos con efecto de rotación: 6 anillos de 6 pétalos
+        ring = np.arange(6)[:, None]
+        radius = 40 * (1 + np.sin(t + ring * 0.5) * 0.3)
+        angle = t * 0.5 + ring * np.pi / 3 + np.arange(6)[None, :] * np.pi / 3
+        petals = np.stack([current_center[0] + np.cos(angle) * radius,
+                           current_center[1] + np.sin(angle) * radius], axis=-1).reshape(-1, 2)
+        # Discos opacos, cada color sobre el anterior: como sello difuso perderían las capas
+        petals = petals.astype(int)
+        for color_idx, color in enumerate(fairy_colors):
+            draw_circles(frame, petals, int(15 * (1 - color_idx * 0.2)), color)
+
+        # Espirales de polvo de hadas: 12 espirales de 10 motas
         num_spirals = 12
-        for i in range(num_spirals):
-            spiral_progress = (progress + i/num_spirals) % 1
-            angle = t * 2 + i * (2 * np.pi / num_spirals)
-            
-            for j in range(10):
-                spiral_t = j / 10
-                spiral_radius = 30 * (1 - spiral_t)
-                
-                pos = center + direction * spiral_progress
-                pos += np.array([
-                    np.cos(angle + spiral_t * 4) * spiral_radius,
-                    np.sin(angle + spiral_t * 4) * spiral_radius
-                ])
-                
-                size = int(4 * (1 - spiral_t))
-                if size > 0:
-                    cv2.circle(frame, 
-                            tuple(map(int, pos)), 
-                            size, 
-                            fairy_colors[0], 
-                            -1)
+        spiral_progress = ((progress + np.arange(num_spirals) / num_spirals) % 1)[:, None]
+        angle = t * 2 + np.arange(num_spirals)[:, None] * (2 * np.pi / num_spirals)
+        spiral_t = np.arange(10)[None, :] / 10
+        spiral_radius = 30 * (1 - spiral_t)
+        dust = np.stack([center[0] + direction[0] * spiral_progress + np.cos(angle + spiral_t * 4) * spiral_radius,
+                         center[1] + direction[1] * spiral_progress + np.sin(angle + spiral_t * 4) * spiral_radius],
+                        axis=-1).reshape(-1, 2)
+        sizes = np.broadcast_to((4 * (1 - spiral_t)).astype(int), (num_spirals, 10)).ravel()
+        self.splats.add(dust, sizes * 1.5, fairy_colors[0])
+        self.splats.composite(frame, additive=True)
         
         # Efecto de brillo mágico en el centro
         glow_radius = int(40 * (1 + np.sin(t * 2) * 0.3))
@@ -748,7 +982,7 @@ class Animation:
         direction = direction / total_distance  # Normalizar dirección
         
         # Variables para efectos
-        t = time.time() * 5
+        t = _clock.now() * 5
         beam_width = 50 * (1 + np.sin(t) * 0.2)  # Rayo más ancho
         
         # Calcular punto actual del rayo basado en el progreso
@@ -762,25 +996,20 @@ class Animation:
                 beam_colors[0],
                 15)  # Línea central más gruesa
         
-        # Efecto de espiral alrededor del rayo principal
+        # Efecto de espiral alrededor del rayo principal: 30 espirales de 50 puntos en una tanda
         num_spirals = 30
-        for i in range(num_spirals):
-            phase = t + i * (2 * np.pi / num_spirals)
-            for d in np.linspace(0, current_distance, 50):
-                point = np.array(self.start_pos) + direction * d
-                spiral_radius = beam_width * (1 - d/total_distance * 0.5)
-                offset_x = np.cos(phase + d * 0.1) * spiral_radius
-                offset_y = np.sin(phase + d * 0.1) * spiral_radius
-                point = point + np.array([offset_x, offset_y])
-                
-                if i % 3 == 0:  # Cada tercera espiral es más brillante
-                    color = beam_colors[0]
-                    size = 3
-                else:
-                    color = beam_colors[1]
-                    size = 2
-                    
-                cv2.circle(frame, tuple(map(int, point)), size, color, -1)
+        phase = t + np.arange(num_spirals)[:, None] * (2 * np.pi / num_spirals)
+        d = np.linspace(0, current_distance, 50)[None, :]
+        spiral_radius = beam_width * (1 - d / total_distance * 0.5)
+        points = np.stack([self.start_pos[0] + direction[0] * d + np.cos(phase + d * 0.1) * spiral_radius,
+                           self.start_pos[1] + direction[1] * d + np.sin(phase + d * 0.1) * spiral_radius],
+                          axis=-1)
+        bright = np.arange(num_spirals) % 3 == 0  # Cada tercera espiral es más brillante
+        self.splats.add(points[~bright].reshape(-1, 2), 2 * 1.5, beam_colors[1])
+        self.splats.composite(frame)
+        # Las brillantes, encima y sumando luz, sin aclarar el morado de las demás
+        self.splats.add(points[bright].reshape(-1, 2), 3 * 1.5, beam_colors[0], 0.6)
+        self.splats.composite(frame, additive=True)
         
         # Efecto de carga al inicio
         if progress < 0.3:
@@ -808,26 +1037,17 @@ class Animation:
                 end_y = int(impact_center[1] + np.sin(angle) * explosion_size * 2)
                 cv2.line(frame, impact_center, (end_x, end_y), beam_colors[0], 3)
         
-        # Partículas de energía adicionales
+        # Partículas de energía adicionales, distribuidas a lo largo del rayo
         num_particles = 40  # Más partículas
-        for i in range(num_particles):
-            particle_progress = (progress + i/num_particles) % 1
-            offset_angle = t * 2 + i * (2 * np.pi / num_particles)
-            
-            # Distribuir partículas a lo largo del rayo
-            base_pos = np.array(self.start_pos) + direction * (current_distance * particle_progress)
-            offset_dist = beam_width * 0.7 * (1 - particle_progress * 0.5)
-            particle_pos = base_pos + np.array([
-                np.cos(offset_angle) * offset_dist,
-                np.sin(offset_angle) * offset_dist
-            ])
-            
-            size = max(2, int(10 * (1 - particle_progress)))
-            cv2.circle(frame, 
-                    tuple(map(int, particle_pos)), 
-                    size, 
-                    beam_colors[0], 
-                    -1)
+        i = np.arange(num_particles)
+        particle_progress = (progress + i / num_particles) % 1
+        offset_angle = t * 2 + i * (2 * np.pi / num_particles)
+        base_pos = np.array(self.start_pos) + direction * (current_distance * particle_progress)[:, None]
+        offset_dist = beam_width * 0.7 * (1 - particle_progress * 0.5)
+        particle_pos = base_pos + np.stack([np.cos(offset_angle), np.sin(offset_angle)], axis=1) * offset_dist[:, None]
+        sizes = np.maximum(2, (10 * (1 - particle_progress)).astype(int))
+        self.splats.add(particle_pos, sizes * 1.5, beam_colors[0])
+        self.splats.composite(frame, additive=True)
 
 
 
@@ -906,6 +1126,9 @@ class Animation:
                             cv2.polylines(frame, [np.array(secondary_points)], False, ground_colors[1], 3)
                             cv2.polylines(frame, [np.array(secondary_points)], False, ground_colors[2], 1)
         
+        # Polvo translúcido, mezclado de una vez con su opacidad
+        dust_opacity = 100 / 255 * (1 - progress)  # Reducida la opacidad
+        dust = []
         if len(main_points) > 0:
             for point in main_points[::2]:  # Tomar solo puntos alternos para reducir densidad
                 # Reducido a solo una roca por punto
@@ -918,7 +1141,6 @@ class Animation:
                     cv2.circle(frame, tuple(rock_pos), rock_size, ground_colors[2], -1)
                 
                 # Efecto de polvo simplificado
-                dust_opacity = int(100 * (1 - progress))  # Reducida la opacidad
                 if dust_opacity > 0:
                     # Solo 2 partículas de polvo por punto
                     for _ in range(2):
@@ -927,8 +1149,11 @@ class Animation:
                             random.randint(-15, 15)
                         ])
                         dust_size = random.randint(3, 6)  # Reducido el tamaño
-                        cv2.circle(frame, tuple(dust_pos), dust_size,
-                                (*ground_colors[4][:3], dust_opacity), -1)
+                        dust.append((*dust_pos, dust_size))
+        if dust:
+            dust = np.array(dust)
+            self.splats.add(dust[:, :2], dust[:, 2] * 1.5, ground_colors[4], dust_opacity)
+            self.splats.composite(frame)
         
         # Efecto de impacto reducido
         if len(main_points) > 0:
@@ -938,127 +1163,13 @@ class Animation:
 
 
     def _draw_water_animation(self, frame, progress):
-        # Colores del agua
-        water_colors = [
-            (255, 178, 102),  # Azul claro
-            (255, 215, 102),  # Azul mas claro
-            (255, 255, 255)   # Blanco (para brillos)
-        ]
-        
-        # Actualizar y dibujar gotas de agua
-        for particle in self.particles:
-            # Movimiento ondulatorio mas complejo
-            wave_x = math.sin(progress * particle['wave_frequency'] + particle['wave_offset']) * 15
-            wave_y = math.cos(progress * particle['wave_frequency'] + particle['wave_offset']) * 8
-            
-            current_pos = [
-                particle['pos'][0] + wave_x,
-                particle['pos'][1] + wave_y
-            ]
-            
-            # Actualizar posicion con efecto de arrastre
-            particle['pos'][0] += particle['velocity'][0] * 0.6
-            particle['pos'][1] += particle['velocity'][1] * 0.6
-            
-            # Dibujar gota de agua con efectos
-            pos = (int(current_pos[0]), int(current_pos[1]))
-            size = int(particle['size'] * (1.2 - progress * 0.5))
-            
-            if size > 0:
-                # Gota principal con gradiente
-                for i, color in enumerate(water_colors):
-                    current_size = size - i * 2
-                    if current_size > 0:
-                        cv2.circle(frame, pos, current_size, color, -1)
-                
-                # Efecto de brillo
-                highlight_pos = (pos[0] - 1, pos[1] - 1)
-                highlight_size = max(1, size // 3)
-                cv2.circle(frame, highlight_pos, highlight_size, (255, 255, 255), -1)
-                
-                # Añadir rastro de agua
-                if random.random() < 0.3:
-                    splash_pos = (
-                        pos[0] + int(random.uniform(-size, size)),
-                        pos[1] + int(random.uniform(-size, size))
-                    )
-                    cv2.circle(frame, splash_pos, 1, water_colors[0], -1)
+        self.update_particles(frame, progress)
 
     def _draw_grass_animation(self, frame, progress):
-        leaf_colors = [
-            (0, 255, 0),     # Verde brillante
-            (50, 255, 50),   # Verde claro
-            (150, 255, 150)  # Verde muy claro
-        ]
-        
-        for particle in self.particles:
-            # Movimiento mas organico
-            particle['pos'][0] += particle['velocity'][0] * 0.6
-            particle['pos'][1] += particle['velocity'][1] * 0.6
-            
-            # Rotacion con oscilacion
-            base_angle = particle['angle'] + progress * 8
-            wave = math.sin(progress * 10 + particle['oscillation_offset']) * 0.5
-            angle = base_angle + wave
-            
-            pos = (int(particle['pos'][0]), int(particle['pos'][1]))
-            size = int(particle['size'] * (1.2 - progress * 0.4))
-            
-            if size > 0:
-                # Dibujar hojas con efectos
-                for i, color in enumerate(leaf_colors):
-                    current_size = size - i * 2
-                    if current_size > 0:
-                        points = self._get_rotated_leaf_points(pos, angle, current_size)
-                        cv2.fillPoly(frame, [points], color)
-                
-                # Añadir efectos de brillo
-                if random.random() < 0.2:
-                    spark_pos = (
-                        pos[0] + int(random.uniform(-size, size)),
-                        pos[1] + int(random.uniform(-size, size))
-                    )
-                    cv2.circle(frame, spark_pos, 1, (200, 255, 200), -1)
-                
-                # Efecto de rastro de energia
-                trail_points = self._get_rotated_leaf_points(pos, angle - 0.5, size // 2)
-                cv2.polylines(frame, [trail_points], True, (100, 255, 100), 1)
-
-
-    def _get_rotated_leaf_points(self, pos, angle, size):
-        # Crear puntos base para una hoja mas detallada
-        points = np.array([
-            [pos[0], pos[1] - size * 1.5],  # Punta
-            [pos[0] - size, pos[1] - size],  # Izquierda superior
-            [pos[0] - size * 1.2, pos[1]],   # Izquierda medio
-            [pos[0] - size, pos[1] + size],  # Izquierda inferior
-            [pos[0], pos[1] + size * 1.2],   # Base
-            [pos[0] + size, pos[1] + size],  # Derecha inferior
-            [pos[0] + size * 1.2, pos[1]],   # Derecha medio
-            [pos[0] + size, pos[1] - size]   # Derecha superior
-        ], np.int32)
-        
-        # Rotar puntos
-        center = np.array([pos[0], pos[1]])
-        rotated_points = []
-        for point in points:
-            dx = point[0] - center[0]
-            dy = point[1] - center[1]
-            rotated_x = dx * math.cos(angle) - dy * math.sin(angle) + center[0]
-            rotated_y = dx * math.sin(angle) + dy * math.cos(angle) + center[1]
-            rotated_points.append([int(rotated_x), int(rotated_y)])
-        
-        return np.array(rotated_points, np.int32)
+        self.update_particles(frame, progress)
+
 
     def _draw_psychic_animation(self, frame, progress):
-        # Colores psionicos mejorados
-        psychic_colors = [
-            (255, 0, 255),    # Magenta
-            (200, 0, 200),    # Magenta oscuro
-            (255, 100, 255),  # Rosa claro
-            (255, 255, 255)   # Blanco
-        ]
-        
         # Calcular centro actual con movimiento suave
         current_center = np.array([
             self.start_pos[0] + (self.end_pos[0] - self.start_pos[0]) * progress,
@@ -1072,7 +1183,7 @@ class Animation:
             radius = int(50 * (1 + math.sin(progress_offset * 2 * math.pi)))
             
             # Dibujar multiples anillos con diferentes colores
-            for j, color in enumerate(psychic_colors):
+            for j, color in enumerate(PSYCHIC_COLORS):
                 current_radius = radius - j * 3
                 if current_radius > 0:
                     thickness = max(1, int(3 * (1 - progress)))
@@ -1080,31 +1191,8 @@ class Animation:
                             (int(current_center[0]), int(current_center[1])),
                             current_radius, color, thickness)
         
-        # Particulas orbitantes con efectos de energia
-        for particle in self.particles:
-            base_angle = particle['angle'] + progress * 15
-            radius = 30 + 20 * math.sin(progress * 4 * math.pi)
-            
-            # Calcular posicion de la particula
-            pos = (
-                int(current_center[0] + radius * math.cos(base_angle)),
-                int(current_center[1] + radius * math.sin(base_angle))
-            )
-            
-            # Dibujar estela de energia psiquica
-            trail_length = 8
-            for i in range(trail_length):
-                trail_angle = base_angle - i * 0.2
-                trail_pos = (
-                    int(current_center[0] + radius * math.cos(trail_angle)),
-                    int(current_center[1] + radius * math.sin(trail_angle))
-                )
-                size = max(1, 3 - i // 2)
-                alpha = int(255 * (1 - i/trail_length) * (1 - progress))
-                cv2.circle(frame, trail_pos, size, psychic_colors[min(i//2, len(psychic_colors)-1)], -1)
-            
-            # Dibujar particula principal
-            cv2.circle(frame, pos, 3, (255, 255, 255), -1)
+        # Particulas orbitantes con estela de energia (_psychic_particles)
+        self.update_particles(frame, progress)
         
         # Efecto de ondas psiquicas expansivas
         wave_count = 3
@@ -1116,119 +1204,14 @@ class Animation:
                     wave_radius, (255, 0, 255), 1)
 
     def _draw_ice_animation(self, frame, progress):
-        # Colores de hielo mejorados
-        ice_colors = [
-            (255, 255, 255),  # Blanco
-            (250, 250, 255),  # Blanco azulado
-            (200, 220, 255),  # Azul muy claro
-            (150, 200, 255)   # Azul hielo
-        ]
-        
-        for particle in self.particles:
-            # Movimiento con efecto de cristalizacion
-            particle['pos'][0] += particle['velocity'][0] * 0.8 * (1 - progress * 0.7)
-            particle['pos'][1] += particle['velocity'][1] * 0.8 * (1 - progress * 0.7)
-            
-            center = (int(particle['pos'][0]), int(particle['pos'][1]))
-            size = int(particle['size'] * (1.2 - progress * 0.3))
-            base_angle = particle['angle'] + progress * 3
-            
-            if size > 0:
-                # Dibujar copo de nieve principal
-                for i in range(6):
-                    angle = base_angle + i * math.pi / 3
-                    
-                    # Rama principal
-                    end_point = (
-                        int(center[0] + size * 3 * math.cos(angle)),
-                        int(center[1] + size * 3 * math.sin(angle))
-                    )
-                    
-                    # Dibujar rama principal con gradiente
-                    for j, color in enumerate(ice_colors):
-                        thickness = 3 - j
-                        if thickness > 0:
-                            cv2.line(frame, center, end_point, color, thickness)
-                    
-                    # Ramificaciones secundarias
-                    branch_count = 3
-                    for j in range(branch_count):
-                        branch_start = (
-                            int(center[0] + (j + 1) * size * math.cos(angle)),
-                            int(center[1] + (j + 1) * size * math.sin(angle))
-                        )
-                        
-                        # Ramas laterales
-                        for direction in [-1, 1]:
-                            branch_angle = angle + direction * math.pi / 3
-                            branch_length = size * (1 - j/branch_count)
-                            branch_end = (
-                                int(branch_start[0] + branch_length * math.cos(branch_angle)),
-                                int(branch_start[1] + branch_length * math.sin(branch_angle))
-                            )
-                            
-                            # Dibujar rama secundaria con gradiente
-                            for k, color in enumerate(ice_colors):
-                                thickness = 2 - k
-                                if thickness > 0:
-                                    cv2.line(frame, branch_start, branch_end, color, thickness)
-                
-                # Efecto de cristalizacion
-                if random.random() < 0.3:
-                    crystal_pos = (
-                        center[0] + int(random.uniform(-size*2, size*2)),
-                        center[1] + int(random.uniform(-size*2, size*2))
-                    )
-                    crystal_size = random.randint(1, 3)
-                    cv2.circle(frame, crystal_pos, crystal_size, ice_colors[0], -1)
+        self.update_particles(frame, progress)
 
     def _draw_dark_animation(self, frame, progress):
-        # Colores oscuros mejorados
-        dark_colors = [
-            (139, 0, 139),    # Morado oscuro
-            (75, 0, 130),     # indigo
-            (20, 0, 40),      # Casi negro
-            (160, 32, 240)    # Purpura
-        ]
-        
         # Calcular centro actual
         center = np.array(self.start_pos) + (np.array(self.end_pos) - np.array(self.start_pos)) * progress
         
-        # Efecto de vortice oscuro
-        for particle in self.particles:
-            # Movimiento en espiral mas dramatico
-            spiral_progress = progress * 5
-            radius = 50 * (1 - progress ** 1.5)  # Contraccion no lineal
-            angle = particle['angle'] + spiral_progress * (1 + progress * 2)
-            
-            # Calcular posicion con distorsion
-            distortion = math.sin(progress * 10 + particle['oscillation_offset']) * 5
-            pos = (
-                int(center[0] + (radius + distortion) * math.cos(angle)),
-                int(center[1] + (radius + distortion) * math.sin(angle))
-            )
-            
-            # Tamaño variable con el progreso
-            size = int(particle['size'] * (1.2 - progress))
-            
-            if size > 0:
-                # Dibujar particula principal con efecto de gradiente
-                for i, color in enumerate(dark_colors):
-                    current_size = size - i
-                    if current_size > 0:
-                        cv2.circle(frame, pos, current_size, color, -1)
-                
-                # Añadir estela oscura
-                trail_length = 5
-                for i in range(trail_length):
-                    trail_angle = angle - i * 0.2
-                    trail_pos = (
-                        int(center[0] + (radius * (1 + i/trail_length)) * math.cos(trail_angle)),
-                        int(center[1] + (radius * (1 + i/trail_length)) * math.sin(trail_angle))
-                    )
-                    trail_size = max(1, size - i)
-                    alpha = int(255 * (1 - i/trail_length) * (1 - progress))
-                    cv2.circle(frame, trail_pos, trail_size, dark_colors[-1], -1)
+        # Efecto de vortice oscuro (_dark_particles)
+        self.update_particles(frame, progress)
         
         # Efecto de ondas de oscuridad
         wave_count = 4
@@ -1237,7 +1220,7 @@ class Animation:
             wave_radius = int(80 * wave_progress)
             thickness = max(1, int(3 * (1 - wave_progress)))
             cv2.circle(frame, (int(center[0]), int(center[1])),
-                    wave_radius, dark_colors[i % len(dark_colors)], thickness)
+                    wave_radius, DARK_COLORS[i % len(DARK_COLORS)], thickness)
         
         # Efecto de sombras convergentes
         shadow_count = 8
@@ -1255,7 +1238,7 @@ class Animation:
                 int(center[1] + end_radius * math.sin(angle))
             )
             
-            cv2.line(frame, start_pos, end_pos, dark_colors[0], 2)
+            cv2.line(frame, start_pos, end_pos, DARK_COLORS[0], 2)
 
 
 class Pokemon:
@@ -1264,14 +1247,9 @@ class Pokemon:
         self.max_hp = hp
         self.current_hp = hp
         self.moves = moves
-        try:
-            self.image = cv2.imread(image_path)
-            if self.image is not None:
-                self.image = cv2.resize(self.image, (200, 200))
-            else:
-                self.image = np.ones((200, 200, 3), dtype=np.uint8) * 255
-        except:
-            self.image = np.ones((200, 200, 3), dtype=np.uint8) * 255
+        # Sprite ya recortado y su versión en espejo para cuando es el rival
+        self.sprite, self.mirrored_sprite = load_sprites(image_path)
+        self.image = self.sprite.image
 
 class PokemonBattle:
     def __init__(self):
@@ -1314,11 +1292,12 @@ class PokemonBattle:
         
         # Elementos de diseño
         self.current_animation = None
-        self.last_frame_time = time.time()
+        self.last_frame_time = _clock.now()
         self.is_player_turn = True
         self.animation_start_time = 0
         self.enemy_move = None
         
+        self.build_background()
         self.reset_battle()
         
             
@@ -1545,24 +1524,19 @@ class PokemonBattle:
 
         self.current_move = move
         self.battle_state = BattleState.ANIMATING
-        self.animation_start_time = time.time()
+        self.animation_start_time = _clock.now()
         self.is_player_turn = True
 
 
 
-    def draw_background(self, frame):
-        # Inicializar el sistema de partículas si no existe
-        if not hasattr(self, 'particles'):
-            self.particles = []
-            for _ in range(50):  # Número de partículas
-                self.particles.append({
-                    'x': np.random.randint(0, self.width),
-                    'y': np.random.randint(0, self.height),
-                    'size': np.random.randint(1, 5),
-                    'speed': np.random.uniform(1, 3),
-                    'wind_offset': 0,
-                    'wind_speed': np.random.uniform(0.5, 1.5)
-                })
+    def build_background(self):
+        """Dibuja una sola vez las partes fijas del fondo.
+
+        El vórtice no depende del tiempo y queda como imagen base. Las
+        plataformas van por encima de rayos y partículas, así que se guardan
+        aparte con su máscara y se copian al final de cada frame.
+        """
+        self.background = np.zeros((self.height, self.width, 3), dtype=np.uint8)
 
         # Cielo tormentoso con vórtice
         center_x, center_y = self.width // 2, self.height // 3
@@ -1581,10 +1555,55 @@ class PokemonBattle:
                 x2 = int(center_x + (radius + 5) * math.cos(rad))
                 y2 = int(center_y + (radius + 5) * math.sin(rad))
                 if 0 <= x1 < self.width and 0 <= y1 < self.height and 0 <= x2 < self.width and 0 <= y2 < self.height:
-                    cv2.line(frame, (x1, y1), (x2, y2), color, 2)
+                    cv2.line(self.background, (x1, y1), (x2, y2), color, 2)
+
+        # Plataformas flotantes: color y máscara de los píxeles que cubren
+        platforms = np.zeros_like(self.background)
+        mask = np.zeros((self.height, self.width), dtype=np.uint8)
+
+        def ellipse(center, axes, end_angle, color, thickness):
+            cv2.ellipse(platforms, center, axes, 0, 0, end_angle, color, thickness)
+            cv2.ellipse(mask, center, axes, 0, 0, end_angle, 255, thickness)
+
+        def draw_epic_platform(center_x, center_y):
+            for i in range(20, 0, -2):
+                alpha = i / 20
+                color = (
+                    int(180 * alpha),
+                    int(40 * alpha),
+                    int(255 * alpha)
+                )
+                size = (120 + i*2, 40 + i//2)
+                ellipse((center_x, center_y), size, 360, color, -1)
+            
+            ellipse((center_x, center_y), (120, 40), 360, (80, 80, 100), -1)
+            ellipse((center_x, center_y), (110, 35), 360, (120, 120, 140), 2)
+            ellipse((center_x, center_y-5), (90, 25), 180, (200, 200, 220), 2)
+
+        draw_epic_platform(150, 250)
+        draw_epic_platform(650, 250)
+        self.platforms = platforms
+        self.platform_mask = AlphaMask(mask)
+        self.bolts = bolt_library(self.height)
+
+    def draw_background(self, frame):
+        # Fondo fijo ya dibujado: una copia
+        np.copyto(frame, self.background)
+
+        # Inicializar el sistema de partículas si no existe
+        if not hasattr(self, 'dust'):
+            # Mismos sorteos y en el mismo orden que con una partícula cada vez
+            dust = [(np.random.randint(0, self.width), np.random.randint(0, self.height),
+                     np.random.randint(1, 5), np.random.uniform(1, 3), np.random.uniform(0.5, 1.5))
+                    for _ in range(50)]  # Número de partículas
+            x, y, size, speed, wind_speed = np.array(dust, dtype=np.float64).T
+            self.dust = Particles(len(dust))
+            self.dust.emit(len(dust), pos=np.stack([x, y], axis=1),
+                           vel=np.stack([np.zeros_like(speed), speed], axis=1),
+                           size=size, frequency=wind_speed)
 
         # Sistema de tiempo para los rayos
-        current_time = time.time()
+        current_time = _clock.now()
         if not hasattr(self, 'last_lightning_time'):
             self.last_lightning_time = current_time
         
@@ -1593,89 +1612,53 @@ class PokemonBattle:
             self.should_draw_lightning = True
             self.last_lightning_time = current_time
             self.lightning_positions = [(np.random.randint(0, self.width), 0) for _ in range(2)]
+            self.lightning_bolts = [np.random.randint(len(self.bolts)) for _ in self.lightning_positions]
             self.lightning_intensity = 255
 
-        # Dibujar rayos con desvanecimiento
+        # Dibujar rayos con desvanecimiento: cada frame, el siguiente rayo de la biblioteca
         if hasattr(self, 'should_draw_lightning') and self.should_draw_lightning:
-            for start_pos in self.lightning_positions:
-                points = [start_pos]
-                for _ in range(6):
-                    prev_x, prev_y = points[-1]
-                    new_x = prev_x + np.random.randint(-120, 120)
-                    new_y = prev_y + self.height // 6
-                    points.append((new_x, new_y))
-                
-                points = np.array(points, np.int32)
-                
-                cv2.polylines(frame, [points], False, (0, 0, self.lightning_intensity), 8)
-                cv2.polylines(frame, [points], False, (self.lightning_intensity, self.lightning_intensity, self.lightning_intensity), 4)
-                
-                for i in range(len(points) - 1):
-                    if np.random.random() < 0.5:
-                        branch_start = points[i]
-                        branch_points = [branch_start]
-                        for _ in range(3):
-                            prev_x, prev_y = branch_points[-1]
-                            new_x = prev_x + np.random.randint(-60, 60)
-                            new_y = prev_y + self.height // 8
-                            branch_points.append((new_x, new_y))
-                        
-                        branch_points = np.array(branch_points, np.int32)
-                        cv2.polylines(frame, [branch_points], False, (0, 0, self.lightning_intensity), 4)
-                        cv2.polylines(frame, [branch_points], False, (self.lightning_intensity, self.lightning_intensity, self.lightning_intensity), 2)
+            step = (255 - self.lightning_intensity) // 25
+            glow = (0, 0, self.lightning_intensity)
+            core = (self.lightning_intensity,) * 3
+            for start_pos, bolt in zip(self.lightning_positions, self.lightning_bolts):
+                points, branches = self.bolts[(bolt + step) % len(self.bolts)]
+                offset = np.array(start_pos, np.int32)
+                points = points + offset
+                cv2.polylines(frame, [points], False, glow, 8)
+                cv2.polylines(frame, [points], False, core, 4)
+                if branches:
+                    branches = [branch + offset for branch in branches]
+                    cv2.polylines(frame, branches, False, glow, 4)
+                    cv2.polylines(frame, branches, False, core, 2)
             
             self.lightning_intensity -= 25
             if self.lightning_intensity <= 0:
                 self.should_draw_lightning = False
 
-        # Actualizar y dibujar partículas flotantes
+        # Actualizar y dibujar partículas flotantes, todas a la vez
         wind_time = self.frame_count / 30  # Tiempo para el movimiento del viento
-        for particle in self.particles:
-            # Actualizar posición
-            particle['wind_offset'] += particle['wind_speed']
-            wind_x = math.sin(wind_time + particle['wind_offset']) * 2  # Movimiento sinusoidal del viento
-            
-            # Mover partícula
-            particle['x'] += wind_x
-            particle['y'] += particle['speed']
-            
-            # Reiniciar si sale de la pantalla
-            if particle['y'] > self.height:
-                particle['y'] = 0
-                particle['x'] = np.random.randint(0, self.width)
-            if particle['x'] < 0:
-                particle['x'] = self.width
-            if particle['x'] > self.width:
-                particle['x'] = 0
-                
-            # Dibujar partícula con brillo sutil
-            alpha = np.random.uniform(0.5, 0.8)  # Variar la opacidad
-            color = (
-                int(100 * alpha),  # Tono grisáceo
-                int(100 * alpha),
-                int(120 * alpha)
-            )
-            cv2.circle(frame, (int(particle['x']), int(particle['y'])), 
-                    particle['size'], color, -1)
-
-        # Plataformas flotantes
-        def draw_epic_platform(center_x, center_y):
-            for i in range(20, 0, -2):
-                alpha = i / 20
-                color = (
-                    int(180 * alpha),
-                    int(40 * alpha),
-                    int(255 * alpha)
-                )
-                size = (120 + i*2, 40 + i//2)
-                cv2.ellipse(frame, (center_x, center_y), size, 0, 0, 360, color, -1)
-            
-            cv2.ellipse(frame, (center_x, center_y), (120, 40), 0, 0, 360, (80, 80, 100), -1)
-            cv2.ellipse(frame, (center_x, center_y), (110, 35), 0, 0, 360, (120, 120, 140), 2)
-            cv2.ellipse(frame, (center_x, center_y-5), (90, 25), 0, 0, 180, (200, 200, 220), 2)
-
-        draw_epic_platform(150, 250)
-        draw_epic_platform(650, 250)
+        dust = self.dust
+        dust.phase += dust.frequency  # Desfase del viento de cada partícula
+        dust.pos[:, 0] += np.sin(wind_time + dust.phase) * 2  # Movimiento sinusoidal del viento
+        dust.pos[:, 1] += dust.vel[:, 1]
+
+        # Reiniciar si sale de la pantalla
+        fallen = dust.pos[:, 1] > self.height
+        if fallen.any():
+            dust.pos[fallen, 1] = 0
+            dust.pos[fallen, 0] = np.random.randint(0, self.width, int(fallen.sum()))
+        left = dust.pos[:, 0] < 0
+        right = dust.pos[:, 0] > self.width
+        dust.pos[left, 0] = self.width
+        dust.pos[right, 0] = 0
+
+        # Dibujar partículas con brillo sutil: tono grisáceo de opacidad variable
+        alpha = np.random.uniform(0.5, 0.8, len(dust))
+        colors = (alpha[:, None] * (100, 100, 120)).astype(int)
+        draw_circles(frame, dust.pos.astype(int), dust.size.astype(int), colors)
+
+        # Plataformas flotantes, por encima de rayos y partículas
+        blit(frame, 0, 0, self.platforms, self.platform_mask)
 
         self.frame_count = (self.frame_count + 1) % 360
 
@@ -1759,8 +1742,8 @@ class PokemonBattle:
 
 
     def draw(self):
-        # Create main battle frame
-        battle_frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        # Create main battle frame (draw_background lo rellena entero)
+        battle_frame = np.empty((self.height, self.width, 3), dtype=np.uint8)
         
         # Dibujar fondo
         self.draw_background(battle_frame)
@@ -1769,20 +1752,15 @@ class PokemonBattle:
         pokemon1_y = 100
         pokemon2_y = 100
         
-        # Crear copias de las imágenes para aplicar efectos
-        pokemon1_img = self.pokemon1.image.copy()
-        pokemon2_img = self.pokemon2.image.copy()
-        
-        # Remover fondo verde y obtener máscaras alpha
-        pokemon1_img, alpha1 = remove_green_background(pokemon1_img)
-        pokemon2_img, alpha2 = remove_green_background(pokemon2_img)
-        
-        pokemon2_img = cv2.flip(pokemon2_img, 1)
-        alpha2 = cv2.flip(alpha2, 1)
+        # Sprites preparados al cargar (el rival ya volteado); solo el flash crea una imagen nueva
+        sprite1 = self.pokemon1.sprite
+        sprite2 = self.pokemon2.mirrored_sprite
+        pokemon1_img = None
+        pokemon2_img = None
 
         # Aplicar efecto de flash rojo si corresponde
         if self.is_flashing:
-            current_time = time.time()
+            current_time = _clock.now()
             flash_elapsed = current_time - self.damage_flash_start
             
             if flash_elapsed < self.damage_flash_duration:
@@ -1790,22 +1768,15 @@ class PokemonBattle:
                 flash_intensity = abs(math.sin(flash_elapsed * 10)) * 0.7
                 
                 if self.flash_target == "player":
-                    pokemon1_img = self.apply_damage_flash(pokemon1_img, flash_intensity)
+                    pokemon1_img = self.apply_damage_flash(sprite1.image, flash_intensity)
                 else:
-                    pokemon2_img = self.apply_damage_flash(pokemon2_img, flash_intensity)
+                    pokemon2_img = self.apply_damage_flash(sprite2.image, flash_intensity)
             else:
                 self.is_flashing = False
         
-        # Dibujar los Pokemon con alpha blending
-        # Pokemon 1
-        roi1 = battle_frame[pokemon1_y:pokemon1_y+200, 50:250]
-        alpha1_3d = np.stack([alpha1/255.0]*3, axis=2)
-        roi1[:] = (pokemon1_img * alpha1_3d + roi1 * (1 - alpha1_3d)).astype(np.uint8)
-        
-        # Pokemon 2
-        roi2 = battle_frame[pokemon2_y:pokemon2_y+200, 550:750]
-        alpha2_3d = np.stack([alpha2/255.0]*3, axis=2)
-        roi2[:] = (pokemon2_img * alpha2_3d + roi2 * (1 - alpha2_3d)).astype(np.uint8)
+        # Dibujar los Pokemon con su máscara alpha
+        sprite1.draw(battle_frame, 50, pokemon1_y, pokemon1_img)
+        sprite2.draw(battle_frame, 550, pokemon2_y, pokemon2_img)
         
         # El resto del método draw permanece igual...
         # Actualizar y dibujar las barras de vida
@@ -1876,10 +1847,10 @@ class PokemonBattle:
         return (not self.health_animation and 
                 not self.is_flashing and 
                 not self.current_animation and
-                time.time() - self.last_animation_end >= 0.5)
+                _clock.now() - self.last_animation_end >= 0.5)
 
     def update_battle_state(self):
-        current_time = time.time()
+        current_time = _clock.now()
         
         # Si hay una animacion en curso
         if self.current_animation:
@@ -1927,12 +1898,12 @@ class PokemonBattle:
                             return
 
                 self.current_animation = None
-                self.wait_start_time = time.time()
+                self.wait_start_time = _clock.now()
                 self.is_waiting = True
 
         # Manejar el estado de espera
         if hasattr(self, 'is_waiting') and self.is_waiting:
-            if time.time() - self.wait_start_time >= 1.0:
+            if _clock.now() - self.wait_start_time >= 1.0:
                 self.is_waiting = False
                 
                 # Si acabamos de terminar la animacion del jugador y el enemigo sigue vivo
@@ -1967,7 +1938,7 @@ class PokemonBattle:
     def start_damage_animation(self, is_player):
         self.is_flashing = True
         self.flash_target = "player" if is_player else "enemy"
-        self.damage_flash_start = time.time()
+        self.damage_flash_start = _clock.now()
         
     def start_health_animation(self, pokemon, new_hp):
         start_hp = pokemon.current_hp
@@ -1975,7 +1946,7 @@ class PokemonBattle:
             'pokemon': pokemon,
             'start_hp': start_hp,
             'end_hp': new_hp,
-            'start_time': time.time(),
+            'start_time': _clock.now(),
             'duration': 0.5  # duracion en segundos
         }
 
@@ -1983,7 +1954,7 @@ class PokemonBattle:
         if not self.health_animation:
             return
             
-        current_time = time.time()
+        current_time = _clock.now()
         animation = self.health_animation
         elapsed = current_time - animation['start_time']
         progress = min(elapsed / animation['duration'], 1.0)
@@ -2049,15 +2020,28 @@ class PokemonBattle:
 
 # Variables globales para el estado del juego
 _pokemon_battle = None
+_clock = GameClock()  # Virtual con el dt de la consola: partidas reproducibles
 
 def handle_key(key):
     global _pokemon_battle
     if _pokemon_battle:
         _pokemon_battle.handle_input(key)
 
-def get_frames():
+def reset():
+    global _pokemon_battle
+    _pokemon_battle = None
+    _clock.reset()
+
+def prepare():
+    """Carga los sprites de los dos Pokémon antes del primer frame."""
+    global _pokemon_battle
+    if _pokemon_battle is None:
+        _pokemon_battle = PokemonBattle()
+
+def get_frames(dt=None):
     global _pokemon_battle
     
+    _clock.tick(dt)
     # Inicializar el juego si es la primera vez
     if _pokemon_battle is None:
         _pokemon_battle = PokemonBattle()
@@ -3,6 +3,20 @@ import numpy as np
 import random
 from collections import deque
 from time import time
+import os
+import sys
+
+# Los módulos comunes viven en la carpeta de la consola, también al ejecutar el juego suelto
+_CONSOLE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _CONSOLE_DIR not in sys.path:
+    sys.path.insert(0, _CONSOLE_DIR)
+
+from input_layer import UP, DOWN, LEFT, RIGHT, START, raw_key_handler
+
+# Escalado en la consola: vecino más cercano para mantener los píxeles nítidos
+VIEWPORT_MODE = 'pixel'
+
+FRAME_SIZE = (300, 150)
 
 class Snake:
     def __init__(self): 
@@ -22,6 +36,7 @@ class Snake:
         # Control de velocidad
         self.last_update = time()
         self.update_interval = 0.2  # Actualizar cada 200ms (más lento)
+        self.time_accumulator = 0.0  # Tiempo pendiente cuando la consola marca el ritmo
         
         # Inicializar el juego
         self.reset_game()
@@ -47,19 +62,19 @@ class Snake:
                 self.food = (x, y)
                 break
     
-    def handle_input(self, key):
-        if self.game_over and key == ord('r'):
+    def handle_action(self, action):
+        if self.game_over and action == START:
             self.reset_game()
             return
         
-        # Mapear teclas a direcciones (incluyendo flechas del teclado)
-        if (key == ord('w') or key == 82 or key == 0) and self.direction != 'DOWN':  # W o flecha arriba
+        # Cambiar de dirección sin dar media vuelta
+        if action == UP and self.direction != 'DOWN':
             self.next_direction = 'UP'
-        elif (key == ord('s') or key == 84 or key == 1) and self.direction != 'UP':  # S o flecha abajo
+        elif action == DOWN and self.direction != 'UP':
             self.next_direction = 'DOWN'
-        elif (key == ord('a') or key == 81 or key == 2) and self.direction != 'RIGHT':  # A o flecha izquierda
+        elif action == LEFT and self.direction != 'RIGHT':
             self.next_direction = 'LEFT'
-        elif (key == ord('d') or key == 83 or key == 3) and self.direction != 'LEFT':  # D o flecha derecha
+        elif action == RIGHT and self.direction != 'LEFT':
             self.next_direction = 'RIGHT'
     
     def should_update(self):
@@ -69,14 +84,23 @@ class Snake:
             return True
         return False
     
-    def update(self):
+    def update(self, dt=None):
         if self.game_over:
             return
-            
-        # Solo actualizar si ha pasado suficiente tiempo
-        if not self.should_update():
+
+        # Sin dt (prueba independiente) se usa el reloj real
+        if dt is None:
+            if self.should_update():
+                self.step()
             return
-            
+
+        # Con dt de la consola: avanzar tantos pasos fijos como hayan transcurrido
+        self.time_accumulator += dt
+        while self.time_accumulator >= self.update_interval and not self.game_over:
+            self.time_accumulator -= self.update_interval
+            self.step()
+
+    def step(self):
         # Actualizar dirección
         self.direction = self.next_direction
         
@@ -161,12 +185,24 @@ class Snake:
 # Variables globales para el estado del juego
 _snake_game = None
 
-def handle_key(key):
+def handle_action(action):
     global _snake_game
     if _snake_game:
-        _snake_game.handle_input(key)
+        _snake_game.handle_action(action)
+
+# Teclas crudas (prueba independiente): se traducen con la tabla de la consola
+handle_key = raw_key_handler(handle_action)
+
+def reset():
+    global _snake_game
+    _snake_game = None
+
+def prepare():
+    global _snake_game
+    if _snake_game is None:
+        _snake_game = Snake()
 
-def get_frame():
+def get_frame(dt=None):
     global _snake_game
     
     # Inicializar el juego si es la primera vez
@@ -174,7 +210,7 @@ def get_frame():
         _snake_game = Snake()
     
     # Actualizar el estado del juego
-    _snake_game.update()
+    _snake_game.update(dt)
     
     # Crear y retornar el frame
     frame = np.zeros((_snake_game.height, _snake_game.width, 3), dtype=np.uint8)
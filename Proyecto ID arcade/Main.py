@@ -1,14 +1,27 @@
 import cv2
 import numpy as np
 import os
-import importlib.util
+import argparse
+import json
+import time
+from backends import HeadlessBackend, HighGUIBackend, parse_script
+from carousel import Carousel, SearchIndex
+from compositor import ScreenCompositor, rounded_mask
+from icon_cache import AsyncIconLoader, IconCache
+from prefetch import GamePrefetcher
+from game_registry import GameRegistry
+from frame_stats import FrameStats, StatsOverlay
+from input_layer import DOWN, LEFT, RIGHT, UP, InputState, dispatch_key
+from layout import get_layout
+from scheduler import FrameScheduler, accepts_dt
+from thumbnails import ThumbnailService
+from viewport import PHOTO, ViewportScaler, get_scaler
 
 # Constantes y configuración
-WINDOW_WIDTH = 800
+WINDOW_WIDTH = 800  # Tamaño de ventana por defecto; la geometría sale de layout.py
 WINDOW_HEIGHT = 700
-SCALE_X = WINDOW_WIDTH / 400
-SCALE_Y = WINDOW_HEIGHT / 400
-MAX_VISIBLE_ITEMS = 5
+MENU_VISIBLE_ITEMS = 3  # Número de juegos visibles en el carrusel del menú
+TARGET_FPS = 60  # Frames por segundo que marca el planificador de la consola
 
 # Colores
 COLORS = {
@@ -25,15 +38,77 @@ COLORS = {
 }
 
 class Nintendo3DSEmulator:
-    def __init__(self):
-        self.image = np.zeros((WINDOW_HEIGHT, WINDOW_WIDTH, 3), dtype=np.uint8)
+    def __init__(self, target_fps=TARGET_FPS, paced=True, isolate_games=False, record_dir=None,
+                 capture_dir='capturas', capture_region='console',
+                 window_size=(WINDOW_WIDTH, WINDOW_HEIGHT), background=True, camera_source=0):
+        self.layout = get_layout(*window_size)  # Geometría en píxeles para este tamaño
+        self.image = np.zeros((window_size[1], window_size[0], 3), dtype=np.uint8)
         self.current_game_module = None
         self.game_running = False
-        self.selected_game = 0
-        self.scroll_offset = 0
         self.running = True
+        self.registry = GameRegistry('juegos')  # Módulos en caché y recarga por mtime
         self.games = self.get_game_files()
         self.is_dual_screen = False  # Flag para identificar si el juego usa dos pantallas
+        self._chrome = None  # Capa precalculada con la carcasa estática
+        self._chrome_key = None
+        self.icon_cache = IconCache()  # Logos decodificados y redimensionados
+        # Con `background` los logos, las miniaturas y los juegos se cargan en
+        # hilos aparte; sin ellos todo ocurre en orden y el render es determinista
+        self.icon_loader = AsyncIconLoader(self.icon_cache) if background else None
+        # Miniaturas generadas ejecutando los juegos que no traen icono propio
+        self.thumbnails = ThumbnailService(self.registry.games_dir) if background else None
+        # Precarga del juego seleccionado. No se usa al grabar (la semilla se fija
+        # justo antes de crear la partida) ni con juegos en su propio proceso
+        self.prefetcher = (GamePrefetcher(self.registry)
+                           if background and not isolate_games and record_dir is None else None)
+        self.carousel = Carousel(MENU_VISIBLE_ITEMS)  # Juegos que muestra el menú
+        self.search_index = SearchIndex()  # Búsqueda por título ('/')
+        self.search_query = ''  # Filtro aplicado al menú ('' = todos)
+        self.searching = False  # Escribiendo la búsqueda
+        self._indexed_version = None  # Versión del manifiesto con la que se indexó
+        self._menu_layer = None  # Último render del menú (se reutiliza si no cambia)
+        self._menu_key = None
+        self.scheduler = FrameScheduler(target_fps, paced=paced)
+        self.backend = None  # Salida de vídeo y entrada (ventana o en memoria)
+        self.frame_dt = None  # Paso de tiempo del frame actual (None = reloj real del juego)
+        self.game_uses_dt = False  # Si el juego acepta el dt de la consola
+        self.upper_frame = None  # Frames del juego obtenidos en este tick
+        self.lower_frame = None
+        self.viewport_mode = PHOTO  # Modo de escalado que declara el juego (VIEWPORT_MODE)
+        self._upper_scaler = None  # Escaladores reutilizados mientras no cambie el tamaño
+        self._lower_scaler = None
+        self.isolate_games = isolate_games  # Ejecutar cada juego en su propio proceso
+        self.game_runner = None
+        self.stats = FrameStats()  # Tiempos por etapa de los últimos frames
+        self.stats_overlay = StatsOverlay(self.stats, budget_ms=1000.0 / target_fps)
+        self.show_stats = False  # Overlay de rendimiento (Tab)
+        self.input = InputState()  # Cola de eventos y estado de las acciones
+        self.frame_steps = 1  # Pasos fijos del frame actual
+        self.record_dir = record_dir  # Carpeta donde guardar las repeticiones (o None)
+        self.recorder = None
+        self.capture_dir = capture_dir  # Capturas (P) y vídeos (V) durante el juego
+        self.capture_region = capture_region  # 'console', 'upper' o 'lower'
+        self.video = None  # Grabación de vídeo en curso
+        self.upper_compositor = None  # Capas de cada pantalla (se crean con la carcasa)
+        self.lower_compositor = None
+        self.camera_source = camera_source  # Cámara (o vídeo) de la ventana flotante (C)
+        self.camera = None
+        self._camera_sequence = -1  # Último frame de la cámara volcado en su capa
+        self._exit_panel_ready = False  # La capa inferior ya muestra el botón de salir
+        self._notice = None  # (texto, instante en que desaparece)
+        self._notice_drawn = None  # Texto que ya está dibujado en la capa de avisos
+        self.refresh_carousel()
+
+    def set_window_size(self, width, height):
+        """Adapta la consola a un nuevo tamaño de ventana.
+
+        El layout se recalcula solo aquí; la carcasa, el menú y los
+        escaladores se regeneran solos al cambiar su clave o su rectángulo.
+        """
+        if (width, height) == self.layout.size:
+            return
+        self.layout = get_layout(width, height)
+        self.image = np.zeros((height, width, 3), dtype=np.uint8)
 
 
     def draw_rounded_rectangle(self, x1, y1, x2, y2, radius, color, thickness=-1):
@@ -51,11 +126,12 @@ class Nintendo3DSEmulator:
 
     def draw_hinge(self):
         """Dibuja la bisagra que conecta las dos pantallas con mejor acabado y bordes circulares"""
-        hinge_height = int(10 * SCALE_Y)  # Reducido de 12 a 10
-        hinge_y = int(200 * SCALE_Y)
-        hinge_width = int(270 * SCALE_X)  # Reducido de 300 a 250
-        hinge_x = int(65 * SCALE_X)  # Aumentado de 50 a 75 para centrarlo
-        radius = int(5 * SCALE_Y)  # Reducido de 6 a 5
+        L = self.layout
+        hinge_height = L.h(10)  # Reducido de 12 a 10
+        hinge_y = L.y(200)
+        hinge_width = L.w(270)  # Reducido de 300 a 250
+        hinge_x = L.x(65)  # Aumentado de 50 a 75 para centrarlo
+        radius = L.h(5)  # Reducido de 6 a 5
         
         # Dibuja el rectángulo principal de la bisagra
         cv2.rectangle(self.image, 
@@ -77,137 +153,250 @@ class Nintendo3DSEmulator:
         cv2.line(self.image,
                 (hinge_x + radius, hinge_y + 1),
                 (hinge_x + hinge_width - radius, hinge_y + 1),
-                (255, 80, 100), 1)
+                (255, 80, 100), L.thickness)
         
         # Línea brillante inferior
         cv2.line(self.image,
                 (hinge_x + radius, hinge_y + hinge_height - 1),
                 (hinge_x + hinge_width - radius, hinge_y + hinge_height - 1),
-                (255, 80, 50), 1)
+                (255, 80, 50), L.thickness)
 
 
     def get_game_files(self):
         """Obtiene la lista de archivos de juegos disponibles."""
-        if not os.path.exists('juegos'):
-            os.makedirs('juegos')
-        return [f for f in os.listdir('juegos') if f.endswith('.py')]
+        return self.registry.games
 
-    def import_game(self, game_path):
-        """Importa un juego desde su archivo."""
-        try:
-            module_name = os.path.splitext(os.path.basename(game_path))[0]
-            spec = importlib.util.spec_from_file_location(module_name, game_path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            return module
-        except Exception as e:
-            print(f"Error al cargar el juego: {e}")
-            return None
+    def update_game_list(self):
+        """Incorpora los juegos añadidos o eliminados sin reiniciar la consola."""
+        if self.registry.poll():
+            self.refresh_carousel()
 
-    def draw_upper_screen(self):
-        """Dibuja la pantalla superior con bordes redondeados"""
-        # Carcasa superior con bordes redondeados
-        self.draw_rounded_rectangle(
-            int(50 * SCALE_X), int(20 * SCALE_Y),
-            int(350 * SCALE_X), int(200 * SCALE_Y),
-            int(20 * SCALE_X), COLORS['blue'], -1
-        )
-        
-        # Marco negro de la pantalla
-        self.draw_rounded_rectangle(
-            int(60 * SCALE_X), int(30 * SCALE_Y),
-            int(340 * SCALE_X), int(190 * SCALE_Y),
-            int(15 * SCALE_X), COLORS['black'], -1
-        )
-        
-        # Área de visualización
-        self.draw_rounded_rectangle(
-            int(70 * SCALE_X), int(40 * SCALE_Y),
-            int(330 * SCALE_X), int(180 * SCALE_Y),
-            int(10 * SCALE_X), COLORS['dark_gray'], -1
-        )
+    def refresh_carousel(self):
+        """Reindexa los títulos y actualiza el menú conservando el juego seleccionado."""
+        self.games = self.get_game_files()
+        self.search_index.rebuild((name, self.game_title(name)) for name in self.games)
+        self._indexed_version = self.registry.manifest.version
+        self.carousel.set_items(self.search_index.search(self.search_query),
+                                keep=self.carousel.current)
 
-        if self.game_running and self.current_game_module:
-            try:
-                upper_frame, _ = self.get_game_frames()
-                if upper_frame is not None:
-                    game_frame_resized = cv2.resize(upper_frame, (int(250 * SCALE_X), int(130 * SCALE_Y)))
-                    # Centrar el frame en la pantalla
-                    x_offset = int(75 * SCALE_X)
-                    y_offset = int(45 * SCALE_Y)
-                    self.image[y_offset:y_offset + int(130 * SCALE_Y), 
-                            x_offset:x_offset + int(250 * SCALE_X)] = game_frame_resized
-            except Exception as e:
-                print(f"Error al actualizar el frame superior: {e}")
+    def set_search(self, query):
+        """Filtra el menú por `query`; al borrarla se vuelve a la lista completa."""
+        self.search_query = query
+        if query.strip():
+            self.carousel.set_items(self.search_index.search(query))
+            self.carousel.select(0)  # El mejor resultado
+        else:
+            self.carousel.set_items(self.search_index.search(''), keep=self.carousel.current)
+
+    def jump_to(self, char):
+        """Salta al siguiente juego cuyo título empieza por `char` (en bucle)."""
+        if self.search_query:
+            self.set_search('')
+        index = self.search_index
+        current = self.carousel.current
+        following = self.carousel.selected + 1
+        if (current is not None and index.title(current).startswith(char)
+                and following < len(self.carousel)
+                and index.title(self.carousel.items[following]).startswith(char)):
+            self.carousel.select(following)
+            return
+        first = index.first_with_prefix(char)
+        if first is not None:
+            self.carousel.select(first)
+
+    def start_game(self, name):
+        """Carga (o reutiliza de la caché) un juego y lo pone en marcha."""
+        if self.isolate_games:
+            self.start_isolated_game(name)
+            return
+        if self.record_dir is not None:
+            # Semilla conocida antes de crear el juego: la partida se puede repetir
+            from replay import ReplayRecorder, new_seed, seed_game
+            seed = new_seed()
+            seed_game(seed)
+            self.recorder = ReplayRecorder(name, seed, self.scheduler.target_fps,
+                                           self.scheduler.tick)
+        if self.prefetcher is not None:
+            # Partida ya preparada en segundo plano, o cargada sin pisar al hilo de precarga
+            self.current_game_module = self.prefetcher.load(name)
+        else:
+            self.current_game_module = self.registry.load(name)
+        self.input.clear()
+        if self.current_game_module:
+            # Los juegos que lo piden reciben el estado de entrada (teclas mantenidas)
+            if hasattr(self.current_game_module, 'set_input'):
+                self.current_game_module.set_input(self.input)
+            self.game_uses_dt = accepts_dt(getattr(
+                self.current_game_module, 'get_frames',
+                getattr(self.current_game_module, 'get_frame', None)))
+            self.viewport_mode = getattr(self.current_game_module, 'VIEWPORT_MODE', PHOTO)
+            self.prepare_viewports(name)
+            self.game_running = True
+
+    def prepare_viewports(self, name):
+        """Construye los escaladores con el tamaño de frame del manifiesto antes del primer frame."""
+        self.clear_game_layers()
+        info = self.registry.info(name)
+        if info is None:
+            return
+        # Los frames se escalan sobre el buffer de la capa del juego, no sobre la consola
+        if info.frame_size:
+            self._upper_scaler = ViewportScaler(info.frame_size, self.game_layer_rect('upper'),
+                                                self.viewport_mode)
+        if info.dual_screen and info.lower_frame_size:
+            self._lower_scaler = ViewportScaler(info.lower_frame_size,
+                                                self.game_layer_rect('lower'),
+                                                self.viewport_mode)
+
+    def game_layer_rect(self, screen):
+        """Rectángulo de la capa del juego: la pantalla entera en coordenadas de la pantalla."""
+        rect = self.upper_screen_rect() if screen == 'upper' else self.lower_screen_rect()
+        return (0, 0, rect[2], rect[3])
+
+    def clear_game_layers(self):
+        """Oculta el frame del juego anterior hasta que llegue el primero del nuevo."""
+        self._exit_panel_ready = False
+        for compositor in (self.upper_compositor, self.lower_compositor):
+            if compositor is not None:
+                layer = compositor.get('juego')
+                layer.image[:] = 0
+                layer.touch()
+        if self.upper_compositor is not None:
+            self.upper_compositor.get('juego').show(False)
+
+    def start_isolated_game(self, name):
+        """Lanza el juego en un proceso aparte; la consola solo lee sus frames."""
+        path = self.registry.path(name)
+        if path is None:
+            print(f"Error al cargar el juego: {name} no existe")
+            return
+        # multiprocessing y shared_memory solo se importan si se aíslan los juegos
+        from game_worker import ProcessGameRunner
+        self.game_runner = ProcessGameRunner(path, self.scheduler.target_fps)
+        # El runner expone get_frames()/handle_key() como un módulo de juego
+        self.current_game_module = self.game_runner
+        self.game_uses_dt = False
+        # El manifiesto ya dice cómo escalar: no hay que esperar al proceso del juego
+        info = self.registry.info(name)
+        self.viewport_mode = (info.viewport_mode if info else None) or PHOTO
+        self.prepare_viewports(name)
+        self.game_running = True
+
+    def stop_game(self):
+        """Sale del juego actual y vuelve al menú."""
+        if self.game_runner is not None:
+            self.game_runner.stop()
+            self.game_runner = None
+        if self.recorder is not None:
+            self.save_recording()
+        self.game_running = False
+        self.current_game_module = None
+        self.stop_camera()
+        if self.upper_compositor is not None:
+            self.upper_compositor.get('juego').show(False)
+
+    def save_recording(self):
+        """Guarda la repetición de la partida que acaba de terminar."""
+        os.makedirs(self.record_dir, exist_ok=True)
+        name = os.path.splitext(self.recorder.game)[0]
+        stem = os.path.join(self.record_dir, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}")
+        path, n = f"{stem}.rpl", 1
+        while os.path.exists(path):  # Varias partidas en el mismo segundo
+            path, n = f"{stem}-{n}.rpl", n + 1
+        self.recorder.save(path)
+        self.recorder = None
+        print(f"Repetición guardada en {path}")
 
     def draw_decorative_elements(self):
         """Dibuja elementos decorativos de la consola."""
+        L = self.layout
         # LEDs superiores
         for i, x in enumerate([80, 90, 100]):
-            cv2.circle(self.image, (int(x * SCALE_X), int(35 * SCALE_Y)), 
-                    int(2 * SCALE_X), COLORS['light_blue'], -1)
-        cv2.circle(self.image, (int(320 * SCALE_X), int(35 * SCALE_Y)), 
-                int(3 * SCALE_X), COLORS['light_blue'], -1)
+            cv2.circle(self.image, L.point(x, 35), 
+                    L.w(2), COLORS['light_blue'], -1)
+        cv2.circle(self.image, L.point(320, 35), 
+                L.w(3), COLORS['light_blue'], -1)
         
         # Borde curvo
-        cv2.ellipse(self.image, (int(200 * SCALE_X), int(202 * SCALE_Y)), 
-                    (int(130 * SCALE_X), int(5 * SCALE_Y)), 0, 0, 180, 
+        cv2.ellipse(self.image, L.point(200, 202), 
+                    (L.w(130), L.h(5)), 0, 0, 180, 
                     COLORS['light_blue'], -1)
 
-    def draw_lower_screen(self):
-        """Dibuja la pantalla inferior con bordes redondeados"""
+    def draw_lower_casing(self):
+        """Dibuja la carcasa inferior y el marco de la pantalla táctil"""
+        L = self.layout
         # Carcasa inferior
-        self.draw_rounded_rectangle(
-            int(50 * SCALE_X), int(205 * SCALE_Y),
-            int(350 * SCALE_X), int(385 * SCALE_Y),
-            int(20 * SCALE_X), COLORS['blue'], -1
-        )
+        self.draw_rounded_rectangle(*L.lower_casing, L.casing_radius, COLORS['blue'], -1)
         
         # Marco de la pantalla
-        cv2.rectangle(self.image, 
-                    (int(118 * SCALE_X), int(218 * SCALE_Y)),
-                    (int(282 * SCALE_X), int(352 * SCALE_Y)),
-                    COLORS['black'], -1)
+        x1, y1, x2, y2 = L.lower_bezel
+        cv2.rectangle(self.image, (x1, y1), (x2, y2), COLORS['black'], -1)
 
+    def draw_lower_screen(self):
+        """Dibuja el contenido de la pantalla inferior (menú o juego)"""
         if self.game_running:
             self.draw_game_screen()
         else:
             self.draw_menu_screen()
 
     def draw_menu_screen(self):
+        """Dibuja el menú reutilizando el último render si la selección no ha cambiado."""
+        if self.icon_loader is not None:
+            self.icon_loader.poll()  # Logos que terminaron de cargarse
+        if self.thumbnails is not None:
+            self.thumbnails.poll()
+        if self._indexed_version != self.registry.manifest.version:
+            self.refresh_carousel()
+
+        # Región de la pantalla inferior que ocupa el menú. La clave no depende
+        # del número de juegos: la lista solo cuenta a través de su versión
+        x1, y1, x2, y2 = self.layout.menu_region
+        carousel = self.carousel
+        menu_key = (carousel.selected, carousel.offset, carousel.version,
+                    self.searching, self.search_query,
+                    self.icon_loader.version if self.icon_loader is not None else None,
+                    self.thumbnails.version if self.thumbnails is not None else None,
+                    self.registry.manifest.version, self._chrome_key)
+
+        if self._menu_layer is None or self._menu_key != menu_key:
+            self.render_menu_screen()
+            self._menu_layer = self.image[y1:y2, x1:x2].copy()
+            self._menu_key = menu_key
+        else:
+            self.image[y1:y2, x1:x2] = self._menu_layer
+
+    def render_menu_screen(self):
         """Dibuja la pantalla del menú de juegos estilo Nintendo DS con scroll horizontal."""
-        MAX_VISIBLE_ITEMS = 3  # Número de juegos visibles en la pantalla
-        ICON_SIZE = int(32 * SCALE_X)  # Tamaño reducido del logo
-        
-        # Asegurar que el elemento seleccionado esté visible
-        if self.selected_game >= self.scroll_offset + MAX_VISIBLE_ITEMS:
-            self.scroll_offset = self.selected_game - MAX_VISIBLE_ITEMS + 1
-        elif self.selected_game < self.scroll_offset:
-            self.scroll_offset = self.selected_game
+        L = self.layout
+        ICON_SIZE = L.icon_size  # Tamaño reducido del logo
 
         # Área disponible para dibujar (2 píxeles menos por cada lado)
-        MENU_LEFT = int(120 * SCALE_X)  
-        MENU_TOP = int(220 * SCALE_Y)   
-        MENU_RIGHT = int(280 * SCALE_X)  
-        MENU_BOTTOM = int(350 * SCALE_Y) 
+        MENU_LEFT, MENU_TOP, MENU_RIGHT, MENU_BOTTOM = L.menu
         
         # Fondo blanco del área del menú
         self.draw_rounded_rectangle(
             MENU_LEFT, MENU_TOP,
             MENU_RIGHT, MENU_BOTTOM,
-            int(5 * SCALE_X), COLORS['white'], -1
+            L.w(5), COLORS['white'], -1
         )
         
-        # Dibujar el recuadro y nombre del juego seleccionado en la parte superior
-        if 0 <= self.selected_game < len(self.games):
-            selected_game_name = os.path.splitext(self.games[self.selected_game])[0]
+        # Dibujar el recuadro y nombre del juego seleccionado en la parte superior;
+        # mientras se busca, el recuadro muestra lo que se va escribiendo
+        carousel = self.carousel
+        if self.searching:
+            selected_game_name = '/' + self.search_query[-16:] + '_'
+        elif carousel.current is not None:
+            selected_game_name = self.game_title(carousel.current)
+        else:
+            selected_game_name = None
+        if selected_game_name is not None:
             text_size = cv2.getTextSize(selected_game_name, cv2.FONT_HERSHEY_SIMPLEX, 
-                                    0.5 * SCALE_X, 1)[0]
+                                    L.font(0.5), L.thickness)[0]
             
             # Calcular dimensiones del recuadro del título
-            title_padding = int(10 * SCALE_X)
-            title_height = int(30 * SCALE_Y)
-            title_top = MENU_TOP + int(5 * SCALE_Y)
+            title_padding = L.w(10)
+            title_height = L.h(30)
+            title_top = MENU_TOP + L.h(5)
             
             # Dibujar recuadro para el título
             self.draw_rounded_rectangle(
@@ -215,7 +404,7 @@ class Nintendo3DSEmulator:
                 title_top,
                 MENU_RIGHT - title_padding,
                 title_top + title_height,
-                int(3 * SCALE_X),
+                L.w(3),
                 (240, 240, 240),  # Color gris muy claro
                 -1
             )
@@ -225,84 +414,113 @@ class Nintendo3DSEmulator:
             text_y = title_top + (title_height + text_size[1]) // 2
             cv2.putText(self.image, selected_game_name,
                     (text_x, text_y),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.5 * SCALE_X,
-                    COLORS['dark_text'], 1, cv2.LINE_AA)
+                    cv2.FONT_HERSHEY_SIMPLEX, L.font(0.5),
+                    COLORS['dark_text'], L.thickness, cv2.LINE_AA)
         
         # Calcular el espacio disponible y el espaciado entre elementos
-        available_width = MENU_RIGHT - MENU_LEFT - int(20 * SCALE_X)
-        item_spacing = available_width // MAX_VISIBLE_ITEMS
-        start_x = MENU_LEFT + int(15 * SCALE_X)
-        center_y = MENU_TOP + (MENU_BOTTOM - MENU_TOP) // 2 + int(20 * SCALE_Y)
+        available_width = MENU_RIGHT - MENU_LEFT - L.w(20)
+        item_spacing = available_width // MENU_VISIBLE_ITEMS
+        start_x = MENU_LEFT + L.w(15)
+        center_y = MENU_TOP + (MENU_BOTTOM - MENU_TOP) // 2 + L.h(20)
         
-        for i in range(min(MAX_VISIBLE_ITEMS, len(self.games))):
-            game_index = i + self.scroll_offset
-            if game_index < len(self.games):
-                current_x = start_x + i * item_spacing
-                game_name = os.path.splitext(self.games[game_index])[0]
-                
-                # Cargar y mostrar el logo del juego
-                logo_path = os.path.join('Juegos', f"{game_name}.jpg")
-                if os.path.exists(logo_path):
-                    try:
-                        logo = cv2.imread(logo_path)
-                        if logo is not None:
-                            # Redimensionar logo
-                            logo = cv2.resize(logo, (ICON_SIZE, ICON_SIZE))
-                            
-                            # Coordenadas para el logo
-                            logo_x = current_x
-                            logo_y = center_y - int(ICON_SIZE/2)
-                            
-                            # Si es el juego seleccionado, dibujar fondo resaltado
-                            if game_index == self.selected_game:
-                                padding = int(3 * SCALE_X)
-                                self.draw_rounded_rectangle(
-                                    logo_x - padding, 
-                                    logo_y - padding,
-                                    logo_x + ICON_SIZE + padding,
-                                    logo_y + ICON_SIZE + padding,
-                                    int(3 * SCALE_X),
-                                    (214, 232, 248),
-                                    -1
-                                )
-                                
-                                # Borde de selección
-                                self.draw_rounded_rectangle(
-                                    logo_x - padding,
-                                    logo_y - padding,
-                                    logo_x + ICON_SIZE + padding,
-                                    logo_y + ICON_SIZE + padding,
-                                    int(3 * SCALE_X),
-                                    (173, 216, 230),
-                                    1
-                                )
+        if self.search_query and not len(carousel):
+            text_size = cv2.getTextSize("Sin resultados", cv2.FONT_HERSHEY_SIMPLEX,
+                                        L.font(0.4), L.thickness)[0]
+            cv2.putText(self.image, "Sin resultados",
+                        (MENU_LEFT + (MENU_RIGHT - MENU_LEFT - text_size[0]) // 2, center_y),
+                        cv2.FONT_HERSHEY_SIMPLEX, L.font(0.4),
+                        COLORS['dark_text'], L.thickness, cv2.LINE_AA)
+
+        # Solo se materializan los juegos de la ventana visible del carrusel
+        for i, (game_index, name) in enumerate(carousel.window()):
+            current_x = start_x + i * item_spacing
+            game_name = self.game_title(name)
+            
+            # Cargar y mostrar el logo del juego (decodificado una sola vez)
+            info = self.registry.info(name)
+            logo_path = info.icon if info else None
+            generating = False
+            if not logo_path and self.thumbnails is not None:
+                # Sin icono propio: miniatura sacada de una partida sin ventana
+                game_path = self.registry.path(name)
+                if game_path:
+                    logo_path = self.thumbnails.get(game_path)
+                    generating = self.thumbnails.pending(game_path)
+            if logo_path or generating:
+                try:
+                    if logo_path:
+                        logo, loading = self.menu_icon(logo_path, ICON_SIZE)
+                    else:
+                        logo, loading = None, True
+                    if logo is not None or loading:
+                        # Coordenadas para el logo
+                        logo_x = current_x
+                        logo_y = center_y - int(ICON_SIZE/2)
+                        
+                        # Si es el juego seleccionado, dibujar fondo resaltado
+                        if game_index == carousel.selected:
+                            padding = L.w(3)
+                            self.draw_rounded_rectangle(
+                                logo_x - padding, 
+                                logo_y - padding,
+                                logo_x + ICON_SIZE + padding,
+                                logo_y + ICON_SIZE + padding,
+                                L.w(3),
+                                (214, 232, 248),
+                                -1
+                            )
                             
+                            # Borde de selección
+                            self.draw_rounded_rectangle(
+                                logo_x - padding,
+                                logo_y - padding,
+                                logo_x + ICON_SIZE + padding,
+                                logo_y + ICON_SIZE + padding,
+                                L.w(3),
+                                (173, 216, 230),
+                                L.thickness
+                            )
+                        
+                        if logo is not None:
                             # Insertar logo en la imagen
                             self.image[logo_y:logo_y+ICON_SIZE, 
                                     logo_x:logo_x+ICON_SIZE] = logo
-                            
-                    except Exception as e:
-                        print(f"Error al cargar el logo de {game_name}: {e}")
-                        self._draw_fallback_item(game_name, current_x, center_y, game_index, ICON_SIZE)
-                else:
+                        else:
+                            # Hueco mientras el logo se carga en segundo plano
+                            self.draw_rounded_rectangle(
+                                logo_x, logo_y,
+                                logo_x + ICON_SIZE, logo_y + ICON_SIZE,
+                                L.w(3), (225, 225, 225), -1)
+                        
+                except Exception as e:
+                    print(f"Error al cargar el logo de {game_name}: {e}")
                     self._draw_fallback_item(game_name, current_x, center_y, game_index, ICON_SIZE)
+            else:
+                self._draw_fallback_item(game_name, current_x, center_y, game_index, ICON_SIZE)
+
+        # Precargar los logos de las ventanas vecinas para que el scroll no muestre huecos
+        if self.icon_loader is not None:
+            for name in carousel.around():
+                info = self.registry.info(name)
+                if info and info.icon:
+                    self.icon_loader.request(info.icon, ICON_SIZE)
 
         # Indicadores de scroll (flechas izquierda/derecha)
-        if self.scroll_offset > 0:
+        if carousel.offset > 0:
             # Flecha izquierda (ajustada para quedar dentro del menú)
             triangle_pts = np.array([
-                [MENU_LEFT + int(3 * SCALE_X), center_y],  # Punta
-                [MENU_LEFT + int(8 * SCALE_X), center_y - int(5 * SCALE_Y)],  # Superior
-                [MENU_LEFT + int(8 * SCALE_X), center_y + int(5 * SCALE_Y)]   # Inferior
+                [MENU_LEFT + L.w(3), center_y],  # Punta
+                [MENU_LEFT + L.w(8), center_y - L.h(5)],  # Superior
+                [MENU_LEFT + L.w(8), center_y + L.h(5)]   # Inferior
             ], np.int32)
             cv2.fillPoly(self.image, [triangle_pts], COLORS['dark_text'])
 
-        if self.scroll_offset + MAX_VISIBLE_ITEMS < len(self.games):
+        if carousel.offset + carousel.visible < len(carousel):
             # Flecha derecha
             triangle_pts = np.array([
-                [MENU_RIGHT - int(5 * SCALE_X), center_y],  # Punta
-                [MENU_RIGHT - int(10 * SCALE_X), center_y - int(5 * SCALE_Y)],  # Superior
-                [MENU_RIGHT - int(10 * SCALE_X), center_y + int(5 * SCALE_Y)]   # Inferior
+                [MENU_RIGHT - L.w(5), center_y],  # Punta
+                [MENU_RIGHT - L.w(10), center_y - L.h(5)],  # Superior
+                [MENU_RIGHT - L.w(10), center_y + L.h(5)]   # Inferior
             ], np.int32)
             cv2.fillPoly(self.image, [triangle_pts], COLORS['dark_text'])
 
@@ -311,50 +529,58 @@ class Nintendo3DSEmulator:
 
 
 
+    def menu_icon(self, path, size):
+        """Logo de un juego para el menú: (icono o None, si aún se está cargando)."""
+        if self.icon_loader is None:
+            return self.icon_cache.get(path, size), False
+        icon = self.icon_loader.get(path, size)
+        return icon, icon is None and self.icon_loader.pending(path, size)
+
+    def game_title(self, name):
+        """Nombre visible de un juego según el manifiesto."""
+        info = self.registry.info(name)
+        return info.title if info else os.path.splitext(name)[0]
+
     def _draw_fallback_item(self, game_name, current_x, center_y, game_index, ICON_SIZE):
         """Dibuja un elemento de menú sin logo como fallback."""
-        if game_index == self.selected_game:
+        L = self.layout
+        if game_index == self.carousel.selected:
             self.draw_rounded_rectangle(
-                current_x - int(3 * SCALE_X),
-                center_y - int(ICON_SIZE/2) - int(3 * SCALE_Y),
-                current_x + ICON_SIZE + int(3 * SCALE_X),
-                center_y + int(ICON_SIZE/2) + int(3 * SCALE_Y),
-                int(3 * SCALE_X),
+                current_x - L.w(3),
+                center_y - int(ICON_SIZE/2) - L.h(3),
+                current_x + ICON_SIZE + L.w(3),
+                center_y + int(ICON_SIZE/2) + L.h(3),
+                L.w(3),
                 (214, 232, 248),
                 -1
             )
             self.draw_rounded_rectangle(
-                current_x - int(3 * SCALE_X),
-                center_y - int(ICON_SIZE/2) - int(3 * SCALE_Y),
-                current_x + ICON_SIZE + int(3 * SCALE_X),
-                center_y + int(ICON_SIZE/2) + int(3 * SCALE_Y),
-                int(3 * SCALE_X),
+                current_x - L.w(3),
+                center_y - int(ICON_SIZE/2) - L.h(3),
+                current_x + ICON_SIZE + L.w(3),
+                center_y + int(ICON_SIZE/2) + L.h(3),
+                L.w(3),
                 (173, 216, 230),
-                1
+                L.thickness
             )
         
         cv2.putText(self.image, game_name,
                     (current_x, center_y),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.35 * SCALE_X,
-                    COLORS['dark_text'], 1, cv2.LINE_AA)
+                    cv2.FONT_HERSHEY_SIMPLEX, L.font(0.35),
+                    COLORS['dark_text'], L.thickness, cv2.LINE_AA)
 
 
  
 
     def draw_controls(self):
         """Dibuja los controles de la consola."""
+        L = self.layout
         # Circle Pad
-        cv2.circle(self.image, (int(81 * SCALE_X), int(260 * SCALE_Y)), 
-                int(18 * SCALE_X), COLORS['light_blue'], -1)
+        cv2.circle(self.image, L.circle_pad, 
+                L.circle_pad_radius, COLORS['light_blue'], -1)
 
         # D-Pad
-        dpad_points = np.array([
-            [65, 307], [75, 307], [75, 297], [85, 297], [85, 307],
-            [95, 307], [95, 317], [85, 317], [85, 327], [75, 327],
-            [75, 317], [65, 317]
-        ], np.int32)
-        dpad_points = np.array([[int(x * SCALE_X), int(y * SCALE_Y)] for x, y in dpad_points])
-        cv2.fillPoly(self.image, [dpad_points], COLORS['light_blue'])
+        cv2.fillPoly(self.image, [L.dpad], COLORS['light_blue'])
 
         # Botones A B X Y
         self.draw_action_buttons()
@@ -364,50 +590,45 @@ class Nintendo3DSEmulator:
 
     def draw_action_buttons(self):
         """Dibuja los botones de acción (A,B,X,Y) con mejor acabado"""
-        button_radius = int(8 * SCALE_X)
-        offset_x = 25
-        button_positions = [
-            (290, 273, 'X', (200, 200, 200)),  # X button
-            (270, 293, 'Y', (200, 200, 200)),  # Y button
-            (310, 293, 'A', (200, 200, 200)),  # A button
-            (290, 313, 'B', (200, 200, 200))   # B button
-        ]
+        L = self.layout
+        button_radius = L.action_button_radius
+        color = (200, 200, 200)
         
-        for x, y, letter, color in button_positions:
+        for center, letter in L.action_buttons:
             # Sombra del botón
             cv2.circle(self.image, 
-                    (int((x + offset_x) * SCALE_X), int(y * SCALE_Y)),
+                    center,
                     button_radius + 1,
                     (30, 30, 30), -1)
             
             # Botón principal
             cv2.circle(self.image, 
-                    (int((x + offset_x) * SCALE_X), int(y * SCALE_Y)),
+                    center,
                     button_radius,
                     color, -1)
             
             # Brillo superior
             cv2.ellipse(self.image,
-                    (int((x + offset_x) * SCALE_X), int(y * SCALE_Y)),
+                    center,
                     (button_radius-2, button_radius//2),
                     0, 180, 360,
-                    (255, 255, 255), 1)
+                    (255, 255, 255), L.thickness)
             
-            # Letra del botón
+            # Letra del botón (4 unidades a la izquierda y abajo del centro)
             cv2.putText(self.image, letter,
-                    (int((x + offset_x - 4) * SCALE_X), int((y + 4) * SCALE_Y)),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.4 * SCALE_X,
-                    (50, 50, 50), 1, cv2.LINE_AA)
+                    (center[0] - L.w(4), center[1] + L.h(4)),
+                    cv2.FONT_HERSHEY_SIMPLEX, L.font(0.4),
+                    (50, 50, 50), L.thickness, cv2.LINE_AA)
 
     def draw_circle_pad(self):
         """Dibuja el Circle Pad con efecto 3D más realista"""
-        center_x = int(81 * SCALE_X)
-        center_y = int(260 * SCALE_Y)
-        radius = int(18 * SCALE_X)
+        L = self.layout
+        center_x, center_y = L.circle_pad
+        radius = L.circle_pad_radius
         
         # Base oscura del Circle Pad
         cv2.circle(self.image, (center_x, center_y), 
-                radius + int(2 * SCALE_X),
+                radius + L.w(2),
                 COLORS['darker_blue'], -1)
         
         # Círculo principal con gradiente
@@ -421,39 +642,40 @@ class Nintendo3DSEmulator:
         
         # Efecto de brillo superior
         cv2.ellipse(self.image,
-                (center_x - int(2 * SCALE_X), center_y - int(2 * SCALE_Y)),
+                (center_x - L.w(2), center_y - L.h(2)),
                 (int(radius * 0.6), int(radius * 0.2)),
                 -30, 0, 180,
-                (255, 255, 255), 1)
+                (255, 255, 255), L.thickness)
 
     def draw_system_buttons(self):
         """Dibuja los botones SELECT y START con mejor acabado y texto centrado"""
-        button_height = int(12 * SCALE_Y)  # Aumentado de 10 a 12
+        L = self.layout
+        button_height = L.h(12)  # Aumentado de 10 a 12
         
         # SELECT y START
         for i, (text, x) in enumerate([('SELECT', 150), ('START', 210)]):
-            button_width = int(45 * SCALE_X)  # Aumentado de 30 a 35
-            button_x = int(x * SCALE_X)
-            button_y = int(360 * SCALE_Y)
+            button_width = L.w(45)  # Aumentado de 30 a 35
+            button_x = L.x(x)
+            button_y = L.y(360)
             
             # Sombra del botón
             self.draw_rounded_rectangle(
                 button_x, button_y,
                 button_x + button_width, button_y + button_height,
-                int(3 * SCALE_X), (30, 30, 30), -1
+                L.w(3), (30, 30, 30), -1
             )
             
             # Botón principal
             self.draw_rounded_rectangle(
                 button_x, button_y,
                 button_x + button_width, button_y + (button_height - 1),
-                int(3 * SCALE_X), (180, 180, 180), -1
+                L.w(3), (180, 180, 180), -1
             )
             
             # Calcular dimensiones del texto
-            font_scale = 0.35 * SCALE_X  # Reducido ligeramente de 0.4 a 0.35
+            font_scale = L.font(0.35)  # Reducido ligeramente de 0.4 a 0.35
             (text_width, text_height), baseline = cv2.getTextSize(
-                text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, 1
+                text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, L.thickness
             )
             
             # Calcular posición centrada del texto
@@ -464,40 +686,38 @@ class Nintendo3DSEmulator:
             cv2.putText(self.image, text,
                     (text_x, text_y),
                     cv2.FONT_HERSHEY_SIMPLEX, font_scale,
-                    (50, 50, 50), 1, cv2.LINE_AA)
+                    (50, 50, 50), L.thickness, cv2.LINE_AA)
 
         # Botón de encendido (sin cambios)
-        power_button_x = int(290 * SCALE_X)
-        power_button_y = int(360 * SCALE_Y)
+        power_button_x, power_button_y = L.power_button
         
         # Sombra del botón de encendido
         cv2.circle(self.image,
                 (power_button_x, power_button_y),
-                int(9 * SCALE_X),
+                L.power_button_radius,
                 (30, 30, 30), -1)
         
         # Botón principal
         cv2.circle(self.image,
                 (power_button_x, power_button_y),
-                int(8 * SCALE_X),
+                L.w(8),
                 (180, 180, 180), -1)
         
         # Brillo superior
         cv2.ellipse(self.image,
                 (power_button_x, power_button_y),
-                (int(6 * SCALE_X), int(3 * SCALE_X)),
+                (L.w(6), L.w(3)),
                 0, 180, 360,
-                (255, 255, 255), 1)
+                (255, 255, 255), L.thickness)
 
     def handle_mouse_click(self, event, x, y, flags, param):
         """Maneja los clics del mouse."""
         if event == cv2.EVENT_LBUTTONDOWN:
             # Obtener el centro del botón de apagado
-            power_button_x = int(290 * SCALE_X)
-            power_button_y = int(360 * SCALE_Y)
+            power_button_x, power_button_y = self.layout.power_button
             
             # Radio del botón de apagado
-            power_button_radius = int(9 * SCALE_X)
+            power_button_radius = self.layout.power_button_radius
             
             # Calcular la distancia entre el clic y el centro del botón
             distance = ((x - power_button_x) ** 2 + (y - power_button_y) ** 2) ** 0.5
@@ -508,147 +728,477 @@ class Nintendo3DSEmulator:
 
     def handle_key(self, key):
         """Maneja las entradas de teclado."""
+        if key == 9:  # Tab: overlay de rendimiento, dentro y fuera de los juegos
+            self.show_stats = not self.show_stats
+            return
+        if self.searching and not self.game_running:
+            # Mientras se escribe la búsqueda las letras no son atajos
+            self.handle_search_key(key)
+            return
         if self.game_running:
+            # En el menú las letras saltan a un título: los atajos con letra son solo del juego
             if key == ord('q'):
-                self.game_running = False
-                self.current_game_module = None
+                self.stop_game()
+            elif key == ord('p'):  # Captura de pantalla en PNG
+                self.save_screenshot()
+            elif key == ord('v'):  # Empezar o terminar la grabación de vídeo
+                self.toggle_video()
+            elif key == ord('c'):  # Cámara en una ventana flotante sobre la pantalla inferior
+                self.toggle_camera()
             else:
                 try:
-                    self.current_game_module.handle_key(key)
+                    if self.recorder is not None:
+                        self.recorder.key(key)
+                    dispatch_key(self.current_game_module, key, self.input.bindings)
                 except Exception as e:
                     print(f"Error al manejar la tecla en el juego: {e}")
         else:
-            if key == 27:  # Esc
-                self.running = False
-            elif key in [ord('a'), 82]:  # Arriba
-                self.selected_game = max(0, self.selected_game - 1)
-                self.scroll_offset = min(self.scroll_offset, self.selected_game)
-            elif key in [ord('d'), 84]:  # Abajo
-                self.selected_game = min(len(self.games) - 1, self.selected_game + 1)
-                if self.selected_game >= self.scroll_offset + MAX_VISIBLE_ITEMS:
-                    self.scroll_offset = self.selected_game - MAX_VISIBLE_ITEMS + 1
+            if key == 27:  # Esc: quitar el filtro o salir
+                if self.search_query:
+                    self.set_search('')
+                else:
+                    self.running = False
             elif key == 13:  # Enter
-                if self.games:
-                    game_path = os.path.join('juegos', self.games[self.selected_game])
-                    self.current_game_module = self.import_game(game_path)
-                    if self.current_game_module:
-                        self.game_running = True
+                if self.carousel.current is not None:
+                    self.start_game(self.carousel.current)
+            elif key == ord('/'):  # Buscar por título
+                self.searching = True
+            elif ord('a') <= key <= ord('z') or ord('0') <= key <= ord('9'):
+                self.jump_to(chr(key))
+            elif self.input.bindings.get(key) in (UP, LEFT):  # Flechas: anterior
+                self.carousel.move(-1)
+            elif self.input.bindings.get(key) in (DOWN, RIGHT):  # Flechas: siguiente
+                self.carousel.move(1)
 
-    def draw_console(self):
-        """Dibuja la consola completa."""
-        self.image = np.zeros((WINDOW_HEIGHT, WINDOW_WIDTH, 3), dtype=np.uint8)
-        self.draw_upper_screen()
+    def save_screenshot(self):
+        """Guarda una captura de pantalla en PNG."""
+        from recorder import capture_path, save_screenshot
+        path = capture_path(self.capture_dir, 'captura', 'png')
+        save_screenshot(self.capture_frame(), path)
+        print(f"Captura guardada en {path}")
+        self.notify("Captura guardada")
+
+    def handle_search_key(self, key):
+        """Teclas mientras se escribe la búsqueda del menú."""
+        if key == 27:  # Esc: cancelar
+            self.searching = False
+            self.set_search('')
+        elif key == 13:  # Enter: jugar al resultado seleccionado
+            self.searching = False
+            if self.carousel.current is not None:
+                self.start_game(self.carousel.current)
+        elif key in (8, 127):  # Borrar
+            self.set_search(self.search_query[:-1])
+        elif 32 <= key < 127:
+            self.set_search(self.search_query + chr(key).lower())
+        elif self.input.bindings.get(key) in (UP, LEFT):
+            self.carousel.move(-1)
+        elif self.input.bindings.get(key) in (DOWN, RIGHT):
+            self.carousel.move(1)
+
+    def upper_screen_rect(self):
+        """Región (x, y, ancho, alto) de la pantalla superior en el framebuffer."""
+        return self.layout.upper_viewport
+
+    def lower_screen_rect(self):
+        """Región (x, y, ancho, alto) de la pantalla inferior en el framebuffer."""
+        return self.layout.lower_viewport
+
+    def capture_frame(self):
+        """Vista del framebuffer que se captura según `capture_region`."""
+        if self.capture_region == 'upper':
+            x, y, w, h = self.upper_screen_rect()
+        elif self.capture_region == 'lower':
+            x, y, w, h = self.lower_screen_rect()
+        else:
+            return self.image
+        return self.image[y:y + h, x:x + w]
+
+    def toggle_video(self, path=None):
+        """Empieza a grabar vídeo o, si ya se está grabando, termina y lo guarda."""
+        if self.video is not None:
+            result = self.video.stop()
+            self.video = None
+            print(f"Vídeo guardado en {result['path']}: {result['frames']} frames, "
+                  f"{result['dropped']} descartados")
+            self.notify("Video guardado")
+            return
+        from recorder import VideoRecorder, capture_path
+        frame = self.capture_frame()
+        path = path or capture_path(self.capture_dir, 'video', 'mp4')
+        try:
+            self.video = VideoRecorder(path, self.scheduler.target_fps,
+                                       (frame.shape[1], frame.shape[0])).start()
+            print(f"Grabando vídeo en {path}")
+            self.notify("Grabando video")
+        except IOError as e:
+            print(f"Error al grabar vídeo: {e}")
+
+    def toggle_camera(self):
+        """Enciende o apaga la cámara en miniatura de la pantalla inferior."""
+        if self.camera is not None:
+            self.stop_camera()
+            return
+        # La cámara solo se importa y se abre si se pide
+        from camera_feed import CameraFeed
+        try:
+            self.camera = CameraFeed(self.camera_source).start()
+        except IOError as e:
+            print(e)
+            self.notify("Camara no disponible")
+            return
+        self._camera_sequence = -1
+
+    def stop_camera(self):
+        """Apaga la cámara y oculta su capa."""
+        if self.camera is not None:
+            self.camera.stop()
+            self.camera = None
+        if self.lower_compositor is not None:
+            self.lower_compositor.get('camara').show(False)
+
+    def notify(self, text, seconds=2.0):
+        """Muestra un aviso breve en la parte de arriba de la pantalla superior."""
+        self._notice = (text, time.monotonic() + seconds)
+
+    def get_chrome_key(self):
+        """Clave de la capa de carcasa: cambia si cambia el tamaño de ventana o el tema."""
+        return (self.layout.size, tuple(sorted(COLORS.items())))
+
+    def build_chrome(self):
+        """Renderiza una sola vez la carcasa estática (todo salvo el contenido de las pantallas)."""
+        self.image = np.zeros_like(self.image)
+        self.draw_upper_casing()
         self.draw_decorative_elements()
-        self.draw_lower_screen()
+        self.draw_lower_casing()
         self.draw_controls()
         self.draw_hinge()
+        self._chrome = self.image.copy()
+        self._chrome_key = self.get_chrome_key()
+        self.build_compositors()
+
+    def build_compositors(self):
+        """Crea las capas de las dos pantallas para el layout actual.
+
+        Pantalla superior: juego y avisos, sobre la pantalla vacía de la
+        carcasa. Pantalla inferior: juego (o botón de salir) y la cámara
+        flotante con esquinas redondeadas y algo de transparencia.
+        """
+        L = self.layout
+        x, y, w, h = self.upper_screen_rect()
+        upper = ScreenCompositor(w, h, self._chrome[y:y + h, x:x + w])
+        upper.add('juego', z=0).show(self.game_running)
+        upper.add('avisos', rect=(0, 0, w, min(h, L.h(20))), z=10).show(False)
+
+        x, y, w, h = self.lower_screen_rect()
+        lower = ScreenCompositor(w, h)
+        lower.add('juego', z=0)
+        pip_w = w // 3
+        pip_h = pip_w * 3 // 4
+        margin = L.w(4)
+        camera = lower.add('camara', rect=(w - pip_w - margin, margin, pip_w, pip_h),
+                           z=5, opacity=0.9)
+        camera.set_alpha(rounded_mask(pip_w, pip_h, L.w(4)))
+        camera.show(False)
+
+        self.upper_compositor, self.lower_compositor = upper, lower
+        self._upper_scaler = self._lower_scaler = None
+        self._camera_sequence = -1
+        self._exit_panel_ready = False
+        self._notice_drawn = None
+
+    def draw_exit_panel(self, layer):
+        """Pantalla inferior de los juegos de una pantalla: fondo negro y botón de salir."""
+        L = self.layout
+        ox, oy = self.lower_screen_rect()[:2]  # Origen de la pantalla en la consola
+        layer.image[:] = 0
+        x1, y1, x2, y2 = L.exit_button
+        cv2.rectangle(layer.image, (x1 - ox, y1 - oy), (x2 - ox, y2 - oy),
+                      COLORS['red'], L.thickness)
+        cv2.putText(layer.image, 'Q = SALIR',
+                    (L.exit_text[0] - ox, L.exit_text[1] - oy),
+                    cv2.FONT_HERSHEY_SIMPLEX, L.font(0.4), COLORS['red'], L.thickness,
+                    cv2.LINE_AA)
+        layer.touch()
+        self._exit_panel_ready = True
+
+    def update_notice(self):
+        """Muestra, redibuja u oculta la capa de avisos según el aviso en curso."""
+        layer = self.upper_compositor.get('avisos')
+        if self._notice is not None and time.monotonic() > self._notice[1]:
+            self._notice = None
+        if self._notice is None:
+            layer.show(False)
+            return
+        text = self._notice[0]
+        if self._notice_drawn != text:
+            L = self.layout
+            layer.image[:] = 0
+            height, width = layer.image.shape[:2]
+            scale = L.font(0.4)
+            (text_w, text_h), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX,
+                                                  scale, L.thickness)
+            cv2.putText(layer.image, text, ((width - text_w) // 2, (height + text_h) // 2),
+                        cv2.FONT_HERSHEY_SIMPLEX, scale, COLORS['white'], L.thickness,
+                        cv2.LINE_AA)
+            # Banda oscura semitransparente y texto opaco
+            layer.set_alpha(np.maximum(layer.image.max(axis=2), 150))
+            self._notice_drawn = text
+        layer.show(True)
+
+    def update_camera_layer(self):
+        """Vuelca en su capa el último frame de la cámara, solo si es nuevo."""
+        layer = self.lower_compositor.get('camara')
+        if self.camera is None:
+            layer.show(False)
+            return
+        sequence, frame = self.camera.read()
+        if frame is not None and sequence != self._camera_sequence:
+            layer.set_image(frame, cv2.INTER_AREA)
+            self._camera_sequence = sequence
+            layer.show(True)
+
+    def draw_console(self):
+        """Dibuja la consola completa."""
+        stats = self.stats
+        # Un único paso del juego por tick: ambas pantallas usan los mismos frames
+        with stats.measure('game'):
+            if self.game_running and self.current_game_module:
+                self.upper_frame, self.lower_frame = self.get_game_frames()
+            else:
+                self.upper_frame, self.lower_frame = None, None
+                self.update_game_list()
+                if self.prefetcher is not None:
+                    self.prefetcher.update(self.carousel.current)
+
+        # Copiar la carcasa en el buffer reutilizado y componer solo las pantallas
+        with stats.measure('chrome'):
+            if self._chrome is None or self._chrome_key != self.get_chrome_key():
+                self.build_chrome()
+            np.copyto(self.image, self._chrome)
+        with stats.measure('upper'):
+            self.draw_upper_screen()
+        with stats.measure('lower'):
+            self.draw_lower_screen()
+        if self.show_stats:
+            with stats.measure('overlay'):
+                self.stats_overlay.draw(self.image)
 
     def get_game_frames(self):
         """Obtiene los frames del juego actual, maneja tanto uno como dos frames."""
+        if self.game_runner is not None:
+            return self.get_runner_frames()
+
+        # Los juegos que lo admiten avanzan con el dt fijo del planificador
+        kwargs = {'dt': self.frame_dt} if self.game_uses_dt else {}
+        if self.recorder is not None:
+            self.recorder.frame(self.frame_steps)
         try:
             if hasattr(self.current_game_module, 'get_frames'):
                 # Juego con dos pantallas
                 self.is_dual_screen = True
-                return self.current_game_module.get_frames()
+                return self.current_game_module.get_frames(**kwargs)
             elif hasattr(self.current_game_module, 'get_frame'):
                 # Juego con una pantalla
                 self.is_dual_screen = False
-                frame = self.current_game_module.get_frame()
+                frame = self.current_game_module.get_frame(**kwargs)
                 return frame, None
             else:
                 raise AttributeError("El juego debe implementar get_frame() o get_frames()")
         except Exception as e:
             print(f"Error al obtener frames del juego: {e}")
             return None, None
+
+    def get_runner_frames(self):
+        """Último frame completo del juego aislado, sin esperar a su proceso."""
+        upper, lower = self.game_runner.get_frames()
+        if self.game_runner.error is not None:
+            # El fallo queda contenido en su proceso: se vuelve al menú
+            self.stop_game()
+            return None, None
+        self.is_dual_screen = self.game_runner.is_dual_screen
+        self.viewport_mode = self.game_runner.viewport_mode or PHOTO
+        return upper, lower
     
 
-    def draw_upper_screen(self):
-        """Dibuja la pantalla superior con bordes redondeados"""
+    def draw_upper_casing(self):
+        """Dibuja la carcasa superior con bordes redondeados"""
+        L = self.layout
         # Carcasa superior con bordes redondeados
-        self.draw_rounded_rectangle(
-            int(50 * SCALE_X), int(20 * SCALE_Y),
-            int(350 * SCALE_X), int(200 * SCALE_Y),
-            int(20 * SCALE_X), COLORS['blue'], -1
-        )
+        self.draw_rounded_rectangle(*L.upper_casing, L.casing_radius, COLORS['blue'], -1)
         
         # Marco negro de la pantalla con bordes redondeados más pequeños
-        self.draw_rounded_rectangle(
-            int(60 * SCALE_X), int(30 * SCALE_Y),
-            int(340 * SCALE_X), int(190 * SCALE_Y),
-            int(15 * SCALE_X), COLORS['black'], -1
-        )
+        self.draw_rounded_rectangle(*L.upper_bezel, L.w(15), COLORS['black'], -1)
         
         # Área de visualización con bordes redondeados sutiles
-        self.draw_rounded_rectangle(
-            int(70 * SCALE_X), int(40 * SCALE_Y),
-            int(330 * SCALE_X), int(180 * SCALE_Y),
-            int(10 * SCALE_X), COLORS['dark_gray'], -1
-        )
+        self.draw_rounded_rectangle(*L.upper_display, L.w(10), COLORS['dark_gray'], -1)
 
+    def draw_upper_screen(self):
+        """Dibuja el frame del juego en la pantalla superior"""
+        compositor = self.upper_compositor
+        x, y, w, h = self.upper_screen_rect()
+        screen = self.image[y:y + h, x:x + w]
+        self.update_notice()
         if self.game_running and self.current_game_module:
             try:
-                upper_frame, _ = self.get_game_frames()
+                upper_frame = self.upper_frame
                 if upper_frame is not None:
-                    game_frame_resized = cv2.resize(upper_frame, (int(250 * SCALE_X), int(130 * SCALE_Y)))
-                    # Centrar el frame en la pantalla
-                    x_offset = int(75 * SCALE_X)
-                    y_offset = int(45 * SCALE_Y)
-                    self.image[y_offset:y_offset + int(130 * SCALE_Y), 
-                            x_offset:x_offset + int(250 * SCALE_X)] = game_frame_resized
+                    layer = compositor.get('juego')
+                    layer.show(True)
+                    self._upper_scaler = get_scaler(self._upper_scaler, upper_frame,
+                                                    layer.rect, self.viewport_mode)
+                    if compositor.covers_alone(layer):
+                        # Sin avisos encima: el frame se escala directamente sobre la consola
+                        self._upper_scaler.blit(upper_frame, screen)
+                        return
+                    self._upper_scaler.blit(upper_frame, layer.image)
+                    layer.touch()
             except Exception as e:
                 print(f"Error al actualizar el frame superior: {e}")
+        # Sin capas visibles la pantalla es la de la carcasa: no hay nada que componer
+        if compositor.active:
+            np.copyto(screen, compositor.compose())
     
 
     def draw_game_screen(self):
         """Dibuja la pantalla cuando un juego está en ejecución."""
-        cv2.rectangle(self.image, (int(125 * SCALE_X), int(225 * SCALE_Y)), 
-                    (int(275 * SCALE_X), int(345 * SCALE_Y)), COLORS['black'], -1)
-        
+        compositor = self.lower_compositor
+        layer = compositor.get('juego')
+        x, y, w, h = self.lower_screen_rect()
+        screen = self.image[y:y + h, x:x + w]
+        self.update_camera_layer()
+
         if self.game_running and self.current_game_module:
             if self.is_dual_screen:
                 try:
-                    _, lower_frame = self.get_game_frames()
+                    lower_frame = self.lower_frame
                     if lower_frame is not None:
-                        game_frame_resized = cv2.resize(lower_frame, 
-                                                    (int(150 * SCALE_X), int(120 * SCALE_Y)))
-                        # Calculamos la posición para centrar el frame
-                        frame_x = int(125 * SCALE_X)
-                        frame_y = int(225 * SCALE_Y)
-                        self.image[frame_y:frame_y + int(120 * SCALE_Y), 
-                                frame_x:frame_x + int(150 * SCALE_X)] = game_frame_resized
+                        self._lower_scaler = get_scaler(self._lower_scaler, lower_frame,
+                                                        layer.rect, self.viewport_mode)
+                        self._exit_panel_ready = False
+                        if compositor.covers_alone(layer):
+                            # Sin cámara encima: el frame se escala directamente sobre la consola
+                            self._lower_scaler.blit(lower_frame, screen)
+                            return
+                        self._lower_scaler.blit(lower_frame, layer.image)
+                        layer.touch()
                 except Exception as e:
                     print(f"Error al actualizar el frame inferior: {e}")
-            else:
-                # Solo mostramos el botón de salir si el juego usa una pantalla
-                button_width = int(80 * SCALE_X)
-                button_height = int(25 * SCALE_Y)
-                button_x = int(200 * SCALE_X - button_width // 2)
-                button_y = int(285 * SCALE_Y - button_height // 2)
-                
-                cv2.rectangle(self.image, (button_x, button_y), 
-                            (button_x + button_width, button_y + button_height), 
-                            COLORS['red'], 1)
-                
-                cv2.putText(self.image, 'Q = SALIR', 
-                        (button_x + int(10 * SCALE_X), button_y + int(17 * SCALE_Y)), 
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.4 * SCALE_X, COLORS['red'], 1, 
-                        cv2.LINE_AA)
+            elif not self._exit_panel_ready:
+                # Solo mostramos el botón de salir si el juego usa una pantalla;
+                # es estático, así que se dibuja una vez en su capa
+                self.draw_exit_panel(layer)
+        np.copyto(screen, compositor.compose())
 
-    def run(self):
-        cv2.namedWindow('Nintendo 3DS')
-        cv2.setMouseCallback('Nintendo 3DS', lambda event, x, y, flags, param: 
+    def run(self, backend=None):
+        """Bucle principal; por defecto muestra la consola en una ventana de OpenCV."""
+        self.backend = backend if backend is not None else HighGUIBackend()
+        self.backend.open('Nintendo 3DS', lambda event, x, y, flags, param: 
                         self.handle_mouse_click(event, x, y, flags, param))
 
-        while self.running:
+        stats = self.stats
+        while self.running and self.backend.is_open():
+            # Esperar al siguiente frame en lugar de girar a tope de CPU
+            with stats.measure('wait'):
+                self.frame_steps, self.frame_dt = self.scheduler.wait()
+            # La geometría solo se recalcula si la ventana cambió de tamaño
+            size = self.backend.window_size()
+            if size is not None:
+                self.set_window_size(*size)
             self.draw_console()
-            cv2.imshow('Nintendo 3DS', self.image)
-            self.handle_key(cv2.waitKey(1) & 0xFF)
+            with stats.measure('show'):
+                self.backend.show(self.image)
+            if self.video is not None:
+                with stats.measure('capture'):
+                    self.video.submit(self.capture_frame())
+            # Todas las teclas llegadas desde el último frame, no solo una
+            with stats.measure('input'):
+                # Instantes en tiempo de juego: las repeticiones los reconstruyen igual
+                events = self.input.poll(self.backend,
+                                         now=self.scheduler.tick * self.scheduler.period)
+            for event in events:
+                self.handle_key(event.code)
+            stats.end_frame()
+
+        if self.game_running:
+            self.stop_game()
+        if self.video is not None:
+            self.toggle_video()
+        if self.prefetcher is not None:
+            self.prefetcher.cancel()
+        # Los pools de logos y miniaturas no deben sobrevivir a la ventana
+        if self.icon_loader is not None:
+            self.icon_loader.shutdown()
+        if self.thumbnails is not None:
+            self.thumbnails.shutdown()
+        self.stop_camera()
+        self.backend.close()
 
-        cv2.destroyAllWindows()
+def parse_size(text):
+    """Convierte "1920x1080" en (1920, 1080)."""
+    try:
+        width, height = (int(v) for v in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"tamaño no válido: {text}")
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError(f"tamaño no válido: {text}")
+    return (width, height)
 
 def main():
-    emulator = Nintendo3DSEmulator()
-    emulator.run()
+    parser = argparse.ArgumentParser(description="Emulador de Nintendo 3DS")
+    parser.add_argument('--fps', type=int, default=TARGET_FPS, help="frames por segundo objetivo")
+    parser.add_argument('--headless', action='store_true',
+                        help="renderizar en memoria, sin ventana")
+    parser.add_argument('--frames', type=int, default=600,
+                        help="frames a renderizar en modo headless")
+    parser.add_argument('--keys', default='',
+                        help="teclas programadas en modo headless, p. ej. '30:enter,300:q'")
+    parser.add_argument('--snapshot', help="guardar el último frame headless en este PNG")
+    parser.add_argument('--isolate', action='store_true',
+                        help="ejecutar cada juego en su propio proceso")
+    parser.add_argument('--record', metavar='DIR',
+                        help="grabar cada partida en DIR para repetirla con replay.py "
+                             "(no disponible con --isolate)")
+    parser.add_argument('--capture-dir', default='capturas',
+                        help="carpeta de capturas (P) y vídeos (V) del juego")
+    parser.add_argument('--capture-region', choices=('console', 'upper', 'lower'),
+                        default='console', help="zona que se captura")
+    parser.add_argument('--video', metavar='PATH', help="grabar vídeo desde el arranque")
+    parser.add_argument('--size', type=parse_size, default=(WINDOW_WIDTH, WINDOW_HEIGHT),
+                        metavar='ANCHOxALTO', help="tamaño de la ventana, p. ej. 1920x1080")
+    parser.add_argument('--fullscreen', action='store_true',
+                        help="pantalla completa (la consola se adapta al monitor)")
+    parser.add_argument('--camera', type=lambda v: int(v) if v.isdigit() else v, default=0,
+                        help="cámara (índice o vídeo) de la ventana flotante que se abre con C")
+    parser.add_argument('--stats', action='store_true',
+                        help="imprimir al salir el resumen de tiempos por frame (JSON)")
+    args = parser.parse_args()
+
+    if args.headless:
+        # Sin ventana y sin esperas: tan rápido como permita la CPU
+        emulator = Nintendo3DSEmulator(args.fps, paced=False, isolate_games=args.isolate,
+                                       record_dir=args.record, capture_dir=args.capture_dir,
+                                       capture_region=args.capture_region,
+                                       window_size=args.size, background=False,
+                                       camera_source=args.camera)
+        if args.video:
+            emulator.toggle_video(args.video)
+        backend = HeadlessBackend(parse_script(args.keys), max_frames=args.frames)
+        emulator.run(backend)
+        if args.snapshot and backend.last_frame is not None:
+            cv2.imwrite(args.snapshot, backend.last_frame)
+    else:
+        emulator = Nintendo3DSEmulator(args.fps, isolate_games=args.isolate,
+                                       record_dir=args.record, capture_dir=args.capture_dir,
+                                       capture_region=args.capture_region,
+                                       window_size=args.size, camera_source=args.camera)
+        if args.video:
+            emulator.toggle_video(args.video)
+        resizable = args.size != (WINDOW_WIDTH, WINDOW_HEIGHT)
+        emulator.run(HighGUIBackend(resizable=resizable, fullscreen=args.fullscreen))
+
+    if args.stats:
+        print(json.dumps(emulator.stats.summary(), indent=2))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,6 +4,7 @@ import threading
 from dataclasses import dataclass
 from typing import Tuple, List, Optional
 from enum import Enum
+from layout import get_layout
 
 class Mode(Enum):
     STANDBY = 0
@@ -44,8 +45,7 @@ class Nintendo3DSSimulator:
     def __init__(self, width: int = 800, height: int = 700):
         self.width = width
         self.height = height
-        self.scale_x = width / 400
-        self.scale_y = height / 400
+        self.layout = get_layout(width, height)  # Geometría precalculada para este tamaño
         
         # Estado del simulador
         self.mode = Mode.STANDBY
@@ -68,7 +68,7 @@ class Nintendo3DSSimulator:
         self._init_interface()
 
     def _create_drawing_canvas(self) -> np.ndarray:
-        canvas = np.zeros((int(100 * self.scale_y), int(260 * self.scale_x), 3), dtype=np.uint8)
+        canvas = np.zeros((self.layout.h(100), self.layout.w(260), 3), dtype=np.uint8)
         canvas.fill(255)
         return canvas
 
@@ -121,7 +121,7 @@ class Nintendo3DSSimulator:
 
     def _scale_point(self, x: int, y: int) -> Tuple[int, int]:
         """Escala un punto según las dimensiones actuales"""
-        return (int(x * self.scale_x), int(y * self.scale_y))
+        return self.layout.point(x, y)
 
     def _handle_mouse_events(self, event, x: int, y: int, flags, param):
         """Maneja todos los eventos del mouse"""
@@ -160,8 +160,8 @@ class Nintendo3DSSimulator:
     def _update_paint_screen(self):
         """Actualiza la pantalla del modo pintura"""
         self._draw_color_palette()
-        self.image[int(80 * self.scale_y):int(180 * self.scale_y),
-                  int(70 * self.scale_x):int(330 * self.scale_x)] = self.drawing_canvas
+        x1, _, x2, y2 = self.layout.upper_display
+        self.image[self.layout.y(80):y2, x1:x2] = self.drawing_canvas
 
     def _start_camera(self):
         """Inicia la cámara en un hilo separado"""
@@ -173,14 +173,12 @@ class Nintendo3DSSimulator:
 
     def _camera_loop(self):
         """Bucle principal de la cámara"""
+        x1, y1, x2, y2 = self.layout.upper_display
         while self.mode == Mode.CAMERA and self.camera is not None:
             ret, frame = self.camera.read()
             if ret:
-                frame_resized = cv2.resize(frame, 
-                                         (int(260 * self.scale_x), 
-                                          int(140 * self.scale_y)))
-                self.image[int(40 * self.scale_y):int(180 * self.scale_y),
-                          int(70 * self.scale_x):int(330 * self.scale_x)] = frame_resized
+                frame_resized = cv2.resize(frame, (x2 - x1, y2 - y1))
+                self.image[y1:y2, x1:x2] = frame_resized
             if cv2.waitKey(1) & 0xFF == ord('q'):
                 break
         
@@ -0,0 +1,186 @@
+from collections import deque
+from dataclasses import dataclass
+
+import cv2
+
+# Nombres de teclas aceptados en los guiones de eventos
+KEY_NAMES = {
+    'enter': 13,
+    'esc': 27,
+    'space': 32,
+    'tab': 9,
+    'left': 81,
+    'up': 82,
+    'right': 83,
+    'down': 84,
+}
+
+
+class DisplayBackend:
+    """Interfaz de salida de vídeo y entrada de teclado/ratón de la consola."""
+
+    def open(self, title, on_mouse=None):
+        """Prepara la salida; `on_mouse(event, x, y, flags, param)` recibe los clics."""
+        raise NotImplementedError
+
+    def show(self, image):
+        """Presenta un frame ya compuesto."""
+        raise NotImplementedError
+
+    def poll_key(self):
+        """Devuelve el código de la tecla pendiente o -1 si no hay ninguna."""
+        raise NotImplementedError
+
+    def poll_keys(self, limit=32):
+        """Devuelve todas las teclas pendientes (como mucho `limit`)."""
+        keys = []
+        while len(keys) < limit:
+            key = self.poll_key()
+            if key == -1:
+                break
+            keys.append(key)
+        return keys
+
+    def window_size(self):
+        """Tamaño (ancho, alto) en píxeles del área de dibujo o None si no lo decide la salida."""
+        return None
+
+    def is_open(self):
+        """Indica si la salida sigue activa."""
+        return True
+
+    def close(self):
+        """Libera los recursos de la salida."""
+
+
+class HighGUIBackend(DisplayBackend):
+    """Ventana de OpenCV (HighGUI): el comportamiento de siempre.
+
+    Con `resizable` o `fullscreen` la ventana puede cambiar de tamaño y la
+    consola se vuelve a maquetar para ocuparla.
+    """
+
+    def __init__(self, resizable=False, fullscreen=False):
+        self.title = None
+        self.resizable = resizable or fullscreen
+        self.fullscreen = fullscreen
+
+    def open(self, title, on_mouse=None):
+        self.title = title
+        cv2.namedWindow(title, cv2.WINDOW_NORMAL if self.resizable else cv2.WINDOW_AUTOSIZE)
+        if self.fullscreen:
+            cv2.setWindowProperty(title, cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
+        if on_mouse is not None:
+            cv2.setMouseCallback(title, on_mouse)
+
+    def window_size(self):
+        if not self.resizable:
+            return None  # La ventana se ajusta al frame
+        try:
+            _, _, width, height = cv2.getWindowImageRect(self.title)
+        except cv2.error:
+            return None
+        return (width, height) if width > 0 and height > 0 else None
+
+    def show(self, image):
+        cv2.imshow(self.title, image)
+
+    def poll_key(self):
+        return cv2.waitKey(1)
+
+    def poll_keys(self, limit=32):
+        # waitKey procesa los eventos de la ventana; pollKey recoge el resto sin esperar
+        keys = []
+        key = cv2.waitKey(1)
+        while key != -1 and len(keys) < limit:
+            keys.append(key)
+            key = cv2.pollKey()
+        return keys
+
+    def close(self):
+        cv2.destroyAllWindows()
+
+
+@dataclass
+class ScriptedEvent:
+    frame: int  # Frame tras el que se entrega el evento
+    kind: str  # 'key' o 'mouse'
+    key: int = -1
+    mouse_event: int = 0
+    x: int = 0
+    y: int = 0
+
+
+class HeadlessBackend(DisplayBackend):
+    """Salida en memoria sin sistema de ventanas, con eventos programados.
+
+    Los frames se guardan en memoria (los `keep_frames` últimos) y las teclas y
+    clics se entregan según un guion de `ScriptedEvent`. Si se indica
+    `max_frames`, la salida se cierra al mostrar ese número de frames.
+    """
+
+    def __init__(self, script=(), max_frames=None, keep_frames=1):
+        self.script = sorted(script, key=lambda event: event.frame)
+        self.max_frames = max_frames
+        self.frames = deque(maxlen=keep_frames)
+        self.frame_count = 0
+        self.on_mouse = None
+        self._script_index = 0
+        self._pending_keys = deque()
+        self._open = False
+
+    @property
+    def last_frame(self):
+        return self.frames[-1] if self.frames else None
+
+    def open(self, title, on_mouse=None):
+        self.on_mouse = on_mouse
+        self._open = True
+
+    def show(self, image):
+        if self.frames.maxlen:
+            self.frames.append(image.copy())
+        self.frame_count += 1
+        self._dispatch(self.frame_count - 1)
+
+    def _dispatch(self, frame):
+        """Entrega los eventos programados hasta `frame` inclusive."""
+        while (self._script_index < len(self.script)
+               and self.script[self._script_index].frame <= frame):
+            event = self.script[self._script_index]
+            self._script_index += 1
+            if event.kind == 'key':
+                self._pending_keys.append(event.key)
+            elif event.kind == 'mouse' and self.on_mouse is not None:
+                self.on_mouse(event.mouse_event, event.x, event.y, 0, None)
+
+    def poll_key(self):
+        # Como HighGUI, se entrega una tecla por llamada
+        return self._pending_keys.popleft() if self._pending_keys else -1
+
+    def poll_keys(self, limit=32):
+        keys = []
+        while self._pending_keys and len(keys) < limit:
+            keys.append(self._pending_keys.popleft())
+        return keys
+
+    def is_open(self):
+        return self._open and (self.max_frames is None or self.frame_count < self.max_frames)
+
+    def close(self):
+        self._open = False
+
+
+def parse_script(text):
+    """Convierte "30:enter,60:d,90:q" en una lista de eventos de teclado."""
+    events = []
+    for item in filter(None, (part.strip() for part in text.split(','))):
+        frame, key = item.split(':', 1)
+        if key.lower() in KEY_NAMES:
+            code = KEY_NAMES[key.lower()]
+        elif key.isdigit() and len(key) > 1:
+            code = int(key)
+        else:
+            code = ord(key)
+        events.append(ScriptedEvent(int(frame), 'key', key=code))
+    return events
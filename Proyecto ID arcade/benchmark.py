@@ -0,0 +1,228 @@
+import argparse
+import json
+import multiprocessing as mp
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from game_registry import GameRegistry
+from input_layer import dispatch_key
+from scheduler import accepts_dt
+
+# Teclas de juego que se mezclan en el guion: movimiento, acción, confirmar y reiniciar
+BENCH_KEYS = (ord('w'), ord('a'), ord('s'), ord('d'), 81, 82, 83, 84,
+              32, 13, ord('r'))
+
+# Métricas comparadas con la línea base: (nombre, True si más alto es mejor)
+COMPARED_METRICS = (('fps', True), ('p95_ms', False), ('p99_ms', False),
+                    ('alloc_kb_per_frame', False))
+
+
+def peak_rss_mb():
+    """Pico de memoria residente del proceso en MB, o None si no se puede medir."""
+    try:
+        import resource
+    except ImportError:  # Windows: psutil si está instalado
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / (1024 * 1024)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss está en bytes en macOS y en KB en Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def key_script(frames, seed, interval=6):
+    """Guion determinista de teclas: {frame: tecla} con una tecla cada `interval` frames."""
+    rng = random.Random(seed)
+    return {frame: rng.choice(BENCH_KEYS) for frame in range(interval, frames, interval)}
+
+
+def _render(module, dt, uses_dt):
+    kwargs = {'dt': dt} if uses_dt else {}
+    if hasattr(module, 'get_frames'):
+        return module.get_frames(**kwargs)
+    return module.get_frame(**kwargs)
+
+
+def bench_game(games_dir, name, frames=600, seed=0, fps=60, alloc_frames=120):
+    """Ejecuta un juego sin ventana y devuelve sus métricas.
+
+    Se llama en un proceso nuevo por juego para que el pico de RSS sea solo
+    suyo. Primero se mide el tiempo sin instrumentar y después, en una pasada
+    corta aparte, las asignaciones con tracemalloc (que ralentiza mucho).
+    """
+    # Los juegos usan random y np.random: misma semilla, misma partida
+    random.seed(seed)
+    np.random.seed(seed)
+
+    registry = GameRegistry(games_dir)
+    module = registry.load(name)
+    if module is None:
+        return {'error': 'no se pudo cargar'}
+    render_fn = getattr(module, 'get_frames', getattr(module, 'get_frame', None))
+    if render_fn is None:
+        return {'error': 'no implementa get_frame() ni get_frames()'}
+    uses_dt = accepts_dt(render_fn)
+    has_keys = hasattr(module, 'handle_key') or hasattr(module, 'handle_action')
+    dt = 1.0 / fps
+    script = key_script(frames, seed)
+
+    try:
+        latencies = np.empty(frames, dtype=np.float64)
+        start = time.perf_counter()
+        for frame in range(frames):
+            t0 = time.perf_counter_ns()
+            _render(module, dt, uses_dt)
+            latencies[frame] = (time.perf_counter_ns() - t0) / 1e6
+            if has_keys and frame in script:
+                dispatch_key(module, script[frame])
+        elapsed = time.perf_counter() - start
+
+        # Pasada de asignaciones: pico de memoria Python/numpy reservada en cada frame
+        tracemalloc.start()
+        peaks = []
+        for frame in range(alloc_frames):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            _render(module, dt, uses_dt)
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+            if has_keys and (frame + frames) in script:
+                dispatch_key(module, script[frame + frames])
+        tracemalloc.stop()
+    except Exception as e:
+        return {'error': f"{type(e).__name__}: {e}"}
+
+    p50, p95, p99 = np.percentile(latencies, (50, 95, 99))
+    return {
+        'frames': frames,
+        'fps': frames / elapsed,
+        'mean_ms': float(latencies.mean()),
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+        'max_ms': float(latencies.max()),
+        'peak_rss_mb': peak_rss_mb(),
+        'alloc_kb_per_frame': float(np.mean(peaks)) / 1024 if peaks else 0.0,
+    }
+
+
+def selected(name, only):
+    """Indica si el juego `name` entra en la selección `only` (por archivo o por nombre)."""
+    return not only or name in only or name.rsplit('.', 1)[0] in only
+
+
+def run_benchmark(games_dir='juegos', frames=600, seed=0, fps=60, only=None):
+    """Ejecuta todos los juegos (o los de `only`), cada uno en su propio proceso."""
+    games = [g for g in GameRegistry(games_dir).games if selected(g, only)]
+
+    context = mp.get_context('spawn')
+    results = {}
+    for name in games:
+        with context.Pool(processes=1) as pool:
+            results[name] = pool.apply(bench_game, (games_dir, name, frames, seed, fps))
+    return {
+        'frames': frames,
+        'seed': seed,
+        'fps_target': fps,
+        'python': sys.version.split()[0],
+        'games': results,
+    }
+
+
+def compare(report, baseline, tolerance=0.10, min_delta_ms=0.05, only=None):
+    """Lista de regresiones de `report` frente a `baseline` por encima de `tolerance`.
+
+    Las diferencias de tiempo menores que `min_delta_ms` se consideran ruido:
+    en juegos de microsegundos por frame un 20 % no significa nada. Un juego
+    de la línea base que falta en el informe (borrado o renombrado) también
+    cuenta como regresión, salvo que `only` lo haya dejado fuera a propósito.
+    """
+    regressions = []
+    for name in baseline.get('games', {}):
+        if name not in report['games'] and selected(name, only):
+            regressions.append(f"{name}: no está en el informe")
+    for name, current in report['games'].items():
+        previous = baseline.get('games', {}).get(name)
+        if previous is None or 'error' in previous:
+            continue
+        if 'error' in current:
+            regressions.append(f"{name}: falla ({current['error']})")
+            continue
+        for metric, higher_is_better in COMPARED_METRICS:
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if metric == 'fps':
+                delta_ms = abs(current['mean_ms'] - previous['mean_ms'])
+            elif metric.endswith('_ms'):
+                delta_ms = abs(new - old)
+            else:
+                delta_ms = None
+            if delta_ms is not None and delta_ms < min_delta_ms:
+                continue
+            if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+                regressions.append(f"{name}: {metric} {old:.2f} -> {new:.2f} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sin ventana de todos los juegos")
+    parser.add_argument('--frames', type=int, default=600, help="frames por juego")
+    parser.add_argument('--seed', type=int, default=0, help="semilla del guion de teclas")
+    parser.add_argument('--fps', type=int, default=60, help="dt fijo que reciben los juegos")
+    parser.add_argument('--games-dir', default='juegos', help="carpeta de juegos")
+    parser.add_argument('--only', nargs='*', help="juegos a medir (por defecto todos)")
+    parser.add_argument('--output', help="guardar el informe JSON en este archivo")
+    parser.add_argument('--baseline', help="informe JSON anterior con el que comparar")
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help="variación relativa tolerada antes de marcar regresión")
+    parser.add_argument('--min-delta-ms', type=float, default=0.05,
+                        help="diferencia de tiempo por debajo de la cual no se marca regresión")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="sobrescribir la línea base con este informe")
+    args = parser.parse_args()
+    if args.update_baseline and not args.baseline:
+        parser.error("--update-baseline necesita --baseline")
+
+    report = run_benchmark(args.games_dir, args.frames, args.seed, args.fps, args.only)
+
+    for name, result in report['games'].items():
+        if 'error' in result:
+            print(f"{name:20s} ERROR {result['error']}")
+        else:
+            rss = result['peak_rss_mb']
+            rss = f"{rss:6.1f}" if rss is not None else "     -"
+            print(f"{name:20s} {result['fps']:8.1f} fps  p50 {result['p50_ms']:6.2f}  "
+                  f"p95 {result['p95_ms']:6.2f}  p99 {result['p99_ms']:6.2f} ms  "
+                  f"RSS {rss} MB  {result['alloc_kb_per_frame']:8.1f} KB/frame")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        if args.update_baseline:
+            with open(args.baseline, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"Línea base actualizada: {args.baseline}")
+            return 0
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance, args.min_delta_ms, args.only)
+        for line in regressions:
+            print(f"REGRESIÓN {line}")
+        if regressions:
+            return 1
+        print("Sin regresiones frente a la línea base")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+import argparse
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+_scratch = threading.local()  # Buffers uint16 por hilo y por forma, reutilizados entre mezclas
+SCRATCH_SHAPES = 16  # Formas distintas que se guardan por hilo (sprites, máscaras, HUD...)
+
+
+def _buffers(shape):
+    """Dos buffers uint16 de `shape` para las cuentas intermedias (sin reservar en cada frame).
+
+    Se guardan por forma: un frame que alterna sprites de varios tamaños
+    reutiliza los de cada uno. Pasado el límite se descarta la forma más antigua.
+    """
+    cache = getattr(_scratch, 'buffers', None)
+    if cache is None:
+        cache = _scratch.buffers = {}
+    cached = cache.get(shape)
+    if cached is None:
+        if len(cache) >= SCRATCH_SHAPES:
+            del cache[next(iter(cache))]
+        cached = cache[shape] = (np.empty(shape, dtype=np.uint16), np.empty(shape, dtype=np.uint16))
+    return cached
+
+
+def to_alpha(alpha, opacity=1.0):
+    """Alfa uint8 a partir de uint8 0-255 o float 0-1, multiplicado por `opacity`."""
+    alpha = np.asarray(alpha)
+    if alpha.dtype != np.uint8:
+        alpha = np.clip(alpha * 255.0 + 0.5, 0, 255).astype(np.uint8)
+    if opacity < 1.0:
+        alpha = (alpha * opacity + 0.5).astype(np.uint8)
+    return np.ascontiguousarray(alpha)
+
+
+class AlphaMask:
+    """Alfa de un sprite preparado una vez para mezclarlo muchas veces.
+
+    Guarda el rectángulo que contiene los píxeles no transparentes (lo de
+    fuera no se toca al dibujar) y si el alfa es de todo o nada, en cuyo caso
+    basta con copiar los píxeles visibles. Para alfas suaves guarda los pesos
+    en uint16 que usa la mezcla en punto fijo.
+    """
+
+    def __init__(self, alpha, opacity=1.0):
+        self.alpha = to_alpha(alpha, opacity)  # uint8 (alto, ancho)
+        self.shape = self.alpha.shape
+        self.bounds = cv2.boundingRect(self.alpha)  # (x, y, ancho, alto); vacío si es todo 0
+        x, y, w, h = self.bounds
+        self.cropped = np.ascontiguousarray(self.alpha[y:y + h, x:x + w])
+        self.binary = bool(np.all((self.cropped == 0) | (self.cropped == 255)))
+        self.opaque = self.binary and bool(self.cropped.all())
+        self.weight = self.inverse = None
+        if not self.binary:
+            self.weight = np.repeat(self.cropped[:, :, None], 3, axis=2).astype(np.uint16)
+            self.inverse = 255 - self.weight
+
+    @property
+    def empty(self):
+        return self.bounds[2] == 0 or self.bounds[3] == 0
+
+    def premultiply(self, image):
+        """Color * alfa en uint16 dentro de `bounds`, o None si el alfa es de todo o nada."""
+        if self.binary:
+            return None
+        x, y, w, h = self.bounds
+        return image[y:y + h, x:x + w] * self.weight
+
+
+def blend_fixed(roi, image, weight, inverse, premultiplied=None):
+    """Mezcla `image` sobre `roi` en el sitio con aritmética entera.
+
+    round((color * a + fondo * (255 - a)) / 255) sin coma flotante: la suma
+    cabe en uint16 y la división por 255 se hace con sumas y desplazamientos
+    (exacta para todo el rango).
+    """
+    acc, tmp = _buffers(roi.shape)
+    if premultiplied is None:
+        np.multiply(image, weight, out=acc)
+    else:
+        np.copyto(acc, premultiplied)
+    np.multiply(roi, inverse, out=tmp)
+    acc += tmp
+    acc += 128
+    np.right_shift(acc, 8, out=tmp)
+    acc += tmp
+    acc >>= 8
+    np.copyto(roi, acc, casting='unsafe')
+
+
+def blit(frame, x, y, image, mask, premultiplied=None):
+    """Dibuja `image` (BGR uint8 del tamaño de `mask`) con su alfa en (x, y) de `frame`.
+
+    Solo se recorre el rectángulo con píxeles visibles, recortado por los
+    bordes de `frame`. `premultiplied` es el de `mask.premultiply(image)`
+    para no recalcularlo cuando la imagen no cambia.
+    """
+    bx, by, bw, bh = mask.bounds
+    x0, y0 = x + bx, y + by
+    fx0, fy0 = max(x0, 0), max(y0, 0)
+    fx1, fy1 = min(x0 + bw, frame.shape[1]), min(y0 + bh, frame.shape[0])
+    if fx0 >= fx1 or fy0 >= fy1:
+        return
+    # Desplazamiento dentro del rectángulo visible cuando el sprite se sale por arriba o la izquierda
+    sx0, sy0 = fx0 - x0, fy0 - y0
+    sx1, sy1 = sx0 + fx1 - fx0, sy0 + fy1 - fy0
+    roi = frame[fy0:fy1, fx0:fx1]
+    source = image[by + sy0:by + sy1, bx + sx0:bx + sx1]
+    if mask.opaque:
+        np.copyto(roi, source)
+    elif mask.binary:
+        cv2.copyTo(source, mask.cropped[sy0:sy1, sx0:sx1], roi)
+    else:
+        if premultiplied is not None:
+            premultiplied = premultiplied[sy0:sy1, sx0:sx1]
+        blend_fixed(roi, source, mask.weight[sy0:sy1, sx0:sx1],
+                    mask.inverse[sy0:sy1, sx0:sx1], premultiplied)
+
+
+def blend_float(roi, image, alpha):
+    """Mezcla en coma flotante como la hacían los juegos; solo sirve de referencia."""
+    alpha_3d = np.stack([alpha / 255.0] * 3, axis=2)
+    roi[:] = (image * alpha_3d + roi * (1 - alpha_3d)).astype(np.uint8)
+
+
+def _time_ms(fn, iterations):
+    fn()  # Calentar: buffers y caché
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara la mezcla en coma flotante con la de punto fijo y la copia con máscara")
+    parser.add_argument('--size', type=int, default=200, help="lado del sprite en píxeles")
+    parser.add_argument('--iterations', type=int, default=2000, help="mezclas por caso")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    size = args.size
+    frame = rng.integers(0, 256, (size * 2, size * 4, 3), dtype=np.uint8)
+    image = rng.integers(0, 256, (size, size, 3), dtype=np.uint8)
+    # Sprite típico: figura centrada sobre fondo transparente
+    binary = np.zeros((size, size), dtype=np.uint8)
+    cv2.circle(binary, (size // 2, size // 2), size * 2 // 5, 255, -1)
+    soft = cv2.GaussianBlur(binary, (0, 0), size / 40)
+    x, y = size, size // 2
+
+    print(f"{'caso':32s} {'ms':>8s} {'x':>7s} {'dif. máx':>9s}")
+    for label, alpha in (('binaria', binary), ('suave', soft)):
+        mask = AlphaMask(alpha)
+        premultiplied = mask.premultiply(image)
+        reference = frame.copy()
+        blend_float(reference[y:y + size, x:x + size], image, alpha)
+
+        canvas = frame.copy()
+        roi = canvas[y:y + size, x:x + size]
+        base = _time_ms(lambda: blend_float(roi, image, alpha), args.iterations)
+        cases = [('float (actual)', lambda: blend_float(roi, image, alpha))]
+        cases.append(('blit', lambda: blit(canvas, x, y, image, mask, premultiplied)))
+        if not mask.binary:
+            cases.append(('blit sin premultiplicar', lambda: blit(canvas, x, y, image, mask)))
+        for name, fn in cases:
+            ms = base if name == 'float (actual)' else _time_ms(fn, args.iterations)
+            np.copyto(canvas, frame)
+            fn()
+            diff = int(np.abs(canvas.astype(np.int16) - reference).max())
+            print(f"{label + ' / ' + name:32s} {ms:8.4f} {base / ms:6.1f}x {diff:9d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+import threading
+
+import cv2
+
+
+class CameraFeed:
+    """Lee la cámara en un hilo aparte y guarda solo el último frame.
+
+    `cv2.VideoCapture.read()` espera al siguiente frame de la cámara (33 ms a
+    30 fps); leyéndola fuera del bucle principal la consola nunca se frena.
+    `sequence` aumenta con cada frame nuevo, así quien lo muestra sabe si ha
+    cambiado sin comparar imágenes.
+    """
+
+    def __init__(self, source=0, mirror=True):
+        self.source = source  # Índice de la cámara o ruta de un vídeo
+        self.mirror = mirror  # Efecto espejo, como en Nintendocamara.py
+        self.sequence = 0
+        self._frame = None
+        self._capture = None
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        self._capture = cv2.VideoCapture(self.source)
+        if not self._capture.isOpened():
+            self._capture.release()
+            self._capture = None
+            raise IOError(f"No se pudo abrir la cámara {self.source}")
+        self._running = True
+        self._thread = threading.Thread(target=self._read_loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def _read_loop(self):
+        while self._running:
+            ok, frame = self._capture.read()
+            if not ok:
+                break
+            if self.mirror:
+                frame = cv2.flip(frame, 1)
+            # Cada lectura crea un array nuevo: se puede entregar sin copiarlo
+            self._frame = frame
+            self.sequence += 1
+        self._running = False
+
+    @property
+    def running(self):
+        return self._running
+
+    def read(self):
+        """Devuelve (secuencia, último frame) sin esperar; el frame es None al principio."""
+        return self.sequence, self._frame
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
@@ -0,0 +1,161 @@
+from bisect import bisect_left
+
+
+def fuzzy_score(query, text):
+    """Puntuación de `query` como subsecuencia de `text` o None si no aparece.
+
+    Ambas cadenas deben llegar en minúsculas. Se premian las letras seguidas
+    y las que empiezan palabra, y se penalizan los huecos, así "snk" encaja
+    mejor con "snake" que con "space invaders kong".
+    """
+    score = 0
+    position = 0
+    previous = -2
+    for char in query:
+        found = text.find(char, position)
+        if found < 0:
+            return None
+        if found == previous + 1:
+            score += 3  # Letra seguida de la anterior
+        elif found == 0 or not text[found - 1].isalnum():
+            score += 2  # Inicio de palabra
+        else:
+            score -= min(found - position, 3)
+        previous = found
+        position = found + 1
+    return score
+
+
+class SearchIndex:
+    """Índice de búsqueda por prefijo y difusa sobre los títulos de los juegos.
+
+    Los títulos se guardan ordenados en minúsculas: un prefijo se resuelve con
+    dos búsquedas binarias. La búsqueda difusa es incremental: si la consulta
+    amplía la anterior solo se filtran los resultados previos, porque todo lo
+    que encaja con "sna" encajaba ya con "sn".
+    """
+
+    def __init__(self, entries=()):
+        self.rebuild(entries)
+
+    def rebuild(self, entries):
+        """Reconstruye el índice a partir de pares (archivo, título)."""
+        self._keys = sorted((title.lower(), name) for name, title in entries)
+        self._titles = [key for key, _ in self._keys]
+        self._by_name = {name: key for key, name in self._keys}
+        self._last_query = None
+        self._last_matches = None  # [(título, archivo)] que encajaban con _last_query
+
+    def __len__(self):
+        return len(self._keys)
+
+    def title(self, name):
+        """Título indexado (en minúsculas) de un archivo."""
+        return self._by_name.get(name, '')
+
+    def prefix(self, prefix):
+        """Archivos cuyo título empieza por `prefix`, en orden alfabético."""
+        prefix = prefix.lower()
+        start = bisect_left(self._titles, prefix)
+        end = bisect_left(self._titles, prefix + '\uffff', start)
+        return [name for _, name in self._keys[start:end]]
+
+    def first_with_prefix(self, prefix):
+        """Posición en orden alfabético del primer título con ese prefijo o None."""
+        prefix = prefix.lower()
+        index = bisect_left(self._titles, prefix)
+        if index < len(self._titles) and self._titles[index].startswith(prefix):
+            return index
+        return None
+
+    def search(self, query):
+        """Archivos que encajan con `query`: primero por prefijo, luego difusos por puntuación."""
+        query = query.lower().strip()
+        if not query:
+            self._last_query = None
+            self._last_matches = None
+            return [name for _, name in self._keys]
+
+        if self._last_query is not None and query.startswith(self._last_query):
+            candidates = self._last_matches
+        else:
+            candidates = self._keys
+        matches = []
+        scored = []
+        for key, name in candidates:
+            score = fuzzy_score(query, key)
+            if score is not None:
+                matches.append((key, name))
+                if not key.startswith(query):
+                    scored.append((-score, key, name))
+        self._last_query = query
+        self._last_matches = matches
+
+        scored.sort()
+        return self.prefix(query) + [name for _, _, name in scored]
+
+
+class Carousel:
+    """Selección y desplazamiento del menú sobre una lista de juegos.
+
+    Solo se materializan los `visible` elementos de la ventana actual: moverse
+    cuesta lo mismo con cinco juegos que con miles. `version` cambia cuando
+    cambia la lista para que el menú sepa que debe redibujarse sin comparar
+    la lista entera.
+    """
+
+    def __init__(self, visible=3):
+        self.visible = visible
+        self.items = []  # Archivos en el orden en que se muestran
+        self.selected = 0
+        self.offset = 0
+        self.version = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def current(self):
+        """Archivo seleccionado o None si la lista está vacía."""
+        if 0 <= self.selected < len(self.items):
+            return self.items[self.selected]
+        return None
+
+    def set_items(self, items, keep=None):
+        """Cambia la lista conservando la selección en `keep` si sigue en ella."""
+        self.items = list(items)
+        self.version += 1
+        if keep is not None and keep in self.items:
+            self.selected = self.items.index(keep)
+        else:
+            self.selected = min(self.selected, max(0, len(self.items) - 1))
+        self._follow()
+
+    def select(self, index):
+        """Selecciona la posición `index` (se ajusta a los límites)."""
+        self.selected = max(0, min(len(self.items) - 1, index))
+        self._follow()
+
+    def move(self, delta):
+        """Mueve la selección `delta` posiciones."""
+        self.select(self.selected + delta)
+
+    def _follow(self):
+        # Mantener la selección dentro de la ventana visible
+        if self.selected >= self.offset + self.visible:
+            self.offset = self.selected - self.visible + 1
+        elif self.selected < self.offset:
+            self.offset = self.selected
+        self.offset = max(0, min(self.offset, len(self.items) - self.visible))
+
+    def window(self):
+        """[(posición, archivo)] de los elementos visibles."""
+        end = min(self.offset + self.visible, len(self.items))
+        return [(index, self.items[index]) for index in range(self.offset, end)]
+
+    def around(self, pages=1):
+        """Archivos de las `pages` ventanas anteriores y siguientes (para precargar)."""
+        start = max(0, self.offset - pages * self.visible)
+        end = min(len(self.items), self.offset + (pages + 1) * self.visible)
+        return [self.items[index] for index in range(start, end)
+                if not self.offset <= index < self.offset + self.visible]
@@ -0,0 +1,180 @@
+import cv2
+import numpy as np
+
+from blending import AlphaMask, blit, to_alpha
+
+
+def rounded_mask(width, height, radius):
+    """Alfa uint8 de un rectángulo con esquinas redondeadas (ventanas flotantes)."""
+    mask = np.zeros((height, width), dtype=np.uint8)
+    r = max(0, min(radius, width // 2, height // 2))
+    cv2.rectangle(mask, (r, 0), (width - 1 - r, height - 1), 255, -1)
+    cv2.rectangle(mask, (0, r), (width - 1, height - 1 - r), 255, -1)
+    for cx, cy in ((r, r), (width - 1 - r, r), (r, height - 1 - r), (width - 1 - r, height - 1 - r)):
+        cv2.circle(mask, (cx, cy), r, 255, -1, cv2.LINE_AA)
+    return mask
+
+
+class Layer:
+    """Capa de una pantalla con su propio buffer, alfa opcional y marca de cambio.
+
+    El contenido se guarda ya escalado a su rectángulo. Si la capa tiene alfa
+    por píxel, la máscara (con la opacidad aplicada) y el color premultiplicado
+    se preparan solo cuando cambia el alfa o el contenido, no en cada
+    composición, y la mezcla se hace en punto fijo con `blending.blit`.
+    """
+
+    def __init__(self, name, rect, z=0, opacity=1.0):
+        self.name = name
+        self.rect = rect  # (x, y, ancho, alto) dentro de la pantalla
+        self.z = z
+        self.opacity = opacity
+        self.visible = True
+        self.dirty = True  # Cambió desde la última composición
+        self.image = np.zeros((rect[3], rect[2], 3), dtype=np.uint8)  # Contenido BGR
+        self.alpha = None  # uint8 (alto, ancho); None = opaca
+        self._mask = None  # AlphaMask del alfa por la opacidad
+        self._premultiplied = None  # color * alfa en uint16
+
+    @property
+    def opaque(self):
+        return self.alpha is None and self.opacity >= 1.0
+
+    def touch(self):
+        """Marca la capa como cambiada (p. ej. tras dibujar directamente en `image`)."""
+        self.dirty = True
+        self._premultiplied = None
+
+    def set_image(self, frame, interpolation=cv2.INTER_LINEAR):
+        """Copia `frame` como contenido de la capa, escalándolo si no tiene su tamaño."""
+        height, width = self.image.shape[:2]
+        if frame.shape[:2] == (height, width):
+            np.copyto(self.image, frame)
+        else:
+            cv2.resize(frame, (width, height), dst=self.image, interpolation=interpolation)
+        self.touch()
+
+    def set_alpha(self, alpha):
+        """Alfa por píxel del tamaño de la capa (uint8 0-255 o float 0-1), o None para opaca."""
+        if alpha is not None:
+            alpha = to_alpha(alpha).reshape(self.image.shape[:2])
+        self.alpha = alpha
+        self._mask = None
+        self.touch()
+
+    def set_opacity(self, opacity):
+        """Opacidad global de la capa (se multiplica por el alfa por píxel)."""
+        if opacity != self.opacity:
+            self.opacity = opacity
+            self._mask = None
+            self.touch()
+
+    def show(self, visible=True):
+        """Muestra u oculta la capa."""
+        if visible != self.visible:
+            self.visible = visible
+            self.dirty = True
+
+    def blend_onto(self, canvas):
+        """Mezcla la capa sobre su rectángulo de `canvas`."""
+        x, y, width, height = self.rect
+        roi = canvas[y:y + height, x:x + width]
+        if self.opaque:
+            np.copyto(roi, self.image)
+        elif self.alpha is None:
+            # Opacidad uniforme: mezcla directa en uint8
+            cv2.addWeighted(roi, 1.0 - self.opacity, self.image, self.opacity, 0.0, dst=roi)
+        else:
+            if self._mask is None:
+                self._mask = AlphaMask(self.alpha, self.opacity)
+                self._premultiplied = None
+            if self._premultiplied is None:
+                self._premultiplied = self._mask.premultiply(self.image)
+            blit(roi, 0, 0, self.image, self._mask, self._premultiplied)
+
+
+class ScreenCompositor:
+    """Compone por orden de `z` las capas de una pantalla.
+
+    Guarda el resultado acumulado tras cada capa. Al componer se parte del
+    acumulado que hay debajo de la capa cambiada más baja, así que las capas
+    estáticas de debajo no se vuelven a mezclar. Si no cambió ninguna capa,
+    se devuelve el resultado anterior sin tocar un píxel.
+    """
+
+    def __init__(self, width, height, background=None):
+        self.size = (width, height)
+        self.layers = []
+        self.blends = 0  # Capas mezcladas desde el principio (para medir)
+        self.background = np.zeros((height, width, 3), dtype=np.uint8)
+        if background is not None:
+            self.set_background(background)
+        self._stack = []  # Resultado acumulado tras cada capa
+        self._restack = True
+
+    def set_background(self, image):
+        """Fondo sobre el que se componen las capas (p. ej. la pantalla vacía de la carcasa)."""
+        np.copyto(self.background, image)
+        self._restack = True
+
+    def add(self, name, rect=None, z=0, opacity=1.0):
+        """Crea una capa; sin `rect` ocupa toda la pantalla."""
+        layer = Layer(name, rect or (0, 0) + self.size, z, opacity)
+        self.layers.append(layer)
+        self.layers.sort(key=lambda l: l.z)  # Estable: a igual z, la última encima
+        self._restack = True
+        return layer
+
+    def remove(self, name):
+        self.layers = [layer for layer in self.layers if layer.name != name]
+        self._restack = True
+
+    def get(self, name):
+        """Capa con ese nombre o None."""
+        for layer in self.layers:
+            if layer.name == name:
+                return layer
+        return None
+
+    def covers_alone(self, layer):
+        """Indica si `layer` tapa toda la pantalla sin nada visible encima.
+
+        Entonces no hay nada que mezclar: su contenido puede escribirse
+        directamente en la pantalla de destino, sin pasar por su buffer.
+        """
+        if not (layer.visible and layer.opaque and tuple(layer.rect[2:]) == self.size):
+            return False
+        above = self.layers[self.layers.index(layer) + 1:]
+        return not any(other.visible for other in above)
+
+    @property
+    def active(self):
+        """Indica si alguna capa es visible (si no, la pantalla es solo el fondo)."""
+        return any(layer.visible for layer in self.layers)
+
+    def compose(self):
+        """Devuelve la imagen de la pantalla mezclando solo desde la capa cambiada más baja."""
+        layers = self.layers
+        if self._restack or len(self._stack) != len(layers):
+            width, height = self.size
+            self._stack = [np.empty((height, width, 3), dtype=np.uint8) for _ in layers]
+            start = 0
+            self._restack = False
+        else:
+            start = next((i for i, layer in enumerate(layers) if layer.dirty), len(layers))
+        if not layers:
+            return self.background
+
+        for i in range(start, len(layers)):
+            layer = layers[i]
+            below = self._stack[i - 1] if i else self.background
+            canvas = self._stack[i]
+            x, y, width, height = layer.rect
+            covers = layer.visible and layer.opaque and (width, height) == self.size
+            if not covers:  # Una capa opaca a pantalla completa no necesita lo de debajo
+                np.copyto(canvas, below)
+            if layer.visible:
+                layer.blend_onto(canvas)
+                self.blends += 1
+            layer.dirty = False
+        return self._stack[-1]
@@ -0,0 +1,230 @@
+import time
+
+import cv2
+import numpy as np
+
+# Etapas de un frame de la consola, en el orden en que se ejecutan
+STAGES = ('wait', 'chrome', 'game', 'upper', 'lower', 'overlay', 'show', 'capture', 'input')
+
+# Etapas que no son trabajo de la consola (no cuentan como "la más lenta")
+IDLE_STAGES = ('wait',)
+
+
+class _StageTimer:
+    """Contexto reutilizable que suma el tiempo de una etapa al frame en curso."""
+
+    __slots__ = ('stats', 'index', 'start')
+
+    def __init__(self, stats, index):
+        self.stats = stats
+        self.index = index
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats._current[self.index] += time.perf_counter_ns() - self.start
+        return False
+
+
+class FrameStats:
+    """Tiempos por etapa de los últimos `capacity` frames en buffers circulares.
+
+    Cada etapa se mide con `perf_counter_ns` mediante `with stats.measure('game'):`
+    y `end_frame()` guarda la fila del frame. Junto al intervalo entre frames se
+    guarda el tiempo ocupado (el intervalo sin la espera del planificador): los
+    percentiles se calculan sobre él, porque con el ritmo fijo el intervalo
+    siempre ronda el presupuesto aunque la consola vaya justa. La memoria es
+    fija: los frames antiguos se sobrescriben. `summary()` devuelve los mismos
+    números que muestra el overlay para poder vigilarlos desde fuera.
+    """
+
+    def __init__(self, capacity=240, stages=STAGES):
+        self.capacity = capacity
+        self.stages = tuple(stages)
+        self._index = {name: i for i, name in enumerate(self.stages)}
+        self._timers = {name: _StageTimer(self, i) for i, name in enumerate(self.stages)}
+        self._current = np.zeros(len(self.stages), dtype=np.int64)
+        self._stage_ns = np.zeros((capacity, len(self.stages)), dtype=np.int64)
+        self._frame_ns = np.zeros(capacity, dtype=np.int64)  # Intervalo entre frames
+        self._busy_ns = np.zeros(capacity, dtype=np.int64)  # Intervalo sin las etapas ociosas
+        self._idle = np.array([name in IDLE_STAGES for name in self.stages])
+        self._cursor = 0
+        self.count = 0  # Frames registrados (puede superar `capacity`)
+        self._last_end = None
+
+    def measure(self, stage):
+        """Devuelve el contexto que mide `stage` en el frame en curso."""
+        return self._timers[stage]
+
+    def add(self, stage, elapsed_ns):
+        """Suma a mano un tiempo ya medido a una etapa."""
+        self._current[self._index[stage]] += elapsed_ns
+
+    def end_frame(self):
+        """Cierra el frame en curso y lo guarda en los buffers circulares."""
+        now = time.perf_counter_ns()
+        if self._last_end is not None:
+            self._stage_ns[self._cursor] = self._current
+            interval = now - self._last_end
+            self._frame_ns[self._cursor] = interval
+            self._busy_ns[self._cursor] = max(interval - int(self._current[self._idle].sum()), 0)
+            self._cursor = (self._cursor + 1) % self.capacity
+            self.count += 1
+        self._last_end = now
+        self._current[:] = 0
+
+    def reset(self):
+        """Descarta el historial (por ejemplo, al cambiar de juego)."""
+        self._cursor = 0
+        self.count = 0
+        self._last_end = None
+        self._current[:] = 0
+
+    def _ordered(self, buffer):
+        """Filas del historial de `buffer`, de la más antigua a la más reciente."""
+        n = min(self.count, self.capacity)
+        if n < self.capacity:
+            return buffer[:n]
+        return np.roll(buffer, -self._cursor, axis=0)
+
+    def frame_times_ms(self):
+        """Intervalos entre frames del historial, del más antiguo al más reciente."""
+        return self._ordered(self._frame_ns) / 1e6
+
+    def busy_times_ms(self):
+        """Tiempo ocupado de cada frame (sin la espera), del más antiguo al más reciente."""
+        return self._ordered(self._busy_ns) / 1e6
+
+    def stage_histograms(self, bins, max_ms):
+        """Histograma por etapa: `bins` cubos de 0 a `max_ms`; el último recoge el resto."""
+        n = min(self.count, self.capacity)
+        if n == 0:
+            return np.zeros((len(self.stages), bins), dtype=np.int64)
+        buckets = np.minimum(self._stage_ns[:n] * (bins / (max_ms * 1e6)), bins - 1).astype(np.int64)
+        # Un solo bincount para todas las etapas: cada una desplazada a su propia fila
+        buckets += np.arange(len(self.stages)) * bins
+        return np.bincount(buckets.ravel(), minlength=len(self.stages) * bins).reshape(-1, bins)
+
+    def summary(self):
+        """FPS, percentiles del tiempo ocupado por frame y media por etapa (en ms)."""
+        n = min(self.count, self.capacity)
+        if n == 0:
+            return {'frames': 0, 'fps': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0,
+                    'p99_ms': 0.0, 'interval_ms': 0.0, 'stages_ms': {}, 'slowest': None}
+
+        frame_ms = self._frame_ns[:n] / 1e6
+        p50, p95, p99 = np.percentile(self._busy_ns[:n] / 1e6, (50, 95, 99))
+        means = self._stage_ns[:n].mean(axis=0) / 1e6
+        stages_ms = {name: float(means[i]) for i, name in enumerate(self.stages)}
+        busy = {name: ms for name, ms in stages_ms.items() if name not in IDLE_STAGES}
+        return {
+            'frames': n,
+            'fps': 1000.0 / float(frame_ms.mean()),
+            'p50_ms': float(p50),
+            'p95_ms': float(p95),
+            'p99_ms': float(p99),
+            'interval_ms': float(frame_ms.mean()),
+            'stages_ms': stages_ms,
+            'slowest': max(busy, key=busy.get) if busy else None,
+        }
+
+
+class StatsOverlay:
+    """Dibuja sobre el framebuffer el resumen de `FrameStats` y sus histogramas.
+
+    Debajo del texto van la tira de tiempos ocupados de los últimos frames y un
+    histograma por etapa (de 0 a dos veces el presupuesto). El texto y los
+    histogramas se recalculan solo cada `refresh` frames; la tira, en cada uno.
+    """
+
+    def __init__(self, stats, origin=(8, 8), refresh=15, budget_ms=1000 / 60, bins=16):
+        self.stats = stats
+        self.origin = origin
+        self.refresh = refresh
+        self.budget_ms = budget_ms  # Línea de referencia del histograma
+        self.bins = bins
+        self.lines = []
+        self.histograms = np.zeros((0, bins), dtype=np.int64)
+        self._stage_rows = [i for i, name in enumerate(stats.stages) if name not in IDLE_STAGES]
+        self._hist_patch = None  # Histogramas ya pintados: se rehacen solo al refrescar
+        self._frames_since_refresh = refresh
+
+    def _update_lines(self):
+        s = self.stats.summary()
+        self.lines = [
+            f"FPS {s['fps']:5.1f}",
+            f"p50 {s['p50_ms']:5.2f}  p95 {s['p95_ms']:5.2f}  p99 {s['p99_ms']:5.2f} ms",
+        ]
+        if s['slowest'] is not None:
+            self.lines.append(f"lenta: {s['slowest']} {s['stages_ms'][s['slowest']]:.2f} ms")
+        histograms = self.stats.stage_histograms(self.bins, 2 * self.budget_ms)
+        self.histograms = histograms[self._stage_rows]
+        self._hist_patch = None
+
+    def draw(self, image, width=180, height=40, row_height=10):
+        """Pinta el panel en la esquina superior izquierda de `image`."""
+        self._frames_since_refresh += 1
+        if self._frames_since_refresh >= self.refresh:
+            self._frames_since_refresh = 0
+            self._update_lines()
+
+        x, y = self.origin
+        line_height = 14
+        hist_h = len(self.histograms) * row_height
+        panel_h = len(self.lines) * line_height + height + hist_h + 16
+        # Fondo oscurecido en lugar de opaco para no tapar del todo la consola
+        panel = image[y:y + panel_h, x:x + width]
+        panel //= 3
+
+        for i, line in enumerate(self.lines):
+            cv2.putText(image, line, (x + 4, y + 12 + i * line_height),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.35, (255, 255, 255), 1, cv2.LINE_AA)
+
+        # Histograma deslizante: una barra por frame, escalada a dos veces el presupuesto
+        times = self.stats.busy_times_ms()[-(width - 8):]
+        if len(times):
+            base_y = y + panel_h - hist_h - 8
+            scale = height / (2 * self.budget_ms)
+            heights = np.minimum(times * scale, height).astype(np.int32)
+            # Las barras se pintan con máscaras de numpy, no una línea por frame
+            rows = np.arange(height, 0, -1)[:, None]
+            bars = rows <= heights[None, :]
+            slow = times > self.budget_ms
+            graph = image[base_y - height + 1:base_y + 1, x + 4:x + 4 + len(times)]
+            graph[bars & ~slow] = (0, 200, 0)
+            graph[bars & slow] = (0, 0, 255)
+            budget_y = base_y - int(self.budget_ms * scale)
+            cv2.line(image, (x + 4, budget_y), (x + width - 4, budget_y), (0, 255, 255), 1)
+
+        if hist_h:
+            if self._hist_patch is None or self._hist_patch[0].shape[:2] != (hist_h, width - 8):
+                self._hist_patch = self._render_histograms(width - 8, row_height)
+            patch, mask = self._hist_patch
+            region = image[y + panel_h - hist_h - 2:y + panel_h - 2, x + 4:x + width - 4]
+            np.copyto(region, patch[:region.shape[0], :region.shape[1]],
+                      where=mask[:region.shape[0], :region.shape[1], None])
+
+    def _render_histograms(self, width, row_height):
+        """Una fila por etapa: nombre y barras con la fracción de frames en cada cubo."""
+        patch = np.zeros((len(self.histograms) * row_height, width, 3), dtype=np.uint8)
+        label_w = 44
+        bin_w = max((width - label_w) // self.bins, 1)
+        over_budget = np.arange(self.bins) >= self.bins // 2  # Cubos por encima del presupuesto
+        for row, (stage, counts) in enumerate(zip(self._stage_rows, self.histograms)):
+            top = row * row_height
+            cv2.putText(patch, self.stats.stages[stage], (0, top + row_height - 2),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.3, (200, 200, 200), 1, cv2.LINE_AA)
+            total = counts.sum()
+            if total == 0:
+                continue
+            heights = np.ceil(counts * (row_height - 2) / total).astype(np.int32)
+            bars = np.arange(row_height - 2, 0, -1)[:, None] <= np.repeat(heights, bin_w)[None, :]
+            slow = np.repeat(over_budget, bin_w)
+            graph = patch[top + 1:top + row_height - 1, label_w:label_w + bin_w * self.bins]
+            graph[bars & ~slow] = (0, 200, 0)
+            graph[bars & slow] = (0, 0, 255)
+        # Solo se copian los píxeles pintados: el resto deja ver el fondo oscurecido
+        return patch, patch.any(axis=2)
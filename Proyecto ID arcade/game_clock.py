@@ -0,0 +1,30 @@
+import time
+
+
+class GameClock:
+    """Reloj de un juego: real cuando se ejecuta suelto, virtual cuando la consola marca el ritmo.
+
+    Mientras `tick()` recibe `dt=None` (prueba independiente) `now()` es el
+    reloj del sistema. En cuanto recibe un dt, el reloj pasa a ser virtual: empieza
+    en 0 y solo avanza con los dt recibidos. Así una partida con el mismo guion
+    de entradas y la misma semilla produce exactamente los mismos frames.
+    """
+
+    def __init__(self):
+        self.virtual = None  # Tiempo virtual acumulado o None si se usa el real
+
+    def tick(self, dt):
+        """Avanza el reloj virtual `dt` segundos (None deja el reloj real)."""
+        if dt is None:
+            return
+        if self.virtual is None:
+            self.virtual = 0.0
+        self.virtual += dt
+
+    def now(self):
+        """Instante actual en segundos."""
+        return time.time() if self.virtual is None else self.virtual
+
+    def reset(self):
+        """Vuelve al reloj real hasta el próximo dt."""
+        self.virtual = None
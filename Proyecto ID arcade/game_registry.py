@@ -0,0 +1,182 @@
+import os
+import sys
+import threading
+import time
+import importlib.util
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Optional
+
+from manifest import GameManifest
+
+# Carpeta de la consola: los juegos importan de aquí la capa de entrada y los módulos comunes
+CONSOLE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def resolve_games_dir(path):
+    """Devuelve la carpeta de juegos aunque difiera en mayúsculas ('juegos' / 'Juegos')."""
+    if os.path.isdir(path):
+        return path
+    parent, name = os.path.split(path)
+    try:
+        for entry in os.listdir(parent or '.'):
+            if entry.lower() == name.lower() and os.path.isdir(os.path.join(parent, entry)):
+                return os.path.join(parent, entry)
+    except OSError:
+        pass
+    os.makedirs(path)
+    return path
+
+
+def load_game_module(path):
+    """Importa un juego desde su archivo con la carpeta de la consola en sys.path."""
+    if CONSOLE_DIR not in sys.path:
+        sys.path.append(CONSOLE_DIR)
+    module_name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@dataclass
+class GameEntry:
+    path: str
+    mtime: int  # mtime del archivo cuando se importó el módulo
+    module: Optional[ModuleType] = None
+    import_ms: Optional[float] = None  # Duración de la última importación
+
+
+class GameRegistry:
+    """Registro de juegos con caché de módulos importados.
+
+    Cada juego se importa una sola vez y se vuelve a importar solo si su
+    archivo ha cambiado. La carpeta se vuelve a listar únicamente cuando cambia
+    su mtime (alta o baja de archivos), así que `poll()` cuesta un `stat` por
+    intervalo y se puede llamar en cada frame. Los metadatos de cada juego
+    (título, icono, tamaño de frame...) salen de un manifiesto que se
+    regenera solo para los archivos que cambian.
+
+    `scan()`, `load()` y `reset()` se pueden llamar desde otros hilos (la
+    precarga de juegos): un cerrojo reentrante las serializa.
+    """
+
+    def __init__(self, games_dir='juegos', poll_interval=1.0):
+        self.games_dir = resolve_games_dir(games_dir)
+        self.manifest = GameManifest(self.games_dir)
+        self.poll_interval = poll_interval
+        self._entries = {}
+        self._dir_mtime = None
+        self._last_poll = 0.0
+        self._lock = threading.RLock()
+        self.scan()
+
+    @property
+    def games(self):
+        """Nombres de archivo de los juegos disponibles, en orden alfabético."""
+        return sorted(self._entries)
+
+    def scan(self):
+        """Actualiza la lista de juegos si la carpeta ha cambiado. Devuelve True si cambió."""
+        with self._lock:
+            try:
+                dir_mtime = os.stat(self.games_dir).st_mtime_ns
+            except OSError:
+                return False
+            if dir_mtime == self._dir_mtime:
+                return False
+            self._dir_mtime = dir_mtime
+
+            names = {f for f in os.listdir(self.games_dir) if f.endswith('.py')}
+            changed = False
+            for name in set(self._entries) - names:
+                del self._entries[name]
+                changed = True
+            for name in names - set(self._entries):
+                self._entries[name] = GameEntry(os.path.join(self.games_dir, name), 0)
+                changed = True
+            self.manifest.refresh(self._entries, {n: e.path for n, e in self._entries.items()})
+            return changed
+
+    def poll(self):
+        """Comprueba la carpeta como mucho una vez por `poll_interval` segundos."""
+        now = time.monotonic()
+        if now - self._last_poll < self.poll_interval:
+            return False
+        self._last_poll = now
+        # Si otro hilo está importando un juego no se espera: se mira en el siguiente intervalo
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            return self.scan()
+        finally:
+            self._lock.release()
+
+    def info(self, name):
+        """Metadatos del juego según el manifiesto (GameInfo) o None."""
+        return self.manifest.get(name)
+
+    def path(self, name):
+        """Ruta del archivo de un juego o None si no existe."""
+        entry = self._entries.get(name)
+        return entry.path if entry is not None else None
+
+    def import_ms(self, name):
+        """Milisegundos que tardó la última importación del juego o None si no se importó."""
+        entry = self._entries.get(name)
+        return entry.import_ms if entry is not None else None
+
+    def load(self, name, fresh=True):
+        """Devuelve el módulo del juego, importándolo solo si no está en caché o cambió.
+
+        Con `fresh=True` un módulo reutilizado se reinicia para empezar una
+        partida nueva, igual que si se acabara de importar.
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                print(f"Error al cargar el juego: {name} no existe")
+                return None
+
+            try:
+                mtime = os.stat(entry.path).st_mtime_ns
+            except OSError as e:
+                print(f"Error al cargar el juego: {e}")
+                return None
+
+            if entry.module is not None and entry.mtime == mtime:
+                if fresh:
+                    self.reset(name)
+                return entry.module
+
+            start = time.perf_counter()
+            module = self._import(entry.path)
+            if module is not None:
+                entry.module = module
+                entry.mtime = mtime
+                entry.import_ms = (time.perf_counter() - start) * 1000
+            self.manifest.refresh_game(name, entry.path)
+            return module
+
+    def reset(self, name):
+        """Reinicia el estado de un juego sin volver a importarlo si expone reset()."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry.module is None:
+                return
+            if hasattr(entry.module, 'reset'):
+                try:
+                    entry.module.reset()
+                    return
+                except Exception as e:
+                    print(f"Error al reiniciar el juego: {e}")
+            # Sin reset() la única forma de limpiar el estado es importarlo de nuevo
+            entry.module = self._import(entry.path)
+
+    def _import(self, path):
+        """Importa un juego desde su archivo."""
+        try:
+            return load_game_module(path)
+        except Exception as e:
+            print(f"Error al cargar el juego: {e}")
+            return None
@@ -0,0 +1,235 @@
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from game_registry import load_game_module
+from input_layer import InputState, dispatch_key
+from scheduler import FrameScheduler, accepts_dt
+
+HEADER_SIZE = 16  # Dos int64: número de secuencia y buffer frontal
+
+
+class SharedFrameBuffer:
+    """Framebuffer doble en memoria compartida con contador de secuencia.
+
+    El escritor dibuja siempre en el buffer trasero, lo publica como frontal y
+    después incrementa la secuencia. El lector copia el frontal y comprueba que
+    la secuencia no haya cambiado durante la copia; si cambió, el frame podría
+    estar a medio escribir y se descarta.
+    """
+
+    def __init__(self, shape, name=None):
+        self.shape = tuple(shape)
+        frame_bytes = int(np.prod(self.shape))
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=HEADER_SIZE + 2 * frame_bytes)
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.header = np.ndarray((2,), dtype=np.int64, buffer=self.shm.buf)
+        self.frames = np.ndarray((2,) + self.shape, dtype=np.uint8,
+                                 buffer=self.shm.buf, offset=HEADER_SIZE)
+        if self.owner:
+            self.header[:] = (0, 0)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def sequence(self):
+        return int(self.header[0])
+
+    def write(self, frame):
+        """Publica un frame completo."""
+        back = 1 - int(self.header[1])
+        if frame.shape != self.shape:
+            # El juego cambió de tamaño: se adapta al buffer ya reservado
+            frame = cv2.resize(frame, (self.shape[1], self.shape[0]))
+        np.copyto(self.frames[back], frame)
+        self.header[1] = back
+        self.header[0] += 1
+
+    def read(self, out, retries=3):
+        """Copia el último frame completo en `out`. Devuelve su secuencia o None."""
+        for _ in range(retries):
+            sequence = int(self.header[0])
+            if sequence == 0:
+                return None
+            np.copyto(out, self.frames[int(self.header[1])])
+            if int(self.header[0]) == sequence:
+                return sequence
+        return None
+
+    def close(self):
+        # Soltar las vistas antes de cerrar el segmento
+        self.header = None
+        self.frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class _PipedKeys:
+    """Origen de teclas para `InputState`: las llegadas por la tubería desde el último tick."""
+
+    def __init__(self):
+        self.keys = []
+
+    def poll_keys(self):
+        keys, self.keys = self.keys, []
+        return keys
+
+
+def _render(module, dt, uses_dt):
+    """Obtiene (superior, inferior) del juego, tenga una o dos pantallas."""
+    kwargs = {'dt': dt} if uses_dt else {}
+    if hasattr(module, 'get_frames'):
+        return module.get_frames(**kwargs)
+    return module.get_frame(**kwargs), None
+
+
+def _worker_main(game_path, conn, target_fps):
+    """Bucle del proceso del juego: entrada por la tubería, frames por memoria compartida."""
+    buffers = []
+    try:
+        module = load_game_module(game_path)
+        render_fn = getattr(module, 'get_frames', getattr(module, 'get_frame', None))
+        if render_fn is None:
+            raise AttributeError("El juego debe implementar get_frame() o get_frames()")
+        uses_dt = accepts_dt(render_fn)
+        scheduler = FrameScheduler(target_fps)
+        # Estado pulsada/mantenida/soltada como en la consola, a partir de las teclas recibidas
+        piped_keys = _PipedKeys()
+        input_state = InputState()
+        if hasattr(module, 'set_input'):
+            module.set_input(input_state)
+
+        # El primer frame fija el tamaño de los buffers; los crea la consola
+        _, dt = scheduler.wait()
+        frames = [f for f in _render(module, dt, uses_dt) if f is not None]
+        conn.send(('ready', [f.shape for f in frames], hasattr(module, 'get_frames'),
+                   getattr(module, 'VIEWPORT_MODE', None)))
+        message = conn.recv()
+        while message[0] != 'buffers':
+            if message[0] == 'stop':
+                return
+            if message[0] == 'key':
+                piped_keys.keys.append(message[1])
+                dispatch_key(module, message[1])
+            message = conn.recv()
+        buffers = [SharedFrameBuffer(shape, name) for shape, name in zip(message[1], message[2])]
+
+        while True:
+            for buffer, frame in zip(buffers, frames):
+                buffer.write(frame)
+
+            # Atender todas las teclas pendientes sin bloquear
+            while conn.poll():
+                message = conn.recv()
+                if message[0] == 'stop':
+                    return
+                if message[0] == 'key':
+                    piped_keys.keys.append(message[1])
+                    dispatch_key(module, message[1])
+
+            _, dt = scheduler.wait()
+            input_state.poll(piped_keys, now=scheduler.tick * scheduler.period)
+            frames = [f for f in _render(module, dt, uses_dt) if f is not None]
+    except Exception as e:
+        try:
+            conn.send(('error', f"{type(e).__name__}: {e}"))
+        except (OSError, EOFError):
+            pass
+    finally:
+        for buffer in buffers:
+            buffer.close()
+
+
+class ProcessGameRunner:
+    """Ejecuta un juego en su propio proceso.
+
+    La consola nunca espera al juego: `get_frames()` devuelve siempre el último
+    frame completo, así que un juego lento o que falla no congela la interfaz.
+    """
+
+    def __init__(self, game_path, target_fps=60):
+        self.game_path = game_path
+        context = mp.get_context('spawn')
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main,
+                                       args=(game_path, child_conn, target_fps),
+                                       daemon=True)
+        self.process.start()
+        self.buffers = []
+        self.frames = []  # Últimos frames copiados de la memoria compartida
+        self.sequences = []  # Secuencia de cada frame copiado
+        self.is_dual_screen = False
+        self.viewport_mode = None
+        self.error = None
+
+    @property
+    def ready(self):
+        return bool(self.buffers)
+
+    def _poll_messages(self):
+        """Procesa los mensajes del proceso del juego sin bloquear."""
+        try:
+            while self.conn.poll():
+                message = self.conn.recv()
+                if message[0] == 'ready':
+                    shapes = message[1]
+                    self.is_dual_screen = message[2]
+                    self.viewport_mode = message[3]
+                    self.buffers = [SharedFrameBuffer(shape) for shape in shapes]
+                    self.frames = [np.zeros(shape, dtype=np.uint8) for shape in shapes]
+                    self.sequences = [0] * len(shapes)
+                    self.conn.send(('buffers', shapes, [b.name for b in self.buffers]))
+                elif message[0] == 'error':
+                    self.error = message[1]
+                    print(f"Error en el proceso del juego: {self.error}")
+        except (OSError, EOFError):
+            if self.error is None:
+                self.error = "el proceso del juego terminó inesperadamente"
+                print(f"Error en el proceso del juego: {self.error}")
+
+    def get_frames(self):
+        """Devuelve (superior, inferior) con el último frame completo de cada pantalla."""
+        self._poll_messages()
+        if not self.ready:
+            return None, None
+        for i, buffer in enumerate(self.buffers):
+            # Solo se copia si el juego ha publicado un frame nuevo
+            if buffer.sequence != self.sequences[i]:
+                sequence = buffer.read(self.frames[i])
+                if sequence is not None:
+                    self.sequences[i] = sequence
+        upper = self.frames[0]
+        lower = self.frames[1] if len(self.frames) > 1 else None
+        return upper, lower
+
+    def handle_key(self, key):
+        """Envía una tecla al proceso del juego."""
+        if self.error is None:
+            try:
+                self.conn.send(('key', key))
+            except (OSError, EOFError):
+                pass
+
+    def stop(self):
+        """Detiene el proceso y libera la memoria compartida."""
+        try:
+            self.conn.send(('stop',))
+        except (OSError, EOFError):
+            pass
+        self.process.join(timeout=1.0)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+        for buffer in self.buffers:
+            buffer.close()
+        self.buffers = []
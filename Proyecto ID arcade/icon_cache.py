@@ -0,0 +1,153 @@
+import os
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+
+def load_icon(path, size):
+    """Lee `path` y lo redimensiona a `size`x`size`. Devuelve (mtime, icono) o (None, None)."""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None, None
+    image = cv2.imread(path)
+    if image is None:
+        return mtime, None
+    return mtime, cv2.resize(image, (size, size))
+
+
+class IconCache:
+    """Caché acotada de iconos ya decodificados y redimensionados.
+
+    Cada icono se guarda por (ruta, tamaño) junto con el mtime del archivo, de
+    forma que solo se vuelve a leer del disco si la imagen ha cambiado.
+    """
+
+    def __init__(self, max_items=64):
+        self.max_items = max_items
+        self._items = OrderedDict()
+
+    def get(self, path, size):
+        """Devuelve el icono de `path` a `size`x`size` o None si no se puede leer."""
+        icon = self.peek(path, size)
+        if icon is not None:
+            return icon
+        mtime, icon = load_icon(path, size)
+        if icon is not None:
+            self.put(path, size, mtime, icon)
+        return icon
+
+    def peek(self, path, size):
+        """Icono en caché y vigente (mismo mtime) o None, sin leer la imagen."""
+        cached = self._items.get((path, size))
+        if cached is None:
+            return None
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        if cached[0] != mtime:
+            return None
+        self._items.move_to_end((path, size))
+        return cached[1]
+
+    def put(self, path, size, mtime, icon):
+        """Guarda un icono ya decodificado."""
+        key = (path, size)
+        self._items[key] = (mtime, icon)
+        self._items.move_to_end(key)
+        # Expulsar el icono menos usado si se supera el límite
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        """Vacía la caché."""
+        self._items.clear()
+
+
+class AsyncIconLoader:
+    """Carga iconos en hilos de fondo y los deja en una IconCache.
+
+    `get()` nunca lee del disco: devuelve el icono si ya está en caché y, si
+    no, encarga la carga y devuelve None para que el menú dibuje un hueco.
+    Los hilos solo decodifican; `poll()`, llamado desde el bucle principal,
+    pasa los resultados a la caché, así que esta no necesita cerrojos.
+    `version` aumenta cada vez que llega algún icono.
+    """
+
+    def __init__(self, cache, workers=2):
+        self.cache = cache
+        self.version = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='iconos')
+        self._pending = set()  # (ruta, tamaño) en carga
+        self._failed = {}  # (ruta, tamaño) -> mtime con el que no se pudo leer
+        self._done = deque()  # Resultados que aún no han pasado a la caché
+
+    def get(self, path, size):
+        """Icono de `path` si ya está cargado; si no, lo encarga y devuelve None."""
+        icon = self.cache.peek(path, size)
+        if icon is None:
+            self.request(path, size)
+        return icon
+
+    def request(self, path, size):
+        """Encarga la carga de un icono si no está en caché ni en curso."""
+        key = (path, size)
+        if key in self._pending:
+            return
+        if key in self._failed:
+            # Solo se reintenta si la imagen ha cambiado desde el fallo
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime == self._failed[key]:
+                return
+            del self._failed[key]
+        if self.cache.peek(path, size) is not None:
+            return
+        self._pending.add(key)
+        self._executor.submit(self._load, path, size)
+
+    def pending(self, path, size):
+        """Indica si el icono se está cargando todavía."""
+        return (path, size) in self._pending
+
+    def _load(self, path, size):
+        try:
+            mtime, icon = load_icon(path, size)
+        except Exception as e:
+            print(f"Error al cargar el icono {path}: {e}")
+            mtime, icon = None, None
+        self._done.append((path, size, mtime, icon))
+
+    def poll(self):
+        """Pasa a la caché los iconos terminados. Devuelve True si llegó alguno."""
+        arrived = False
+        while self._done:
+            path, size, mtime, icon = self._done.popleft()
+            self._pending.discard((path, size))
+            if icon is None:
+                self._failed[(path, size)] = mtime
+            else:
+                self.cache.put(path, size, mtime, icon)
+            arrived = True
+        if arrived:
+            self.version += 1
+        return arrived
+
+    def wait(self, timeout=None):
+        """Espera a que terminen las cargas en curso (para renders deterministas)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._pending:
+            self.poll()
+            if not self._pending or (deadline is not None and time.monotonic() > deadline):
+                break
+            time.sleep(0.001)
+        self.poll()
+
+    def shutdown(self):
+        """Cancela las cargas pendientes y detiene los hilos."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,131 @@
+import time
+from collections import deque, namedtuple
+
+# Acciones con nombre que entienden los juegos
+UP = 'UP'
+DOWN = 'DOWN'
+LEFT = 'LEFT'
+RIGHT = 'RIGHT'
+A = 'A'
+B = 'B'
+START = 'START'
+SELECT = 'SELECT'
+ACTIONS = (UP, DOWN, LEFT, RIGHT, A, B, START, SELECT)
+
+# Códigos crudos -> acción. Incluye las flechas de HighGUI en Linux (81-84)
+# y las de Windows tras `& 0xFF` (0-3)
+DEFAULT_BINDINGS = {
+    ord('w'): UP, 82: UP, 0: UP,
+    ord('s'): DOWN, 84: DOWN, 1: DOWN,
+    ord('a'): LEFT, 81: LEFT, 2: LEFT,
+    ord('d'): RIGHT, 83: RIGHT, 3: RIGHT,
+    13: A,
+    32: B,
+    ord('r'): START,
+}
+
+InputEvent = namedtuple('InputEvent', 'time code action')
+
+
+def action_for(key, bindings=DEFAULT_BINDINGS):
+    """Acción asociada a un código de tecla o None."""
+    return bindings.get(key)
+
+
+def dispatch_key(module, key, bindings=DEFAULT_BINDINGS):
+    """Entrega una tecla a un juego: como acción si la entiende, si no como código."""
+    action = bindings.get(key)
+    if action is not None and hasattr(module, 'handle_action'):
+        module.handle_action(action)
+    elif hasattr(module, 'handle_key'):
+        module.handle_key(key)
+
+
+def raw_key_handler(handle_action, bindings=DEFAULT_BINDINGS):
+    """Crea un `handle_key(key)` que traduce teclas crudas a acciones para `handle_action`."""
+    def handle_key(key):
+        action = bindings.get(key)
+        if action is not None:
+            handle_action(action)
+    return handle_key
+
+
+class InputState:
+    """Cola de eventos con marca de tiempo y estado pulsada/mantenida/soltada por acción.
+
+    `poll(backend)` vacía todas las teclas pendientes en cada tick, así que no
+    se pierde ninguna aunque lleguen varias entre dos frames. HighGUI no envía
+    eventos de soltar tecla: una acción se considera mantenida mientras siguen
+    llegando repeticiones del teclado, con `repeat_delay` tras la primera
+    pulsación (el retardo típico del autorepetido) y `hold_timeout` después.
+    Solo cuenta como mantenida (`held`) cuando ya llegó alguna repetición:
+    un toque suelto es una pulsación y nada más.
+    """
+
+    def __init__(self, bindings=None, repeat_delay=0.5, hold_timeout=0.1, history=64):
+        self.bindings = dict(DEFAULT_BINDINGS if bindings is None else bindings)
+        self.repeat_delay = repeat_delay
+        self.hold_timeout = hold_timeout
+        self.events = deque(maxlen=history)  # Últimos eventos (para depurar o grabar)
+        self.tick_events = []  # Eventos llegados en el tick actual
+        self._held_until = {}  # acción -> instante en que deja de estar activa
+        self._repeating = set()  # Acciones con repeticiones del teclado: mantenidas de verdad
+        self._pressed = set()
+        self._released = set()
+
+    def bind(self, key, action):
+        """Asocia un código de tecla a una acción (None la desasocia)."""
+        if action is None:
+            self.bindings.pop(key, None)
+        else:
+            self.bindings[key] = action
+
+    def poll(self, backend, now=None):
+        """Vacía las teclas pendientes del backend y actualiza el estado. Devuelve los eventos."""
+        now = time.perf_counter() if now is None else now
+        self.tick_events = []
+        self._pressed.clear()
+        self._released.clear()
+
+        for key in backend.poll_keys():
+            key &= 0xFF
+            action = self.bindings.get(key)
+            event = InputEvent(now, key, action)
+            self.tick_events.append(event)
+            self.events.append(event)
+            if action is None:
+                continue
+            if action in self._held_until:
+                # Repetición del teclado: la acción sigue mantenida
+                self._held_until[action] = now + self.hold_timeout
+                self._repeating.add(action)
+            else:
+                self._pressed.add(action)
+                self._held_until[action] = now + self.repeat_delay
+
+        for action, until in list(self._held_until.items()):
+            if until < now and action not in self._pressed:
+                del self._held_until[action]
+                self._repeating.discard(action)
+                self._released.add(action)
+        return self.tick_events
+
+    def pressed(self, action):
+        """La acción empezó en este tick."""
+        return action in self._pressed
+
+    def held(self, action):
+        """La acción se mantiene pulsada: ya llegan repeticiones del teclado."""
+        return action in self._repeating
+
+    def released(self, action):
+        """La acción dejó de estar activa en este tick."""
+        return action in self._released
+
+    def clear(self):
+        """Olvida el estado (por ejemplo, al cambiar de juego)."""
+        self.tick_events = []
+        self._held_until.clear()
+        self._repeating.clear()
+        self._pressed.clear()
+        self._released.clear()
@@ -0,0 +1,116 @@
+from functools import lru_cache
+
+import numpy as np
+
+# La consola se diseñó en unidades lógicas de 400x400 para una ventana de 800x700
+LOGICAL_SIZE = (400, 400)
+REFERENCE_SIZE = (800, 700)
+
+# Cruceta en unidades lógicas
+DPAD_POINTS = ((65, 307), (75, 307), (75, 297), (85, 297), (85, 307),
+               (95, 307), (95, 317), (85, 317), (85, 327), (75, 327),
+               (75, 317), (65, 317))
+
+# Botones A B X Y: centro lógico (antes del desplazamiento) y letra
+ACTION_BUTTONS = ((290, 273, 'X'), (270, 293, 'Y'), (310, 293, 'A'), (290, 313, 'B'))
+ACTION_BUTTONS_OFFSET = 25
+
+
+class Layout:
+    """Geometría de la consola en píxeles para un tamaño de ventana concreto.
+
+    Todas las posiciones se definen en unidades lógicas y se convierten una
+    sola vez al crear el layout; el dibujo de cada frame solo lee los
+    rectángulos ya calculados. Si la ventana no tiene la proporción de
+    referencia la consola se escala sin deformarse y se centra.
+    """
+
+    def __init__(self, width, height):
+        self.size = (width, height)
+        fit = min(width / REFERENCE_SIZE[0], height / REFERENCE_SIZE[1])
+        self.scale_x = REFERENCE_SIZE[0] / LOGICAL_SIZE[0] * fit
+        self.scale_y = REFERENCE_SIZE[1] / LOGICAL_SIZE[1] * fit
+        self.offset_x = (width - int(REFERENCE_SIZE[0] * fit)) // 2
+        self.offset_y = (height - int(REFERENCE_SIZE[1] * fit)) // 2
+        self.thickness = max(1, round(fit))  # Grosor de líneas y texto
+
+        # Carcasas y pantallas (esquinas x1, y1, x2, y2)
+        self.upper_casing = self.box(50, 20, 350, 200)
+        self.upper_bezel = self.box(60, 30, 340, 190)
+        self.upper_display = self.box(70, 40, 330, 180)
+        self.lower_casing = self.box(50, 205, 350, 385)
+        self.lower_bezel = self.box(118, 218, 282, 352)
+        self.lower_display = self.box(125, 225, 275, 345)
+        self.casing_radius = self.w(20)
+
+        # Regiones (x, y, ancho, alto) donde se escalan los frames de los juegos
+        self.upper_viewport = self.rect(75, 45, 250, 130)
+        self.lower_viewport = self.rect(125, 225, 150, 120)
+
+        # Menú de la pantalla inferior
+        self.menu = self.box(120, 220, 280, 350)
+        self.menu_region = self.lower_bezel[:2] + (self.lower_bezel[2] + 1,
+                                                   self.lower_bezel[3] + 1)
+        self.icon_size = self.w(32)
+
+        # Controles
+        self.circle_pad = self.point(81, 260)
+        self.circle_pad_radius = self.w(18)
+        self.dpad = self.polygon(DPAD_POINTS)
+        self.action_buttons = tuple((self.point(x + ACTION_BUTTONS_OFFSET, y), letter)
+                                    for x, y, letter in ACTION_BUTTONS)
+        self.action_button_radius = self.w(8)
+        self.power_button = self.point(290, 360)
+        self.power_button_radius = self.w(9)
+        self.power_switch = self.box(290, 360, 305, 375)  # Versión cuadrada de los prototipos
+        self.camera_button = self.box(185, 360, 195, 368)
+
+        # Botón "Q = SALIR" de los juegos de una pantalla
+        button_w, button_h = self.w(80), self.h(25)
+        button_x = self.x(200) - button_w // 2
+        button_y = self.y(285) - button_h // 2
+        self.exit_button = (button_x, button_y, button_x + button_w, button_y + button_h)
+        self.exit_text = (button_x + self.w(10), button_y + self.h(17))
+
+    # Conversión de unidades lógicas a píxeles
+    def x(self, value):
+        return self.offset_x + int(value * self.scale_x)
+
+    def y(self, value):
+        return self.offset_y + int(value * self.scale_y)
+
+    def w(self, value):
+        """Longitud horizontal (también radios) en píxeles."""
+        return int(value * self.scale_x)
+
+    def h(self, value):
+        """Longitud vertical en píxeles."""
+        return int(value * self.scale_y)
+
+    def point(self, x, y):
+        return (self.x(x), self.y(y))
+
+    def box(self, x1, y1, x2, y2):
+        """Esquinas de un rectángulo lógico."""
+        return (self.x(x1), self.y(y1), self.x(x2), self.y(y2))
+
+    def rect(self, x, y, width, height):
+        """Rectángulo lógico como (x, y, ancho, alto) en píxeles."""
+        return (self.x(x), self.y(y), self.w(width), self.h(height))
+
+    def polygon(self, points):
+        return np.array([self.point(x, y) for x, y in points], np.int32)
+
+    def font(self, scale):
+        """Escala de fuente de OpenCV equivalente a `scale` en unidades lógicas."""
+        return scale * self.scale_x
+
+    def contains(self, box, x, y):
+        """Indica si el punto (x, y) en píxeles cae dentro de `box`."""
+        return box[0] <= x <= box[2] and box[1] <= y <= box[3]
+
+
+@lru_cache(maxsize=8)
+def get_layout(width=REFERENCE_SIZE[0], height=REFERENCE_SIZE[1]):
+    """Layout de un tamaño de ventana; se calcula una vez por tamaño."""
+    return Layout(width, height)
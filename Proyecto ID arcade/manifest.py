@@ -0,0 +1,200 @@
+import ast
+import json
+import os
+from dataclasses import asdict, dataclass, field, replace
+from typing import List, Optional, Tuple
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+# Extensiones de icono que se buscan junto al juego, por orden de preferencia
+ICON_EXTENSIONS = ('.jpg', '.png')
+
+
+@dataclass
+class GameInfo:
+    file: str
+    mtime: int  # mtime del archivo cuando se extrajeron los datos
+    title: str
+    icon: Optional[str] = None
+    icon_mtime: Optional[int] = None  # mtime del icono: si cambia, se vuelve a buscar
+    dual_screen: bool = False
+    accepts_dt: bool = False
+    viewport_mode: Optional[str] = None
+    # FRAME_SIZE / LOWER_FRAME_SIZE del juego: (ancho, alto) nativos, para preparar el escalado
+    frame_size: Optional[Tuple[int, int]] = None
+    lower_frame_size: Optional[Tuple[int, int]] = None
+    assets: List[str] = field(default_factory=list)
+
+
+def _literal(node):
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, RecursionError):
+        return None
+
+
+def find_icon(stem, games_dir):
+    """(ruta, mtime) del icono del juego junto a su archivo, o (None, None)."""
+    for extension in ICON_EXTENSIONS:
+        candidate = os.path.join(games_dir, stem + extension)
+        try:
+            return candidate, os.stat(candidate).st_mtime_ns
+        except OSError:
+            continue
+    return None, None
+
+
+def _asset_dirs(tree, games_dir):
+    """Carpetas de recursos que aparecen como cadenas en el código del juego.
+
+    Se devuelven relativas a la carpeta de juegos, sin depender del directorio
+    desde el que se lance la consola.
+    """
+    games_dir = os.path.abspath(games_dir)
+    console_dir = os.path.dirname(games_dir)
+    dirs = set()
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Constant) and isinstance(node.value, str)):
+            continue
+        text = node.value
+        if len(text) < 2 or len(text) > 200 or '\n' in text or os.path.isabs(text):
+            continue
+        if text.strip('./') == '':
+            continue
+        # Las rutas pueden ser relativas a la consola o a la carpeta de juegos
+        for base in (console_dir, games_dir):
+            path = os.path.normpath(os.path.join(base, text))
+            if os.path.isdir(path):
+                dirs.add(os.path.relpath(path, games_dir))
+            elif os.path.dirname(text) and os.path.isfile(path):
+                dirs.add(os.path.relpath(os.path.dirname(path), games_dir))
+    return sorted(dirs)
+
+
+def extract_info(path, games_dir):
+    """Lee los metadatos de un juego con `ast`, sin ejecutar su código."""
+    name = os.path.basename(path)
+    stem = os.path.splitext(name)[0]
+    with open(path, 'rb') as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    constants = {}
+    functions = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name) and target.id.isupper():
+                    constants[target.id] = _literal(node.value)
+        elif isinstance(node, ast.FunctionDef):
+            functions[node.name] = node
+
+    render = functions.get('get_frames') or functions.get('get_frame')
+    args = render.args if render is not None else None
+    accepts_dt = args is not None and any(
+        a.arg == 'dt' for a in args.posonlyargs + args.args + args.kwonlyargs)
+
+    icon, icon_mtime = find_icon(stem, games_dir)
+
+    def size(value):
+        return tuple(value) if isinstance(value, (tuple, list)) and len(value) == 2 else None
+
+    return GameInfo(
+        file=name,
+        mtime=os.stat(path).st_mtime_ns,
+        title=constants.get('TITLE') or stem,
+        icon=icon,
+        icon_mtime=icon_mtime,
+        dual_screen='get_frames' in functions,
+        accepts_dt=accepts_dt,
+        viewport_mode=constants.get('VIEWPORT_MODE'),
+        frame_size=size(constants.get('FRAME_SIZE')),
+        lower_frame_size=size(constants.get('LOWER_FRAME_SIZE')),
+        assets=_asset_dirs(tree, games_dir),
+    )
+
+
+class GameManifest:
+    """Índice JSON con los metadatos de cada juego, guardado en la carpeta de juegos.
+
+    Solo se vuelve a analizar un juego cuando cambia su mtime; el resto sale
+    del archivo. El icono se comprueba aparte en cada sincronización, así que
+    añadirlo, quitarlo o cambiarlo no obliga a tocar el juego. Así el menú arranca sin leer ni analizar ningún juego y sin
+    ejecutar su código.
+    """
+
+    def __init__(self, games_dir):
+        self.games_dir = games_dir
+        self.path = os.path.join(games_dir, MANIFEST_NAME)
+        self.games = {}  # archivo -> GameInfo
+        self.version = 0  # Aumenta en cada cambio (para invalidar cachés del menú)
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != MANIFEST_VERSION:
+            return
+        for name, info in data.get('games', {}).items():
+            try:
+                for key in ('frame_size', 'lower_frame_size'):
+                    if info.get(key) is not None:
+                        info[key] = tuple(info[key])
+                self.games[name] = GameInfo(**info)
+            except TypeError:
+                continue  # Entrada de otra versión: se regenerará
+
+    def save(self):
+        data = {'version': MANIFEST_VERSION,
+                'games': {name: asdict(info) for name, info in sorted(self.games.items())}}
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+        except OSError as e:
+            print(f"No se pudo guardar el manifiesto: {e}")
+
+    def refresh(self, names, paths=None):
+        """Sincroniza el índice con la lista de juegos. Devuelve True si cambió."""
+        changed = False
+        for name in set(self.games) - set(names):
+            del self.games[name]
+            changed = True
+        for name in names:
+            path = paths[name] if paths else os.path.join(self.games_dir, name)
+            changed |= self._refresh_one(name, path)
+        if changed:
+            self.version += 1
+            self.save()
+        return changed
+
+    def refresh_game(self, name, path):
+        """Vuelve a analizar un juego si su archivo cambió."""
+        if self._refresh_one(name, path):
+            self.version += 1
+            self.save()
+
+    def _refresh_one(self, name, path):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return False
+        info = self.games.get(name)
+        if info is not None and info.mtime == mtime:
+            icon, icon_mtime = find_icon(os.path.splitext(name)[0], self.games_dir)
+            if (info.icon, info.icon_mtime) == (icon, icon_mtime):
+                return False
+            self.games[name] = replace(info, icon=icon, icon_mtime=icon_mtime)
+            return True
+        try:
+            self.games[name] = extract_info(path, self.games_dir)
+        except (OSError, SyntaxError, ValueError) as e:
+            print(f"Error al analizar {name}: {e}")
+            self.games[name] = GameInfo(file=name, mtime=mtime, title=os.path.splitext(name)[0])
+        return True
+
+    def get(self, name):
+        """Metadatos de un juego o None."""
+        return self.games.get(name)
@@ -2,12 +2,11 @@ import cv2
 import numpy as np
 import os
 import importlib.util
+from layout import get_layout
 
 # Constantes y configuración
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 700
-SCALE_X = WINDOW_WIDTH / 400
-SCALE_Y = WINDOW_HEIGHT / 400
 MAX_VISIBLE_ITEMS = 5
 
 # Colores
@@ -26,6 +25,7 @@ COLORS = {
 
 class Nintendo3DSEmulator:
     def __init__(self):
+        self.layout = get_layout(WINDOW_WIDTH, WINDOW_HEIGHT)  # Geometría precalculada
         self.image = np.zeros((WINDOW_HEIGHT, WINDOW_WIDTH, 3), dtype=np.uint8)
         self.current_game_module = None
         self.game_running = False
@@ -55,45 +55,48 @@ class Nintendo3DSEmulator:
 
     def draw_upper_screen(self):
         """Dibuja la pantalla superior de la consola."""
+        L = self.layout
         # Carcasa superior
-        cv2.rectangle(self.image, (int(50 * SCALE_X), int(20 * SCALE_Y)), 
-                     (int(350 * SCALE_X), int(200 * SCALE_Y)), COLORS['blue'], -1)
-        cv2.rectangle(self.image, (int(60 * SCALE_X), int(30 * SCALE_Y)), 
-                     (int(340 * SCALE_X), int(190 * SCALE_Y)), COLORS['black'], -1)
-        cv2.rectangle(self.image, (int(70 * SCALE_X), int(40 * SCALE_Y)), 
-                     (int(330 * SCALE_X), int(180 * SCALE_Y)), COLORS['dark_gray'], -1)
+        cv2.rectangle(self.image, L.upper_casing[:2], 
+                     L.upper_casing[2:], COLORS['blue'], -1)
+        cv2.rectangle(self.image, L.upper_bezel[:2], 
+                     L.upper_bezel[2:], COLORS['black'], -1)
+        x1, y1, x2, y2 = L.upper_display
+        cv2.rectangle(self.image, (x1, y1), 
+                     (x2, y2), COLORS['dark_gray'], -1)
 
         # Dibujar frame del juego si está en ejecución
         if self.game_running and self.current_game_module:
             try:
                 game_frame = self.current_game_module.get_frame()
-                game_frame_resized = cv2.resize(game_frame, (int(260 * SCALE_X), int(140 * SCALE_Y)))
-                self.image[int(40 * SCALE_Y):int(180 * SCALE_Y), 
-                          int(70 * SCALE_X):int(330 * SCALE_X)] = game_frame_resized
+                game_frame_resized = cv2.resize(game_frame, (x2 - x1, y2 - y1))
+                self.image[y1:y2, x1:x2] = game_frame_resized
             except Exception as e:
                 print(f"Error al actualizar el frame del juego: {e}")
 
     def draw_decorative_elements(self):
         """Dibuja elementos decorativos de la consola."""
+        L = self.layout
         # LEDs superiores
         for i, x in enumerate([80, 90, 100]):
-            cv2.circle(self.image, (int(x * SCALE_X), int(35 * SCALE_Y)), 
-                      int(2 * SCALE_X), COLORS['light_blue'], -1)
-        cv2.circle(self.image, (int(320 * SCALE_X), int(35 * SCALE_Y)), 
-                  int(3 * SCALE_X), COLORS['light_blue'], -1)
+            cv2.circle(self.image, L.point(x, 35), 
+                      L.w(2), COLORS['light_blue'], -1)
+        cv2.circle(self.image, L.point(320, 35), 
+                  L.w(3), COLORS['light_blue'], -1)
         
         # Borde curvo
-        cv2.ellipse(self.image, (int(200 * SCALE_X), int(202 * SCALE_Y)), 
-                    (int(130 * SCALE_X), int(5 * SCALE_Y)), 0, 0, 180, 
+        cv2.ellipse(self.image, L.point(200, 202), 
+                    (L.w(130), L.h(5)), 0, 0, 180, 
                     COLORS['light_blue'], -1)
 
     def draw_lower_screen(self):
         """Dibuja la pantalla inferior y su contenido."""
+        L = self.layout
         # Carcasa inferior
-        cv2.rectangle(self.image, (int(50 * SCALE_X), int(205 * SCALE_Y)), 
-                     (int(350 * SCALE_X), int(385 * SCALE_Y)), COLORS['blue'], -1)
-        cv2.rectangle(self.image, (int(118 * SCALE_X), int(218 * SCALE_Y)), 
-                     (int(282 * SCALE_X), int(352 * SCALE_Y)), COLORS['black'], -1)
+        cv2.rectangle(self.image, L.lower_casing[:2], 
+                     L.lower_casing[2:], COLORS['blue'], -1)
+        cv2.rectangle(self.image, L.lower_bezel[:2], 
+                     L.lower_bezel[2:], COLORS['black'], -1)
 
         if self.game_running:
             self.draw_game_screen()
@@ -102,67 +105,59 @@ class Nintendo3DSEmulator:
 
     def draw_game_screen(self):
         """Dibuja la pantalla cuando un juego está en ejecución."""
-        cv2.rectangle(self.image, (int(125 * SCALE_X), int(225 * SCALE_Y)), 
-                     (int(275 * SCALE_X), int(345 * SCALE_Y)), COLORS['black'], -1)
+        L = self.layout
+        cv2.rectangle(self.image, L.lower_display[:2], 
+                     L.lower_display[2:], COLORS['black'], -1)
         
         # Botón de salir
-        button_width = int(80 * SCALE_X)
-        button_height = int(25 * SCALE_Y)
-        button_x = int(200 * SCALE_X - button_width // 2)
-        button_y = int(285 * SCALE_Y - button_height // 2)
-        
-        cv2.rectangle(self.image, (button_x, button_y), 
-                     (button_x + button_width, button_y + button_height), 
+        cv2.rectangle(self.image, L.exit_button[:2], 
+                     L.exit_button[2:], 
                      COLORS['red'], 1)
         
         cv2.putText(self.image, 'Q = SALIR', 
-                    (button_x + int(10 * SCALE_X), button_y + int(17 * SCALE_Y)), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.4 * SCALE_X, COLORS['red'], 1, 
+                    L.exit_text, 
+                    cv2.FONT_HERSHEY_SIMPLEX, L.font(0.4), COLORS['red'], 1, 
                     cv2.LINE_AA)
 
     def draw_menu_screen(self):
         """Dibuja la pantalla del menú de juegos."""
-        cv2.rectangle(self.image, (int(125 * SCALE_X), int(225 * SCALE_Y)), 
-                     (int(275 * SCALE_X), int(345 * SCALE_Y)), COLORS['white'], -1)
+        L = self.layout
+        cv2.rectangle(self.image, L.lower_display[:2], 
+                     L.lower_display[2:], COLORS['white'], -1)
         
-        start_y = int(245 * SCALE_Y)
+        start_y = L.y(245)
         for i in range(min(MAX_VISIBLE_ITEMS, len(self.games))):
             game_index = i + self.scroll_offset
             if game_index < len(self.games):
                 if game_index == self.selected_game:
-                    cv2.rectangle(self.image, (int(130 * SCALE_X), start_y + i * 20), 
-                                (int(270 * SCALE_X), start_y + (i + 1) * 20), 
+                    cv2.rectangle(self.image, (L.x(130), start_y + i * 20), 
+                                (L.x(270), start_y + (i + 1) * 20), 
                                 COLORS['dark_blue'], -1)
                 cv2.putText(self.image, self.games[game_index], 
-                           (int(135 * SCALE_X), start_y + i * 20 + 15), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.4 * SCALE_X, 
+                           (L.x(135), start_y + i * 20 + 15), 
+                           cv2.FONT_HERSHEY_SIMPLEX, L.font(0.4), 
                            COLORS['black'] if game_index == self.selected_game else COLORS['light_blue'], 
                            1, cv2.LINE_AA)
 
         # Flechas de scroll
         if self.scroll_offset > 0:
-            cv2.putText(self.image, '▲', (int(200 * SCALE_X), int(230 * SCALE_Y)), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.4 * SCALE_X, COLORS['light_blue'], 
+            cv2.putText(self.image, '▲', L.point(200, 230), 
+                       cv2.FONT_HERSHEY_SIMPLEX, L.font(0.4), COLORS['light_blue'], 
                        1, cv2.LINE_AA)
         if self.scroll_offset + MAX_VISIBLE_ITEMS < len(self.games):
-            cv2.putText(self.image, '▼', (int(200 * SCALE_X), int(340 * SCALE_Y)), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.4 * SCALE_X, COLORS['light_blue'], 
+            cv2.putText(self.image, '▼', L.point(200, 340), 
+                       cv2.FONT_HERSHEY_SIMPLEX, L.font(0.4), COLORS['light_blue'], 
                        1, cv2.LINE_AA)
 
     def draw_controls(self):
         """Dibuja los controles de la consola."""
+        L = self.layout
         # Circle Pad
-        cv2.circle(self.image, (int(81 * SCALE_X), int(260 * SCALE_Y)), 
-                  int(18 * SCALE_X), COLORS['light_blue'], -1)
+        cv2.circle(self.image, L.circle_pad, 
+                  L.circle_pad_radius, COLORS['light_blue'], -1)
 
         # D-Pad
-        dpad_points = np.array([
-            [65, 307], [75, 307], [75, 297], [85, 297], [85, 307],
-            [95, 307], [95, 317], [85, 317], [85, 327], [75, 327],
-            [75, 317], [65, 317]
-        ], np.int32)
-        dpad_points = np.array([[int(x * SCALE_X), int(y * SCALE_Y)] for x, y in dpad_points])
-        cv2.fillPoly(self.image, [dpad_points], COLORS['light_blue'])
+        cv2.fillPoly(self.image, [L.dpad], COLORS['light_blue'])
 
         # Botones A B X Y
         self.draw_action_buttons()
@@ -172,50 +167,44 @@ class Nintendo3DSEmulator:
 
     def draw_action_buttons(self):
         """Dibuja los botones de acción (A, B, X, Y)."""
-        offset_x = 25
-        for (x, y, letter) in [(290, 273, 'X'), (270, 293, 'Y'), 
-                              (310, 293, 'A'), (290, 313, 'B')]:
-            cv2.circle(self.image, (int((x + offset_x) * SCALE_X), int(y * SCALE_Y)), 
-                      int(8 * SCALE_X), COLORS['light_blue'], -1)
+        L = self.layout
+        for center, letter in L.action_buttons:
+            cv2.circle(self.image, center, 
+                      L.action_button_radius, COLORS['light_blue'], -1)
             cv2.putText(self.image, letter, 
-                       (int((x + offset_x - 5) * SCALE_X), int((y + 4) * SCALE_Y)), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.3 * SCALE_X, COLORS['black'], 
+                       (center[0] - L.w(5), center[1] + L.h(4)), 
+                       cv2.FONT_HERSHEY_SIMPLEX, L.font(0.3), COLORS['black'], 
                        1, cv2.LINE_AA)
 
     def draw_system_buttons(self):
         """Dibuja los botones del sistema (Select, Start, Power)."""
+        L = self.layout
         # Select
-        cv2.rectangle(self.image, (int(160 * SCALE_X), int(360 * SCALE_Y)), 
-                     (int(180 * SCALE_X), int(368 * SCALE_Y)), COLORS['light_blue'], -1)
-        cv2.putText(self.image, 'SELECT', (int(162 * SCALE_X), int(366 * SCALE_Y)), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.2 * SCALE_X, COLORS['dark_text'], 
+        cv2.rectangle(self.image, L.point(160, 360), 
+                     L.point(180, 368), COLORS['light_blue'], -1)
+        cv2.putText(self.image, 'SELECT', L.point(162, 366), 
+                    cv2.FONT_HERSHEY_SIMPLEX, L.font(0.2), COLORS['dark_text'], 
                     1, cv2.LINE_AA)
 
         # Start
-        cv2.rectangle(self.image, (int(200 * SCALE_X), int(360 * SCALE_Y)), 
-                     (int(220 * SCALE_X), int(368 * SCALE_Y)), COLORS['light_blue'], -1)
-        cv2.putText(self.image, 'START', (int(202 * SCALE_X), int(366 * SCALE_Y)), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.2 * SCALE_X, COLORS['dark_text'], 
+        cv2.rectangle(self.image, L.point(200, 360), 
+                     L.point(220, 368), COLORS['light_blue'], -1)
+        cv2.putText(self.image, 'START', L.point(202, 366), 
+                    cv2.FONT_HERSHEY_SIMPLEX, L.font(0.2), COLORS['dark_text'], 
                     1, cv2.LINE_AA)
 
         # Power
-        cv2.rectangle(self.image, (int(290 * SCALE_X), int(360 * SCALE_Y)), 
-                     (int(305 * SCALE_X), int(375 * SCALE_Y)), COLORS['dark_text'], -1)
-        cv2.putText(self.image, 'o', (int(292 * SCALE_X), int(370 * SCALE_Y)), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.3 * SCALE_X, COLORS['white'], 
+        cv2.rectangle(self.image, L.power_switch[:2], 
+                     L.power_switch[2:], COLORS['dark_text'], -1)
+        cv2.putText(self.image, 'o', L.point(292, 370), 
+                    cv2.FONT_HERSHEY_SIMPLEX, L.font(0.3), COLORS['white'], 
                     1, cv2.LINE_AA)
 
     def handle_mouse_click(self, event, x, y, flags, param):
         """Maneja los clics del mouse."""
         if event == cv2.EVENT_LBUTTONDOWN:
             # Verificar clic en botón de apagado
-            power_button_x1 = int(290 * SCALE_X)
-            power_button_y1 = int(360 * SCALE_Y)
-            power_button_x2 = int(305 * SCALE_X)
-            power_button_y2 = int(375 * SCALE_Y)
-            
-            if (power_button_x1 <= x <= power_button_x2 and 
-                power_button_y1 <= y <= power_button_y2):
+            if self.layout.contains(self.layout.power_switch, x, y):
                 self.running = False
 
     def handle_key(self, key):
@@ -275,59 +264,54 @@ class Nintendo3DSEmulator:
 
     def draw_upper_screen(self):
         """Dibuja la pantalla superior de la consola."""
+        L = self.layout
         # Carcasa superior
-        cv2.rectangle(self.image, (int(50 * SCALE_X), int(20 * SCALE_Y)), 
-                     (int(350 * SCALE_X), int(200 * SCALE_Y)), COLORS['blue'], -1)
-        cv2.rectangle(self.image, (int(60 * SCALE_X), int(30 * SCALE_Y)), 
-                     (int(340 * SCALE_X), int(190 * SCALE_Y)), COLORS['black'], -1)
-        cv2.rectangle(self.image, (int(70 * SCALE_X), int(40 * SCALE_Y)), 
-                     (int(330 * SCALE_X), int(180 * SCALE_Y)), COLORS['dark_gray'], -1)
+        cv2.rectangle(self.image, L.upper_casing[:2], 
+                     L.upper_casing[2:], COLORS['blue'], -1)
+        cv2.rectangle(self.image, L.upper_bezel[:2], 
+                     L.upper_bezel[2:], COLORS['black'], -1)
+        x1, y1, x2, y2 = L.upper_display
+        cv2.rectangle(self.image, (x1, y1), 
+                     (x2, y2), COLORS['dark_gray'], -1)
 
         # Dibujar frame del juego si está en ejecución
         if self.game_running and self.current_game_module:
             try:
                 upper_frame, _ = self.get_game_frames()
                 if upper_frame is not None:
-                    game_frame_resized = cv2.resize(upper_frame, (int(260 * SCALE_X), int(140 * SCALE_Y)))
-                    self.image[int(40 * SCALE_Y):int(180 * SCALE_Y), 
-                             int(70 * SCALE_X):int(330 * SCALE_X)] = game_frame_resized
+                    game_frame_resized = cv2.resize(upper_frame, (x2 - x1, y2 - y1))
+                    self.image[y1:y2, x1:x2] = game_frame_resized
             except Exception as e:
                 print(f"Error al actualizar el frame superior: {e}")
     
 
     def draw_game_screen(self):
         """Dibuja la pantalla cuando un juego está en ejecución."""
-        cv2.rectangle(self.image, (int(125 * SCALE_X), int(225 * SCALE_Y)), 
-                     (int(275 * SCALE_X), int(345 * SCALE_Y)), COLORS['black'], -1)
+        L = self.layout
+        cv2.rectangle(self.image, L.lower_display[:2], 
+                     L.lower_display[2:], COLORS['black'], -1)
         
         if self.game_running and self.current_game_module:
             if self.is_dual_screen:
                 try:
                     _, lower_frame = self.get_game_frames()
                     if lower_frame is not None:
-                        game_frame_resized = cv2.resize(lower_frame, 
-                                                      (int(150 * SCALE_X), int(120 * SCALE_Y)))
                         # Calculamos la posición para centrar el frame
-                        frame_x = int(125 * SCALE_X)
-                        frame_y = int(225 * SCALE_Y)
-                        self.image[frame_y:frame_y + int(120 * SCALE_Y), 
-                                 frame_x:frame_x + int(150 * SCALE_X)] = game_frame_resized
+                        frame_x, frame_y, frame_w, frame_h = L.lower_viewport
+                        game_frame_resized = cv2.resize(lower_frame, (frame_w, frame_h))
+                        self.image[frame_y:frame_y + frame_h, 
+                                 frame_x:frame_x + frame_w] = game_frame_resized
                 except Exception as e:
                     print(f"Error al actualizar el frame inferior: {e}")
             else:
                 # Solo mostramos el botón de salir si el juego usa una pantalla
-                button_width = int(80 * SCALE_X)
-                button_height = int(25 * SCALE_Y)
-                button_x = int(200 * SCALE_X - button_width // 2)
-                button_y = int(285 * SCALE_Y - button_height // 2)
-                
-                cv2.rectangle(self.image, (button_x, button_y), 
-                            (button_x + button_width, button_y + button_height), 
+                cv2.rectangle(self.image, L.exit_button[:2], 
+                            L.exit_button[2:], 
                             COLORS['red'], 1)
                 
                 cv2.putText(self.image, 'Q = SALIR', 
-                           (button_x + int(10 * SCALE_X), button_y + int(17 * SCALE_Y)), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.4 * SCALE_X, COLORS['red'], 1, 
+                           L.exit_text, 
+                           cv2.FONT_HERSHEY_SIMPLEX, L.font(0.4), COLORS['red'], 1, 
                            cv2.LINE_AA)
 
     def run(self):
@@ -0,0 +1,357 @@
+import math
+
+import cv2
+import numpy as np
+
+
+def _column(name, doc):
+    def get(self):
+        return self._data[name][:self.count]
+
+    def set(self, value):
+        self._data[name][:self.count] = value
+
+    return property(get, set, doc=doc)
+
+
+class Particles:
+    """Partículas de un efecto guardadas como estructura de arrays.
+
+    Cada propiedad es un array de NumPy con una fila por partícula viva, así
+    que mover o transformar todas las partículas es una operación vectorizada
+    en vez de un bucle de Python sobre un dict por partícula. Los arrays se
+    reservan con holgura y doblan su tamaño cuando no caben más.
+    """
+
+    COLUMNS = (('pos', 2), ('vel', 2), ('size', 1), ('lifetime', 1), ('age', 1),
+               ('angle', 1), ('phase', 1), ('frequency', 1), ('color', 1))
+
+    pos = _column('pos', "Posición (x, y) en píxeles")
+    vel = _column('vel', "Velocidad (x, y) en píxeles por frame")
+    size = _column('size', "Tamaño base")
+    lifetime = _column('lifetime', "Vida total")
+    age = _column('age', "Tiempo vivido")
+    angle = _column('angle', "Ángulo inicial en radianes")
+    phase = _column('phase', "Desfase de oscilaciones")
+    frequency = _column('frequency', "Frecuencia de oscilaciones")
+    color = _column('color', "Índice en la paleta del efecto")
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self._data = {name: np.zeros((capacity, width) if width > 1 else capacity)
+                      for name, width in self.COLUMNS}
+
+    def __len__(self):
+        return self.count
+
+    def emit(self, count, **values):
+        """Añade `count` partículas. Cada valor es un escalar o un array por partícula; el resto vale 0."""
+        unknown = set(values) - set(self._data)
+        if unknown:
+            raise TypeError(f"Propiedades desconocidas: {', '.join(sorted(unknown))}")
+        start, end = self.count, self.count + count
+        capacity = len(self._data['pos'])
+        if end > capacity:
+            capacity = max(end, capacity * 2)
+            for name, column in self._data.items():
+                grown = np.zeros((capacity,) + column.shape[1:])
+                grown[:start] = column[:start]
+                self._data[name] = grown
+        for name, column in self._data.items():
+            column[start:end] = values.get(name, 0)
+        self.count = end
+        return slice(start, end)
+
+    def keep(self, alive):
+        """Se queda solo con las partículas marcadas en `alive` (array bool), en el mismo orden."""
+        alive = np.asarray(alive, dtype=bool)
+        count = int(alive.sum())
+        if count == self.count:
+            return
+        for column in self._data.values():
+            column[:count] = column[:self.count][alive]
+        self.count = count
+
+    def clear(self):
+        self.count = 0
+
+
+class Emitter:
+    """Cómo nacen las partículas de un efecto.
+
+    `burst` partículas al empezar y `rate` nuevas en cada frame, todas en el
+    origen y lanzadas hacia el objetivo: velocidad entre `speed`, desviada
+    hasta `cone` radianes y con un ruido de ±`spread` por eje. Con
+    `slowdown` la velocidad de salida baja con el progreso del efecto.
+    """
+
+    def __init__(self, burst=0, rate=0, size=(3, 8), lifetime=(0.7, 1.2), speed=(12.0, 15.0),
+                 spread=3.0, cone=0.0, frequency=(0.0, 0.0), slowdown=False):
+        self.burst = burst
+        self.rate = rate
+        self.size = size  # Enteros, ambos incluidos
+        self.lifetime = lifetime
+        self.speed = speed
+        self.spread = spread
+        self.cone = cone
+        self.frequency = frequency
+        self.slowdown = slowdown
+
+    def emit(self, particles, count, origin, target, progress=0.0):
+        if count <= 0:
+            return
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(target, dtype=np.float64) - origin
+        length = math.hypot(direction[0], direction[1])
+        if length > 0:
+            direction = direction / length
+            if self.cone:
+                theta = np.random.uniform(-self.cone, self.cone, count)
+                cos, sin = np.cos(theta), np.sin(theta)
+                heading = np.stack([direction[0] * cos - direction[1] * sin,
+                                    direction[0] * sin + direction[1] * cos], axis=1)
+            else:
+                heading = np.broadcast_to(direction, (count, 2))
+            speed = np.random.uniform(*self.speed, count)
+            if self.slowdown:
+                speed *= 1 - progress
+            velocity = heading * speed[:, None] + np.random.uniform(-self.spread, self.spread, (count, 2))
+        else:
+            velocity = np.random.uniform(-6, 6, (count, 2))
+        particles.emit(
+            count,
+            pos=origin,
+            vel=velocity,
+            size=np.random.randint(self.size[0], self.size[1] + 1, count),
+            lifetime=np.random.uniform(*self.lifetime, count),
+            angle=np.random.uniform(0, 2 * math.pi, count),
+            phase=np.random.uniform(0, 2 * math.pi, count),
+            frequency=np.random.uniform(*self.frequency, count),
+        )
+
+
+class ParticleEffect:
+    """Declaración de las partículas de un efecto: emisores y comportamiento.
+
+    `behaviour(frame, particles, progress, context)` mueve y dibuja todas las
+    partículas de una vez; `context` es quien lanza el efecto (p. ej. la
+    animación, con sus posiciones). `density` multiplica el número de
+    partículas de todos los emisores.
+    """
+
+    def __init__(self, emitters=(), behaviour=None):
+        self.emitters = tuple(emitters)
+        self.behaviour = behaviour
+
+    def start(self, particles, origin, target, density=1.0):
+        for emitter in self.emitters:
+            emitter.emit(particles, round(emitter.burst * density), origin, target)
+
+    def step(self, frame, particles, progress, origin, target, context=None, density=1.0):
+        for emitter in self.emitters:
+            emitter.emit(particles, round(emitter.rate * density), origin, target, progress)
+        if self.behaviour is not None:
+            self.behaviour(frame, particles, progress, context)
+
+
+def inside(frame, points, margin):
+    """Máscara de los puntos a menos de `margin` píxeles de la imagen."""
+    height, width = frame.shape[:2]
+    return ((points[:, 0] > -margin) & (points[:, 0] < width + margin) &
+            (points[:, 1] > -margin) & (points[:, 1] < height + margin))
+
+
+def orbit_points(center, radius, angles):
+    """Puntos enteros a `radius` (escalar o por partícula) de `center` en los ángulos dados."""
+    return np.stack([center[0] + radius * np.cos(angles),
+                     center[1] + radius * np.sin(angles)], axis=1).astype(int)
+
+
+def draw_circles(frame, points, radii, color, thickness=-1):
+    """Círculos en `points` (enteros, N x 2); `color` es uno o un array N x 3.
+
+    Las cuentas ya vienen hechas en arrays: el bucle solo llama a cv2. Se
+    saltan los radios <= 0.
+    """
+    radii = np.broadcast_to(radii, (len(points),))
+    visible = radii > 0
+    xs = points[visible, 0].tolist()
+    ys = points[visible, 1].tolist()
+    radii = radii[visible].tolist()
+    if np.ndim(color) == 2:
+        for x, y, radius, c in zip(xs, ys, radii, np.asarray(color)[visible].tolist()):
+            cv2.circle(frame, (x, y), radius, c, thickness)
+    else:
+        for x, y, radius in zip(xs, ys, radii):
+            cv2.circle(frame, (x, y), radius, color, thickness)
+
+
+def draw_segments(frame, starts, ends, color, thickness=1):
+    """Muchos segmentos (N x 2 cada extremo) con una sola llamada a cv2.polylines."""
+    if len(starts):
+        lines = np.stack([starts, ends], axis=1).astype(np.int32)
+        cv2.polylines(frame, lines, False, color, thickness)
+
+
+def scatter(points, chance, spread):
+    """Puntos alrededor de una parte al azar (`chance`) de `points`.
+
+    `spread` es el desplazamiento máximo, escalar o por partícula.
+    """
+    picked = np.random.random(len(points)) < chance
+    count = int(picked.sum())
+    spread = np.broadcast_to(spread, (len(points),))[picked]
+    offsets = (np.random.uniform(-1.0, 1.0, (count, 2)) * spread[:, None]).astype(int)
+    return points[picked] + offsets
+
+
+def draw_sparks(frame, points, chance, spread, radius, color):
+    """Chispas alrededor de una parte al azar (`chance`) de las partículas.
+
+    `spread` es el desplazamiento máximo (escalar o por partícula) y `radius`
+    un radio fijo o un rango (mín, máx) entero.
+    """
+    sparks = scatter(points, chance, spread)
+    if not len(sparks):
+        return
+    if isinstance(radius, tuple):
+        radius = np.random.randint(radius[0], radius[1] + 1, len(sparks))
+    draw_circles(frame, sparks, radius, color)
+
+
+SPLAT_LEVELS = 5  # Manchas de hasta 2**5 = 32 píxeles de radio
+_STAMP = np.arange(-1, 3)  # Ventana de 4 x 4 píxeles del sello en su nivel
+_MIN_SIGMA2 = 0.15  # Varianza mínima del sello en su nivel (en píxeles del nivel)
+
+
+class SplatBuffer:
+    """Manchas radiales suaves (brillos, gotas, polvo) mezcladas de una vez.
+
+    En vez de un cv2.circle por partícula, `add` encola manchas y `composite`
+    las acumula en un buffer float32 con el color ya multiplicado por la
+    opacidad (y la opacidad sola en un cuarto canal). Cada mancha es una
+    gaussiana que se pinta con un sello de 4 x 4 píxeles en el nivel de
+    resolución que toca a su radio; los niveles se suman ampliándolos con
+    cv2.pyrUp, que suaviza, y el sello ya descuenta ese suavizado. Así una
+    mancha grande cuesta lo mismo que una pequeña. El resultado se mezcla
+    sobre el rectángulo que ocupan las manchas sumando la luz (`additive`) o
+    con su alfa, cosa que cv2.circle no hace: ignora el cuarto valor de los
+    colores.
+    """
+
+    def __init__(self, levels=SPLAT_LEVELS):
+        self.levels = levels
+        self._batches = []  # (puntos, radios, colores, opacidades)
+
+    def __len__(self):
+        return sum(len(batch[0]) for batch in self._batches)
+
+    def add(self, points, radii, color, opacity=1.0):
+        """Encola manchas en `points` (N x 2) de `radii` píxeles; `color` BGR es uno o N x 3, `opacity` de 0 a 1.
+
+        El radio es donde el brillo baja al 13 % del centro (dos desviaciones).
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        count = len(points)
+        radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), (count,))
+        opacity = np.broadcast_to(np.asarray(opacity, dtype=np.float64), (count,))
+        visible = (radii > 0) & (opacity > 0)
+        if not visible.any():
+            return
+        colors = np.broadcast_to(np.asarray(color, dtype=np.float64), (count, 3))
+        radii = np.clip(radii[visible], 1.0, 2 ** self.levels)
+        self._batches.append((points[visible], radii, colors[visible], opacity[visible]))
+
+    def clear(self):
+        self._batches.clear()
+
+    def composite(self, frame, additive=False):
+        """Mezcla las manchas encoladas sobre `frame` y vacía la cola."""
+        if not self._batches:
+            return
+        points, radii, colors, opacity = (np.concatenate(column) for column in zip(*self._batches))
+        self._batches.clear()
+
+        # Rectángulo que ocupan, alineado al nivel más grueso para que cada nivel sea la mitad exacta
+        height, width = frame.shape[:2]
+        cell = 2 ** (self.levels - 1)
+        low = np.floor((points - 2 * radii[:, None]).min(axis=0)).astype(int)
+        high = np.ceil((points + 2 * radii[:, None]).max(axis=0)).astype(int) + 1
+        x0, y0 = max(low[0], 0) // cell * cell, max(low[1], 0) // cell * cell
+        x1, y1 = min(high[0], width), min(high[1], height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        w, h = -(-(x1 - x0) // cell) * cell, -(-(y1 - y0) // cell) * cell
+        points = points - (x0, y0)
+
+        # Nivel de cada mancha: el más grueso en el que su sello aún tiene varianza suficiente
+        variance = (radii / 2) ** 2
+        level = np.floor(np.log(variance / (_MIN_SIGMA2 + 1 / 3)) / math.log(4))
+        level = np.clip(level, 0, self.levels - 1).astype(int)
+
+        # Todos los niveles van seguidos en un mismo buffer: un único bincount los rellena
+        channels = 3 if additive else 4
+        shapes = [(h >> l, w >> l, channels) for l in range(self.levels)]
+        starts = np.cumsum([0] + [math.prod(shape) for shape in shapes])
+        levels = _stamp(points, variance, level, colors, opacity, shapes, starts)
+
+        buffer = None
+        for l in range(self.levels - 1, -1, -1):
+            if buffer is not None:
+                buffer = cv2.pyrUp(buffer, dstsize=shapes[l][1::-1])
+                buffer += levels[starts[l]:starts[l + 1]].reshape(shapes[l])
+            elif (level == l).any():
+                buffer = levels[starts[l]:starts[l + 1]].reshape(shapes[l])
+
+        roi = frame[y0:y1, x0:x1]
+        buffer = buffer[:y1 - y0, :x1 - x0]
+        if additive:
+            cv2.add(roi, np.ascontiguousarray(buffer), dst=roi, dtype=cv2.CV_8U)
+            return
+        # Encima con alfa: fondo * (1 - cobertura) + color medio * cobertura, con la cobertura hasta 1
+        coverage = buffer[..., 3:]
+        color = buffer[..., :3] / np.maximum(coverage, 1.0)
+        color += roi * (1.0 - np.minimum(coverage, 1.0))
+        np.copyto(roi, cv2.convertScaleAbs(color))
+
+
+def _stamp(points, variance, level, colors, opacity, shapes, starts):
+    """Buffers float32 de todos los niveles, seguidos, con el sello gaussiano de cada mancha.
+
+    Cada cv2.pyrUp suaviza con una gaussiana de un píxel del nivel al que
+    amplía, así que el sello de una mancha en el nivel `l` lleva la varianza
+    que le falta tras los `l` suavizados. Se normaliza para que el centro
+    valga la opacidad caiga donde caiga entre píxeles. Los canales son el
+    color por la opacidad y, si hay cuatro, la opacidad sola.
+    """
+    scale = (1 << level).astype(np.float64)
+    area = scale ** 2
+    level_points = points / scale[:, None]  # cv2.pyrUp lleva el píxel i del nivel al 2i del siguiente
+    level_variance = (variance - (area - 1) / 3) / area
+    base = np.floor(level_points).astype(np.intp)
+    dx = np.square(_STAMP - (level_points[:, :1] - base[:, :1]))  # N x 4
+    dy = np.square(_STAMP - (level_points[:, 1:] - base[:, 1:]))
+    spread = -0.5 / level_variance[:, None]
+    weight = np.exp(dy * spread)[:, :, None] * np.exp(dx * spread)[:, None, :]  # Separable: N x 4 x 4
+    weight *= (opacity * 2 * math.pi * variance / area / weight.sum(axis=(1, 2)))[:, None, None]
+
+    # Los píxeles del sello que caen fuera del nivel no pesan (se llevan al borde con peso 0)
+    height = np.array([shape[0] for shape in shapes])[level][:, None]
+    width = np.array([shape[1] for shape in shapes])[level][:, None]
+    xs = base[:, :1] + _STAMP
+    ys = base[:, 1:] + _STAMP
+    weight *= ((xs >= 0) & (xs < width))[:, None, :]
+    weight *= ((ys >= 0) & (ys < height))[:, :, None]
+    np.clip(xs, 0, width - 1, out=xs)
+    np.clip(ys, 0, height - 1, out=ys)
+
+    # Índice en el buffer: inicio del nivel + píxel * canales + canal
+    channels = shapes[0][2]
+    pixel = (ys * width)[:, :, None] + xs[:, None, :]
+    pixel = pixel * channels + starts[level][:, None, None]
+    values = np.empty(weight.shape + (channels,))
+    np.multiply(weight[..., None], colors[:, None, None], out=values[..., :3])
+    if channels == 4:
+        values[..., 3] = weight
+    index = pixel[..., None] + np.arange(channels)
+    return np.bincount(index.ravel(), values.ravel(), starts[-1]).astype(np.float32)
@@ -0,0 +1,128 @@
+import threading
+import time
+
+
+class PrefetchJob:
+    """Precarga de un juego en un hilo: importación (o reinicio) y `prepare()`.
+
+    Un hilo no se puede interrumpir, así que la cancelación es cooperativa: el
+    hilo la comprueba entre etapas y, si llega tarde, su resultado se descarta.
+    """
+
+    def __init__(self, registry, name, lock):
+        self.registry = registry
+        self.name = name
+        self.module = None  # Módulo listo para jugar (solo si terminó sin cancelarse)
+        self.ms = None  # Duración de la precarga
+        self._lock = lock  # Compartido entre trabajos: nunca se preparan dos a la vez
+        self._cancelled = threading.Event()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"precarga-{name}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Espera a que termine. Devuelve el módulo preparado o None."""
+        self._done.wait(timeout)
+        return self.module if self.done and not self.cancelled else None
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            with self._lock:
+                if self.cancelled:
+                    return
+                module = self.registry.load(self.name)  # Importa o reinicia la partida
+                if module is None or self.cancelled:
+                    return
+                # Crear la partida y cargar sus recursos antes de que se pulse Enter
+                if hasattr(module, 'prepare'):
+                    module.prepare()
+                if not self.cancelled:
+                    self.module = module
+                    self.ms = (time.perf_counter() - start) * 1000
+        except Exception as e:
+            print(f"Error al precargar {self.name}: {e}")
+        finally:
+            self._done.set()
+
+
+class GamePrefetcher:
+    """Precarga en segundo plano el juego seleccionado en el menú.
+
+    Cuando la selección lleva `delay` segundos quieta se lanza un PrefetchJob;
+    si cambia antes de que termine, se cancela. Así el scroll rápido no
+    importa todos los juegos por los que pasa. Al pulsar Enter, `take()`
+    entrega el módulo ya preparado y la partida empieza sin esperar al disco.
+    """
+
+    def __init__(self, registry, delay=0.15):
+        self.registry = registry
+        self.delay = delay
+        self._name = None  # Juego seleccionado
+        self._since = 0.0  # Instante en que se seleccionó
+        self._job = None
+        self._lock = threading.Lock()
+
+    def update(self, name, now=None):
+        """Informa del juego seleccionado. Se llama en cada frame del menú."""
+        now = time.monotonic() if now is None else now
+        if name != self._name:
+            self.cancel()
+            self._name, self._since = name, now
+        elif name is not None and self._job is None and now - self._since >= self.delay:
+            self._job = PrefetchJob(self.registry, name, self._lock).start()
+
+    def ready(self, name):
+        """Indica si `name` ya está preparado."""
+        job = self._job
+        return job is not None and job.name == name and job.module is not None
+
+    def take(self, name):
+        """Módulo preparado de `name` o None si no se estaba precargando.
+
+        Si la precarga de ese juego está a medias se espera a que acabe: va
+        por delante de una carga que empezara ahora.
+        """
+        job, self._job = self._job, None
+        self._name = None  # Al volver al menú se precargará de nuevo
+        if job is None:
+            return None
+        if job.name != name:
+            job.cancel()
+            return None
+        return job.wait()
+
+    def load(self, name):
+        """Módulo de `name` listo para jugar: el precargado o uno cargado ahora.
+
+        La carga se hace con el cerrojo de las precargas: un trabajo cancelado
+        puede seguir preparando ese mismo módulo en su hilo, y reiniciarlo a la
+        vez desde la consola mezclaría las dos partidas.
+        """
+        module = self.take(name)
+        with self._lock:
+            if module is not None:
+                # load() sin reiniciar solo devuelve otro módulo si el archivo
+                # cambió después de precargarlo
+                return self.registry.load(name, fresh=False) or module
+            return self.registry.load(name)
+
+    def cancel(self):
+        """Cancela la precarga en curso."""
+        if self._job is not None:
+            self._job.cancel()
+            self._job = None
@@ -0,0 +1,99 @@
+import os
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+def capture_path(directory, prefix, extension):
+    """Ruta con marca de tiempo dentro de `directory` que no pisa ningún archivo."""
+    os.makedirs(directory, exist_ok=True)
+    stem = os.path.join(directory, f"{prefix}-{time.strftime('%Y%m%d-%H%M%S')}")
+    path, n = f"{stem}.{extension}", 1
+    while os.path.exists(path):
+        path, n = f"{stem}-{n}.{extension}", n + 1
+    return path
+
+
+def save_screenshot(image, path):
+    """Guarda una copia de `image` en PNG desde un hilo aparte (no frena el bucle)."""
+    frame = image.copy()
+    thread = threading.Thread(target=cv2.imwrite, args=(path, frame), daemon=True)
+    thread.start()
+    return thread
+
+
+class VideoRecorder:
+    """Graba frames en vídeo con `cv2.VideoWriter` desde un hilo codificador.
+
+    `submit()` solo copia el frame en un buffer libre y lo encola: nunca espera
+    al codificador. Los buffers se reservan al empezar y se reciclan, así que
+    grabar no crea arrays en cada frame. Si la cola está llena el frame se
+    descarta y se cuenta en `dropped`.
+    """
+
+    def __init__(self, path, fps, size, fourcc='mp4v', queue_size=32):
+        self.path = path
+        self.fps = fps
+        self.size = size  # (ancho, alto)
+        self.fourcc = fourcc
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._free = queue.SimpleQueue()
+        for _ in range(queue_size + 1):
+            self._free.put(np.empty((size[1], size[0], 3), dtype=np.uint8))
+        self._writer = None
+        self._thread = None
+
+    def start(self):
+        self._writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*self.fourcc),
+                                       self.fps, self.size)
+        if not self._writer.isOpened():
+            raise IOError(f"No se pudo abrir el vídeo {self.path}")
+        self._thread = threading.Thread(target=self._encode, daemon=True)
+        self._thread.start()
+        return self
+
+    def submit(self, frame):
+        """Encola una copia de `frame` para codificarla. Devuelve False si se descartó."""
+        self.submitted += 1
+        try:
+            buffer = self._free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return False
+        if frame.shape[:2] == buffer.shape[:2]:
+            np.copyto(buffer, frame)
+        else:
+            cv2.resize(frame, self.size, dst=buffer, interpolation=cv2.INTER_AREA)
+        try:
+            self._queue.put_nowait(buffer)
+        except queue.Full:
+            self._free.put(buffer)
+            self.dropped += 1
+            return False
+        return True
+
+    def _encode(self):
+        while True:
+            buffer = self._queue.get()
+            if buffer is None:
+                break
+            self._writer.write(buffer)
+            self.written += 1
+            self._free.put(buffer)
+
+    def stop(self):
+        """Termina de codificar lo pendiente y cierra el archivo."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+        return {'path': self.path, 'frames': self.written, 'dropped': self.dropped}
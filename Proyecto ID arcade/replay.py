@@ -0,0 +1,217 @@
+import argparse
+import hashlib
+import multiprocessing as mp
+import random
+import struct
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from game_registry import GameRegistry
+from input_layer import InputState, dispatch_key
+from scheduler import accepts_dt
+
+# Cabecera: firma, versión, semilla, fps, tick inicial y longitud del nombre del juego
+MAGIC = b'ARPL'
+VERSION = 1
+HEADER = struct.Struct('<4sHIHIH')
+
+# Registros de 4 bytes: tipo, valor y repeticiones
+RECORD = struct.Struct('<BBH')
+FRAME = 0  # valor = pasos fijos del frame, repeticiones = frames seguidos iguales
+KEY = 1  # valor = código de tecla
+
+
+def new_seed():
+    """Semilla aleatoria para una partida que se va a grabar."""
+    return random.SystemRandom().randrange(2 ** 32)
+
+
+def seed_game(seed):
+    """Siembra los generadores que usan los juegos."""
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+class ReplayRecorder:
+    """Graba los frames (con sus pasos fijos) y las teclas entregadas a un juego.
+
+    La consola llama a `frame(steps)` cada vez que pide frames al juego y a
+    `key(code)` cada vez que le entrega una tecla, en el mismo orden en que
+    ocurren. Los frames iguales consecutivos se guardan en un solo registro.
+    El tick inicial del planificador permite reconstruir los mismos instantes
+    con los que la consola calculó las teclas mantenidas.
+    """
+
+    def __init__(self, game, seed, fps, start_tick=0):
+        self.game = game
+        self.seed = seed
+        self.fps = fps
+        self.start_tick = start_tick
+        self.records = []  # [tipo, valor, repeticiones]
+
+    def frame(self, steps=1):
+        last = self.records[-1] if self.records else None
+        if last is not None and last[0] == FRAME and last[1] == steps and last[2] < 0xFFFF:
+            last[2] += 1
+        else:
+            self.records.append([FRAME, steps, 1])
+
+    def key(self, code):
+        self.records.append([KEY, code & 0xFF, 1])
+
+    def save(self, path):
+        name = self.game.encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.seed, self.fps,
+                                self.start_tick, len(name)))
+            f.write(name)
+            for record in self.records:
+                f.write(RECORD.pack(*record))
+
+
+class Replay:
+    """Contenido de un archivo de repetición."""
+
+    def __init__(self, game, seed, fps, start_tick, records):
+        self.game = game
+        self.seed = seed
+        self.fps = fps
+        self.start_tick = start_tick
+        self.records = records
+
+    @property
+    def frame_count(self):
+        return sum(count for kind, _, count in self.records if kind == FRAME)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version, seed, fps, start_tick, name_len = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} no es una repetición válida")
+        offset = HEADER.size
+        game = data[offset:offset + name_len].decode('utf-8')
+        offset += name_len
+        records = [tuple(r) for r in RECORD.iter_unpack(data[offset:])]
+        return cls(game, seed, fps, start_tick, records)
+
+    def frames(self):
+        """Teclas previas al primer frame y lista de (pasos, teclas tras el frame)."""
+        leading, frames = [], []
+        for kind, value, count in self.records:
+            if kind == FRAME:
+                frames.extend((value, []) for _ in range(count))
+            elif frames:
+                frames[-1][1].append(value)
+            else:
+                leading.append(value)
+        return leading, frames
+
+
+class _ScriptedKeys:
+    """Backend mínimo para alimentar InputState con las teclas grabadas."""
+
+    def __init__(self):
+        self.keys = []
+
+    def poll_keys(self):
+        keys, self.keys = self.keys, []
+        return keys
+
+
+def play(replay, games_dir='juegos', on_frame=None):
+    """Reproduce una repetición sin ventana y devuelve el hash de cada frame.
+
+    `on_frame(index, upper, lower)` recibe cada frame si se indica.
+    """
+    seed_game(replay.seed)
+    registry = GameRegistry(games_dir)
+    module = registry.load(replay.game)
+    if module is None:
+        raise ValueError(f"No se pudo cargar {replay.game}")
+
+    dual = hasattr(module, 'get_frames')
+    render = module.get_frames if dual else module.get_frame
+    uses_dt = accepts_dt(render)
+    period = 1.0 / replay.fps
+
+    # Mismo estado de entrada que en la consola, con los mismos instantes
+    state = InputState()
+    keys = _ScriptedKeys()
+    if hasattr(module, 'set_input'):
+        module.set_input(state)
+
+    leading, frames = replay.frames()
+    for key in leading:
+        dispatch_key(module, key)
+
+    hashes = []
+    tick = replay.start_tick
+    for steps, frame_keys in frames:
+        tick += steps
+        result = render(dt=steps * period) if uses_dt else render()
+        upper, lower = result if dual else (result, None)
+        digest = hashlib.blake2b(upper.tobytes(), digest_size=8)
+        if lower is not None:
+            digest.update(lower.tobytes())
+        hashes.append(digest.hexdigest())
+        if on_frame is not None:
+            on_frame(len(hashes) - 1, upper, lower)
+
+        keys.keys = frame_keys
+        state.poll(keys, now=tick * period)
+        for key in frame_keys:
+            dispatch_key(module, key)
+    return hashes
+
+
+def _play_hashes(path, games_dir):
+    return play(Replay.load(path), games_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproduce una partida grabada sin ventana")
+    parser.add_argument('replay', help="archivo .rpl grabado con Main.py --record")
+    parser.add_argument('--games-dir', default='juegos', help="carpeta de juegos")
+    parser.add_argument('--verify', action='store_true',
+                        help="reproducir también en otro proceso y comparar los frames")
+    parser.add_argument('--snapshot', help="guardar el último frame en este PNG")
+    args = parser.parse_args()
+
+    replay = Replay.load(args.replay)
+    last = {}
+
+    def keep_last(index, upper, lower):
+        last['frame'] = upper
+
+    start = time.perf_counter()
+    hashes = play(replay, args.games_dir, keep_last if args.snapshot else None)
+    elapsed = time.perf_counter() - start
+    print(f"{replay.game}: {len(hashes)} frames en {elapsed:.2f} s "
+          f"({len(hashes) / elapsed:.1f} fps), semilla {replay.seed}")
+    print(f"hash final {hashes[-1] if hashes else '-'}")
+
+    if args.snapshot and 'frame' in last:
+        cv2.imwrite(args.snapshot, last['frame'])
+
+    if args.verify:
+        # Un proceso nuevo descarta cualquier estado que haya quedado en este
+        with mp.get_context('spawn').Pool(processes=1) as pool:
+            other = pool.apply(_play_hashes, (args.replay, args.games_dir))
+        for index, (a, b) in enumerate(zip(hashes, other)):
+            if a != b:
+                print(f"DIVERGENCIA en el frame {index}")
+                return 1
+        if len(hashes) != len(other):
+            print("DIVERGENCIA: distinto número de frames")
+            return 1
+        print("Reproducción determinista: frames idénticos")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import inspect
+import time
+
+
+def accepts_dt(func):
+    """Indica si una función del juego acepta el paso de tiempo `dt` de la consola."""
+    try:
+        return 'dt' in inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+class FrameScheduler:
+    """Marca el ritmo del bucle principal a una tasa fija de frames.
+
+    En lugar de girar tan rápido como permita la CPU, `wait()` duerme hasta el
+    siguiente instante programado. Los plazos se encadenan (siguiente = anterior
+    + periodo), así que el retraso de un `sleep` se compensa en el frame
+    siguiente en vez de acumularse.
+
+    Cada llamada devuelve cuántos pasos fijos han transcurrido. Si el bucle va
+    con retraso, los juegos avanzan varios pasos de golpe (hasta `max_catchup`)
+    y el resto se descarta, de modo que el avance es siempre un múltiplo exacto
+    del periodo y la simulación es determinista.
+
+    Con `paced=False` no se duerme nunca: cada llamada avanza un paso fijo,
+    útil para ejecuciones sin ventana que deben ir tan rápido como sea posible.
+    """
+
+    # Margen final que se espera activamente para evitar la imprecisión de sleep()
+    SPIN_MARGIN = 0.001
+
+    def __init__(self, target_fps=60, max_catchup=5, paced=True):
+        self.max_catchup = max_catchup
+        self.paced = paced
+        self.set_target_fps(target_fps)
+        self.tick = 0  # Número total de pasos fijos simulados
+        self.frames_dropped = 0
+        self._next_deadline = None
+
+    def set_target_fps(self, target_fps):
+        """Cambia la tasa objetivo de frames."""
+        self.target_fps = target_fps
+        self.period = 1.0 / target_fps
+
+    def reset(self):
+        """Reinicia los plazos (por ejemplo, al volver de una pausa larga)."""
+        self._next_deadline = None
+
+    def wait(self):
+        """Espera al siguiente frame y devuelve (pasos, dt) a simular."""
+        if not self.paced:
+            self.tick += 1
+            return 1, self.period
+
+        now = time.perf_counter()
+        if self._next_deadline is None:
+            self._next_deadline = now + self.period
+            self.tick += 1
+            return 1, self.period
+
+        remaining = self._next_deadline - now
+        if remaining > self.SPIN_MARGIN:
+            time.sleep(remaining - self.SPIN_MARGIN)
+        while time.perf_counter() < self._next_deadline:
+            pass
+
+        # Pasos completos transcurridos desde el último plazo
+        now = time.perf_counter()
+        steps = 1 + int((now - self._next_deadline) // self.period)
+        if steps > self.max_catchup:
+            # Demasiado retraso: descartar frames y volver a sincronizar
+            self.frames_dropped += steps - self.max_catchup
+            steps = self.max_catchup
+            self._next_deadline = now + self.period
+        else:
+            self._next_deadline += steps * self.period
+
+        self.tick += steps
+        return steps, steps * self.period
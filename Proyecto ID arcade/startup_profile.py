@@ -0,0 +1,148 @@
+import argparse
+import importlib
+import json
+import multiprocessing as mp
+import subprocess
+import sys
+import time
+
+# Este módulo no importa cv2, numpy ni la consola al cargarse: cada medición
+# se hace en un proceso nuevo y tiene que pagar sus importaciones en frío.
+
+
+def import_breakdown(module, top=10):
+    """Módulos que más tardan en importarse al cargar `module` según `python -X importtime`.
+
+    Devuelve [(módulo, ms propios, ms acumulados)] ordenado por tiempo propio.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        try:
+            own, cumulative = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue  # Cabecera de la tabla
+        rows.append((fields[2].strip(), own / 1000, cumulative / 1000))
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return rows[:top]
+
+
+def profile_shell(fps=60):
+    """Importación, construcción y primer frame de la consola en este proceso."""
+    start = time.perf_counter()
+    main = importlib.import_module('Main')
+    imported = time.perf_counter()
+    emulator = main.Nintendo3DSEmulator(fps, paced=False)
+    created = time.perf_counter()
+
+    from backends import HeadlessBackend
+    emulator.run(HeadlessBackend(max_frames=1))
+    first_frame = time.perf_counter()
+    return {
+        'import_ms': (imported - start) * 1000,
+        'init_ms': (created - imported) * 1000,
+        'first_frame_ms': (first_frame - created) * 1000,
+        'total_ms': (first_frame - start) * 1000,
+        'modules': len(sys.modules),
+    }
+
+
+def profile_game(games_dir, name, fps=60):
+    """Importación del juego y sus dos primeros frames en este proceso.
+
+    cv2 y numpy se cargan antes de medir porque en la consola ya están
+    importados: el tiempo de importación es solo el del juego. Los juegos
+    crean su estado (y cargan sus imágenes) en el primer frame, así que ese
+    frame incluye la inicialización de recursos.
+    """
+    import cv2  # noqa: F401
+    import numpy  # noqa: F401
+    from game_registry import GameRegistry
+    from scheduler import accepts_dt
+
+    registry = GameRegistry(games_dir)
+    module = registry.load(name)
+    if module is None:
+        return {'error': 'no se pudo cargar'}
+    render = getattr(module, 'get_frames', getattr(module, 'get_frame', None))
+    if render is None:
+        return {'error': 'no implementa get_frame() ni get_frames()'}
+    kwargs = {'dt': 1.0 / fps} if accepts_dt(render) else {}
+
+    times = []
+    try:
+        for _ in range(2):
+            start = time.perf_counter()
+            render(**kwargs)
+            times.append((time.perf_counter() - start) * 1000)
+    except Exception as e:
+        return {'error': f"{type(e).__name__}: {e}"}
+    return {
+        'import_ms': registry.import_ms(name),
+        'first_frame_ms': times[0],
+        'next_frame_ms': times[1],
+    }
+
+
+def run_profile(games_dir='juegos', fps=60, only=None):
+    """Perfila la consola y cada juego, cada uno en su propio proceso nuevo."""
+    context = mp.get_context('spawn')
+    with context.Pool(processes=1) as pool:
+        shell = pool.apply(profile_shell, (fps,))
+
+    # Los procesos hijos se lanzan con spawn: importar aquí no altera sus medidas
+    from game_registry import GameRegistry
+    games = GameRegistry(games_dir).games
+    if only:
+        games = [g for g in games if g in only or g.rsplit('.', 1)[0] in only]
+
+    results = {}
+    for name in games:
+        with context.Pool(processes=1) as pool:
+            results[name] = pool.apply(profile_game, (games_dir, name, fps))
+    return {'python': sys.version.split()[0], 'shell': shell, 'games': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Tiempo de arranque: importaciones y primer frame de la consola y los juegos")
+    parser.add_argument('--fps', type=int, default=60, help="dt fijo que reciben los juegos")
+    parser.add_argument('--games-dir', default='juegos', help="carpeta de juegos")
+    parser.add_argument('--only', nargs='*', help="juegos a medir (por defecto todos)")
+    parser.add_argument('--top', type=int, default=10,
+                        help="módulos más lentos de importar que se listan (0 = ninguno)")
+    parser.add_argument('--output', help="guardar el informe JSON en este archivo")
+    args = parser.parse_args()
+
+    report = run_profile(args.games_dir, args.fps, args.only)
+    if args.top:
+        report['slowest_imports'] = import_breakdown('Main', args.top)
+
+    shell = report['shell']
+    print(f"{'consola':20s} importar {shell['import_ms']:7.1f} ms  "
+          f"crear {shell['init_ms']:6.1f} ms  primer frame {shell['first_frame_ms']:6.1f} ms  "
+          f"total {shell['total_ms']:7.1f} ms")
+    for name, result in report['games'].items():
+        if 'error' in result:
+            print(f"{name:20s} ERROR {result['error']}")
+        else:
+            print(f"{name:20s} importar {result['import_ms']:7.1f} ms  "
+                  f"primer frame {result['first_frame_ms']:6.1f} ms  "
+                  f"siguiente {result['next_frame_ms']:6.1f} ms")
+    if args.top:
+        print("\nMódulos más lentos de importar (ms propios / acumulados):")
+        for module, own, cumulative in report['slowest_imports']:
+            print(f"  {module:40s} {own:7.1f} {cumulative:8.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+GAMES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Juegos')
+
+# Importa el juego desde su archivo, como hace la consola, pero sin nada más en sys.path
+IMPORT_GAME = """
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location('juego', sys.argv[1])
+spec.loader.exec_module(importlib.util.module_from_spec(spec))
+"""
+
+
+@pytest.mark.parametrize('filename', sorted(f for f in os.listdir(GAMES_DIR) if f.endswith('.py')))
+def test_game_imports_on_its_own(filename):
+    """Cada juego se importa en un intérprete nuevo desde la carpeta de juegos."""
+    result = subprocess.run([sys.executable, '-c', IMPORT_GAME, filename], cwd=GAMES_DIR,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,203 @@
+import argparse
+import hashlib
+import multiprocessing as mp
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+
+THUMBNAIL_DIR = '.miniaturas'  # Dentro de la carpeta de juegos
+THUMBNAIL_SIZE = 128  # Lado de la miniatura; el menú la reduce al tamaño del icono
+RENDER_FRAMES = 120  # Frames que se ejecuta el juego (2 s a 60 fps)
+SAMPLE_EVERY = 10  # Cada cuántos frames se evalúa uno como candidato
+
+
+def content_hash(path):
+    """Hash SHA-1 del contenido de un archivo (las miniaturas se indexan por él)."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def thumbnail_path(games_dir, digest, size=THUMBNAIL_SIZE):
+    """Ruta en la caché de la miniatura de un juego con ese hash."""
+    return os.path.join(games_dir, THUMBNAIL_DIR, f"{digest}-{size}.png")
+
+
+def frame_score(frame):
+    """Cuánto "dice" un frame: desviación típica de su luminancia.
+
+    Las pantallas de carga, los fundidos y los frames en negro puntúan casi
+    cero; una partida en marcha, con sprites y texto, puntúa alto.
+    """
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    return float(cv2.meanStdDev(gray)[1][0][0])
+
+
+def make_icon(frame, size=THUMBNAIL_SIZE):
+    """Recorta el centro cuadrado de `frame` y lo reduce a `size`x`size`."""
+    if frame.ndim == 2:
+        frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+    elif frame.shape[2] == 4:
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+    height, width = frame.shape[:2]
+    side = min(width, height)
+    x, y = (width - side) // 2, (height - side) // 2
+    return cv2.resize(frame[y:y + side, x:x + side], (size, size), interpolation=cv2.INTER_AREA)
+
+
+def render_thumbnail(game_path, out_path, size=THUMBNAIL_SIZE, frames=RENDER_FRAMES, fps=60):
+    """Ejecuta el juego sin ventana y guarda como miniatura su frame más representativo.
+
+    Se llama en un proceso del pool: el juego corre con su propio estado de
+    módulo y no comparte el GIL con la consola. Se evalúa un frame de cada
+    SAMPLE_EVERY de la pantalla superior y se queda el de mayor `frame_score`.
+    """
+    # El juego se importa solo en el proceso que genera la miniatura
+    from game_registry import load_game_module
+    from game_worker import _render
+    from scheduler import accepts_dt
+
+    module = load_game_module(game_path)
+    render_fn = getattr(module, 'get_frames', getattr(module, 'get_frame', None))
+    if render_fn is None:
+        raise AttributeError("El juego debe implementar get_frame() o get_frames()")
+    uses_dt = accepts_dt(render_fn)
+
+    best, best_score = None, -1.0
+    for index in range(frames):
+        upper, _ = _render(module, 1.0 / fps, uses_dt)
+        if upper is None or index % SAMPLE_EVERY != SAMPLE_EVERY - 1:
+            continue
+        score = frame_score(upper)
+        if score > best_score:
+            best, best_score = upper.copy(), score
+    if best is None:
+        raise ValueError("el juego no devolvió ningún frame")
+
+    # Escribir a un temporal y renombrar: el menú nunca lee una imagen a medias
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    temp_path = f"{out_path}.{os.getpid()}.png"
+    if not cv2.imwrite(temp_path, make_icon(best, size)):
+        raise IOError(f"No se pudo guardar {out_path}")
+    os.replace(temp_path, out_path)
+    return out_path
+
+
+class ThumbnailService:
+    """Genera en segundo plano las miniaturas de los juegos sin icono propio.
+
+    Cada miniatura se guarda en disco con el hash del contenido del juego, así
+    que solo se regenera cuando cambia su código y sobrevive a reinicios y
+    renombrados. Los juegos se ejecutan en un pool de procesos que se crea la
+    primera vez que falta alguna miniatura. Como AsyncIconLoader, `get()`
+    nunca espera y `poll()` recoge lo terminado desde el bucle principal.
+    """
+
+    def __init__(self, games_dir, size=THUMBNAIL_SIZE, workers=2):
+        self.games_dir = games_dir
+        self.size = size
+        self.workers = workers
+        self.version = 0  # Aumenta cada vez que termina alguna miniatura
+        self._executor = None
+        self._hashes = {}  # ruta del juego -> (mtime, hash)
+        self._pending = {}  # ruta del juego -> future
+        self._failed = {}  # ruta del juego -> hash con el que falló
+
+    def digest(self, game_path):
+        """Hash del contenido del juego; solo se recalcula si cambia su mtime."""
+        mtime = os.stat(game_path).st_mtime_ns
+        cached = self._hashes.get(game_path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, content_hash(game_path))
+            self._hashes[game_path] = cached
+        return cached[1]
+
+    def get(self, game_path):
+        """Ruta de la miniatura si ya existe; si no, la encarga y devuelve None."""
+        try:
+            digest = self.digest(game_path)
+        except OSError:
+            return None
+        path = thumbnail_path(self.games_dir, digest, self.size)
+        if os.path.exists(path):
+            return path
+        if game_path not in self._pending and self._failed.get(game_path) != digest:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=mp.get_context('spawn'))
+            self._pending[game_path] = self._executor.submit(
+                render_thumbnail, game_path, path, self.size)
+        return None
+
+    def pending(self, game_path):
+        """Indica si la miniatura del juego se está generando."""
+        return game_path in self._pending
+
+    def poll(self):
+        """Recoge las miniaturas terminadas. Devuelve True si terminó alguna."""
+        finished = [path for path, future in self._pending.items() if future.done()]
+        for game_path in finished:
+            future = self._pending.pop(game_path)
+            try:
+                future.result()
+            except Exception as e:
+                print(f"No se pudo generar la miniatura de {os.path.basename(game_path)}: {e}")
+                self._failed[game_path] = self._hashes.get(game_path, (None, None))[1]
+        if finished:
+            self.version += 1
+        return bool(finished)
+
+    def shutdown(self):
+        """Cancela las miniaturas pendientes y cierra el pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._pending.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Genera las miniaturas de los juegos ejecutándolos sin ventana")
+    parser.add_argument('--games-dir', default='juegos', help="carpeta de juegos")
+    parser.add_argument('--only', nargs='*', help="juegos a procesar (por defecto todos)")
+    parser.add_argument('--all', action='store_true',
+                        help="generar también las de los juegos que ya tienen icono propio")
+    parser.add_argument('--size', type=int, default=THUMBNAIL_SIZE, help="lado en píxeles")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2,
+                        help="procesos que generan miniaturas a la vez")
+    args = parser.parse_args()
+
+    from game_registry import GameRegistry
+    registry = GameRegistry(args.games_dir)
+    games = registry.games
+    if args.only:
+        games = [g for g in games if g in args.only or g.rsplit('.', 1)[0] in args.only]
+    if not args.all:
+        games = [g for g in games if not (registry.info(g) and registry.info(g).icon)]
+
+    failed = 0
+    context = mp.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=context) as pool:
+        jobs = {}
+        for name in games:
+            game_path = registry.path(name)
+            path = thumbnail_path(registry.games_dir, content_hash(game_path), args.size)
+            if os.path.exists(path):
+                print(f"{name:20s} en caché  {path}")
+                continue
+            jobs[name] = pool.submit(render_thumbnail, game_path, path, args.size)
+        for name, job in jobs.items():
+            try:
+                print(f"{name:20s} generada  {job.result()}")
+            except Exception as e:
+                print(f"{name:20s} ERROR {type(e).__name__}: {e}")
+                failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
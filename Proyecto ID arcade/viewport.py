@@ -0,0 +1,113 @@
+import time
+
+import cv2
+import numpy as np
+
+# Modos de escalado disponibles
+PIXEL = 'pixel'  # Vecino más cercano a factor entero: bordes nítidos para juegos pixel-art
+PHOTO = 'photo'  # Área al reducir a la mitad o menos, lineal en el resto: cámara, sprites, fotos
+
+
+class ViewportScaler:
+    """Escala frames de un tamaño fijo directamente sobre una región del framebuffer.
+
+    Se construye una vez para un tamaño de origen y un rectángulo de destino;
+    cada frame se escribe con `cv2.resize(..., dst=roi)` sobre la vista de la
+    consola, sin arrays intermedios. En modo PIXEL el frame se escala por el
+    mayor factor entero que cabe y se centra con bandas negras, para que todos
+    los píxeles del juego midan lo mismo; si no cabe ni al doble, las bandas
+    ocuparían casi toda la pantalla y se estira con vecino más cercano.
+    """
+
+    def __init__(self, src_size, dst_rect, mode=PIXEL):
+        self.src_size = src_size  # (ancho, alto) del frame del juego
+        self.dst_rect = dst_rect  # (x, y, ancho, alto) en el framebuffer
+        self.mode = mode
+        self.interpolation = self._pick_interpolation()
+        self.inner_rect = self._pick_inner_rect()  # Zona del frame dentro de la región
+
+    def _pick_inner_rect(self):
+        """(x, y, ancho, alto) del frame escalado, relativo a la región de destino."""
+        src_w, src_h = self.src_size
+        _, _, dst_w, dst_h = self.dst_rect
+        factor = min(dst_w // src_w, dst_h // src_h) if self.mode == PIXEL else 0
+        if factor < 2:
+            return (0, 0, dst_w, dst_h)
+        w, h = src_w * factor, src_h * factor
+        return ((dst_w - w) // 2, (dst_h - h) // 2, w, h)
+
+    def _pick_interpolation(self):
+        """Elige la interpolación según el modo y el sentido del escalado."""
+        src_w, src_h = self.src_size
+        _, _, dst_w, dst_h = self.dst_rect
+        if self.mode == PIXEL:
+            return cv2.INTER_NEAREST
+        # INTER_AREA solo compensa cuando se reduce mucho; con factores pequeños
+        # cuesta varias veces más que la lineal sin mejora visible
+        if dst_w * 2 <= src_w or dst_h * 2 <= src_h:
+            return cv2.INTER_AREA
+        return cv2.INTER_LINEAR
+
+    def matches(self, frame):
+        """Indica si el escalador sirve para frames con la forma de `frame`."""
+        return frame.shape[1] == self.src_size[0] and frame.shape[0] == self.src_size[1]
+
+    def roi(self, image):
+        """Devuelve la vista del framebuffer donde se escribe el frame."""
+        x, y, w, h = self.dst_rect
+        return image[y:y + h, x:x + w]
+
+    def blit(self, frame, image):
+        """Escala `frame` y lo escribe en su región de `image`."""
+        roi = self.roi(image)
+        x, y, w, h = self.inner_rect
+        if (w, h) != (roi.shape[1], roi.shape[0]):
+            # Bandas negras alrededor del frame escalado a factor entero
+            roi[:y] = 0
+            roi[y + h:] = 0
+            roi[y:y + h, :x] = 0
+            roi[y:y + h, x + w:] = 0
+            roi = roi[y:y + h, x:x + w]
+        if frame.shape[:2] == roi.shape[:2]:
+            np.copyto(roi, frame)
+        else:
+            cv2.resize(frame, (roi.shape[1], roi.shape[0]), dst=roi,
+                       interpolation=self.interpolation)
+
+
+def get_scaler(scaler, frame, dst_rect, mode=PIXEL):
+    """Reutiliza `scaler` si sigue siendo válido o construye uno nuevo."""
+    if (scaler is not None and scaler.matches(frame)
+            and scaler.dst_rect == dst_rect and scaler.mode == mode):
+        return scaler
+    return ViewportScaler((frame.shape[1], frame.shape[0]), dst_rect, mode)
+
+
+def benchmark(iterations=500):
+    """Compara el coste de cada modo frente al resize con array intermedio."""
+    image = np.zeros((700, 800, 3), dtype=np.uint8)
+    dst_rect = (150, 78, 500, 227)  # Pantalla superior de Main.py
+    cases = [
+        ('snake 300x150', np.random.randint(0, 255, (150, 300, 3), dtype=np.uint8)),
+        ('pokemon 800x400', np.random.randint(0, 255, (400, 800, 3), dtype=np.uint8)),
+    ]
+
+    for name, frame in cases:
+        x, y, w, h = dst_rect
+        start = time.perf_counter()
+        for _ in range(iterations):
+            image[y:y + h, x:x + w] = cv2.resize(frame, (w, h))
+        legacy = (time.perf_counter() - start) / iterations * 1e6
+        print(f"{name:16s} resize+copia      {legacy:8.1f} us/frame")
+
+        for mode in (PIXEL, PHOTO):
+            scaler = ViewportScaler((frame.shape[1], frame.shape[0]), dst_rect, mode)
+            start = time.perf_counter()
+            for _ in range(iterations):
+                scaler.blit(frame, image)
+            elapsed = (time.perf_counter() - start) / iterations * 1e6
+            print(f"{name:16s} {mode:6s} dst=roi     {elapsed:8.1f} us/frame")
+
+
+if __name__ == "__main__":
+    benchmark()